@@ -1,27 +1,65 @@
 from __future__ import annotations
 
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Mapping, Sequence
+import hashlib
+import json
 import pickle
+import subprocess
+import sys
+import threading
 
-import pandas as pd
-from sklearn.compose import ColumnTransformer
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import accuracy_score, confusion_matrix, f1_score, precision_score, recall_score
-from sklearn.model_selection import train_test_split
-from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import OneHotEncoder
+import numpy as np
 
-from .config import DATASET_PATH, MODEL_PATH
+from .config import BASE_DIR, DATASET_PATH, METRICS_CV_JOBS, MODEL_PATH, SCORER_DIR, USE_COMPILED_SCORER
+from .db import get_conn
+from .scorer import CompiledScorer, export_scorer
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: concurrent workers may both rebuild
+    fcntl = None
+
+# pandas and scikit-learn are only needed to train, evaluate or re-export the
+# model; serving predictions uses the NumPy-only CompiledScorer.
+if TYPE_CHECKING:  # pragma: no cover
+    from sklearn.pipeline import Pipeline
+
+TRAIN_SCRIPT = BASE_DIR / "train_model.py"
+_BUILD_LOCK = SCORER_DIR.parent / ".severity_model.lock"
+# Exit status of ``train_model.py --metrics`` when the dataset cannot support the requested folds.
+METRICS_INVALID_EXIT = 2
+
+
+def _file_sha256(path: Path) -> str:
+    with Path(path).open("rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
 
 
 class SeverityModel:
+    # Bump when the feature pipeline or classifier changes so cached metrics are recomputed.
+    VERSION = "tfidf-onehot-logreg-v1"
+
     def __init__(self) -> None:
         self.model = None
+        self.scorer: CompiledScorer | None = None
+        self._dataset_digest: tuple[tuple[int, int], str] | None = None
+        self._metrics: dict[tuple[str, str, int], dict] = {}
+        self._metrics_jobs: dict[tuple[str, str, int], Future] = {}
+        self._metrics_errors: dict[tuple[str, str, int], Exception] = {}
+        self._metrics_lock = threading.Lock()
+        self._metrics_executor: ThreadPoolExecutor | None = None
 
     @staticmethod
     def _build_pipeline() -> Pipeline:
+        from sklearn.compose import ColumnTransformer
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.pipeline import Pipeline
+        from sklearn.preprocessing import OneHotEncoder
+
         pre = ColumnTransformer(
             transformers=[
                 ("desc", TfidfVectorizer(max_features=1000, ngram_range=(1, 2)), "description"),
@@ -32,6 +70,8 @@ class SeverityModel:
         return Pipeline([("pre", pre), ("clf", LogisticRegression(max_iter=400))])
 
     def train_and_save(self) -> None:
+        import pandas as pd
+
         df = pd.read_csv(DATASET_PATH)
         X = df[["emergency_type", "description", "hour_of_day", "risk_score"]]
         y = df["severity"]
@@ -41,43 +81,170 @@ class SeverityModel:
         MODEL_PATH.parent.mkdir(parents=True, exist_ok=True)
         with Path(MODEL_PATH).open("wb") as f:
             pickle.dump(pipe, f)
+        export_scorer(pipe, SCORER_DIR, _file_sha256(MODEL_PATH))
 
-    def load(self) -> None:
-        if not Path(MODEL_PATH).exists():
-            self.train_and_save()
+    def export_compiled(self) -> None:
+        """Re-export the compiled scorer from the existing ``model.pkl``."""
+        export_scorer(self.load_pipeline(), SCORER_DIR, _file_sha256(MODEL_PATH))
+
+    def load_pipeline(self) -> Pipeline:
+        """Unpickle the full sklearn pipeline (requires scikit-learn)."""
         with Path(MODEL_PATH).open("rb") as f:
-            self.model = pickle.load(f)
+            return pickle.load(f)
 
-    def predict(self, emergency_type: str, description: str, risk_score: float = 0.5) -> tuple[str, float]:
-        if self.model is None:
+    def _load_scorer(self) -> CompiledScorer | None:
+        """The compiled scorer, or None if it is missing or was exported from another ``model.pkl``."""
+        if not Path(MODEL_PATH).exists():
+            return None
+        try:
+            scorer = CompiledScorer.load(SCORER_DIR)
+        except (OSError, ValueError):
+            return None
+        return scorer if scorer.meta.get("model_sha256") == _file_sha256(MODEL_PATH) else None
+
+    @staticmethod
+    def _run_trainer(export_only: bool) -> None:
+        command = [sys.executable, str(TRAIN_SCRIPT)] + (["--export-only"] if export_only else [])
+        try:
+            subprocess.run(command, cwd=BASE_DIR, check=True, capture_output=True, text=True)
+        except subprocess.CalledProcessError as exc:
+            raise RuntimeError(
+                f"Severity model artifacts are missing or stale and rebuilding them failed; "
+                f"run `python train_model.py` in backend/.\n{exc.stderr}"
+            ) from exc
+
+    def _build_artifacts(self, ready) -> None:
+        """Run ``train_model.py`` once in a child process, unless ``ready()`` turns true first.
+
+        The file lock makes concurrent workers wait for a single build, and
+        the child process keeps pandas and scikit-learn out of this one.
+        """
+        _BUILD_LOCK.parent.mkdir(parents=True, exist_ok=True)
+        with _BUILD_LOCK.open("a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                if not ready():
+                    self._run_trainer(export_only=Path(MODEL_PATH).exists())
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def load(self) -> None:
+        """Load the model for serving.
+
+        Artifacts come from ``train_model.py``. If they are missing, or the
+        compiled scorer does not match ``model.pkl``, they are rebuilt once in
+        a child process. With ``USE_COMPILED_SCORER`` off, the sklearn
+        pipeline is unpickled instead (this imports scikit-learn).
+        """
+        if not USE_COMPILED_SCORER:
+            if not Path(MODEL_PATH).exists():
+                self._build_artifacts(lambda: Path(MODEL_PATH).exists())
+            self.model = self.load_pipeline()
+            return
+
+        scorer = self._load_scorer()
+        if scorer is None:
+            self._build_artifacts(lambda: self._load_scorer() is not None)
+            scorer = self._load_scorer()
+            if scorer is None:
+                raise RuntimeError("train_model.py did not produce a compiled scorer matching model.pkl")
+        self.scorer = scorer
+
+    def _predict_proba(
+        self,
+        emergency_types: Sequence[str],
+        descriptions: Sequence[str],
+        hours: Sequence[float],
+        risk_scores: Sequence[float],
+    ) -> tuple[np.ndarray, list[str]]:
+        if self.scorer is not None:
+            return self.scorer.predict_proba(emergency_types, descriptions, hours, risk_scores), self.scorer.classes
+
+        import pandas as pd
+
+        frame = pd.DataFrame(
+            {
+                "emergency_type": list(emergency_types),
+                "description": list(descriptions),
+                "hour_of_day": list(hours),
+                "risk_score": list(risk_scores),
+            }
+        )
+        return self.model.predict_proba(frame), [str(c) for c in self.model.classes_]
+
+    def predict_batch(
+        self,
+        emergency_types: Sequence[str],
+        descriptions: Sequence[str],
+        risk_scores: Sequence[float],
+        hours: Sequence[float] | None = None,
+    ) -> list[tuple[str, float]]:
+        """Score many reports in one vectorized pass.
+
+        Label and confidence both come from a single ``predict_proba`` call.
+        """
+        if self.scorer is None and self.model is None:
             self.load()
+        if not emergency_types:
+            return []
+        if hours is None:
+            hours = [datetime.utcnow().hour] * len(emergency_types)
+        proba, classes = self._predict_proba(emergency_types, descriptions, hours, risk_scores)
+        best = proba.argmax(axis=1)
+        return [(classes[i], float(round(p, 3))) for i, p in zip(best, proba[np.arange(len(best)), best])]
+
+    def predict_many(self, records: Iterable[Mapping]) -> list[tuple[str, float]]:
+        """Score plain dict records with ``emergency_type``, ``description`` and
+        optional ``risk_score`` (default 0.5) and ``hour_of_day`` (default now)."""
+        records = list(records)
         hour = datetime.utcnow().hour
-        row = pd.DataFrame(
-            [
-                {
-                    "emergency_type": emergency_type,
-                    "description": description,
-                    "hour_of_day": hour,
-                    "risk_score": risk_score,
-                }
-            ]
+        return self.predict_batch(
+            [str(r["emergency_type"]) for r in records],
+            [str(r["description"]) for r in records],
+            [float(r.get("risk_score", 0.5)) for r in records],
+            [r.get("hour_of_day", hour) for r in records],
         )
-        pred = self.model.predict(row)[0]
-        proba = max(self.model.predict_proba(row)[0])
-        return str(pred), float(round(proba, 3))
 
-    def evaluate(self) -> dict:
-        """Return model performance metrics for chapter 4 reporting."""
+    def predict(self, emergency_type: str, description: str, risk_score: float = 0.5) -> tuple[str, float]:
+        return self.predict_batch([emergency_type], [description], [risk_score])[0]
+
+    def evaluate(self, cv_folds: int | None = None) -> dict:
+        """Return model performance metrics for chapter 4 reporting.
+
+        By default this is a stratified 70/30 holdout. With ``cv_folds`` the
+        metrics come from out-of-fold predictions of a stratified k-fold run
+        whose folds are fitted in parallel across cores.
+        """
+        import pandas as pd
+        from sklearn.metrics import accuracy_score, confusion_matrix, f1_score, precision_score, recall_score
+        from sklearn.model_selection import StratifiedKFold, cross_val_predict, train_test_split
+
         df = pd.read_csv(DATASET_PATH)
         X = df[["emergency_type", "description", "hour_of_day", "risk_score"]]
         y = df["severity"]
 
-        x_train, x_test, y_train, y_test = train_test_split(
-            X, y, test_size=0.3, random_state=42, stratify=y
-        )
-        model = self._build_pipeline()
-        model.fit(x_train, y_train)
-        pred = model.predict(x_test)
+        if cv_folds:
+            folds = min(int(cv_folds), int(y.value_counts().min()))
+            if folds < 2:
+                raise ValueError("Not enough samples per class for cross-validation")
+            y_test = y
+            pred = cross_val_predict(
+                self._build_pipeline(),
+                X,
+                y,
+                cv=StratifiedKFold(n_splits=folds, shuffle=True, random_state=42),
+                n_jobs=METRICS_CV_JOBS,
+            )
+        else:
+            folds = None
+            x_train, x_test, y_train, y_test = train_test_split(
+                X, y, test_size=0.3, random_state=42, stratify=y
+            )
+            model = self._build_pipeline()
+            model.fit(x_train, y_train)
+            pred = model.predict(x_test)
 
         labels = sorted(y.unique().tolist())
         cm = confusion_matrix(y_test, pred, labels=labels)
@@ -90,4 +257,120 @@ class SeverityModel:
             "labels": labels,
             "confusion_matrix": cm.tolist(),
             "sample_size": int(len(df)),
+            "cv_folds": folds,
         }
+
+    def dataset_digest(self) -> str:
+        """SHA-256 of the training CSV, re-hashed only when its size or mtime changes."""
+        stat = Path(DATASET_PATH).stat()
+        stamp = (stat.st_size, stat.st_mtime_ns)
+        if self._dataset_digest is None or self._dataset_digest[0] != stamp:
+            with Path(DATASET_PATH).open("rb") as f:
+                self._dataset_digest = (stamp, hashlib.file_digest(f, "sha256").hexdigest())
+        return self._dataset_digest[1]
+
+    def _metrics_key(self, cv_folds: int | None) -> tuple[str, str, int]:
+        return (self.dataset_digest(), self.VERSION, int(cv_folds or 0))
+
+    @staticmethod
+    def _evaluate_in_child(cv_folds: int | None) -> dict:
+        """``evaluate`` in a ``train_model.py --metrics`` child process, keeping pandas and scikit-learn out of this one."""
+        command = [sys.executable, str(TRAIN_SCRIPT), "--metrics"] + (["--cv", str(cv_folds)] if cv_folds else [])
+        done = subprocess.run(command, cwd=BASE_DIR, capture_output=True, text=True)
+        if done.returncode == METRICS_INVALID_EXIT:
+            raise ValueError(done.stderr.strip())
+        if done.returncode != 0:
+            raise RuntimeError(f"Model evaluation failed.\n{done.stderr}")
+        return json.loads(done.stdout)
+
+    def _compute_metrics(self, key: tuple[str, str, int]) -> dict:
+        try:
+            metrics = self._evaluate_in_child(key[2] or None)
+        except Exception as exc:
+            with self._metrics_lock:
+                self._metrics_errors[key] = exc
+            raise
+        metrics.update({"dataset_sha256": key[0], "model_version": key[1], "computed_at": datetime.utcnow().isoformat()})
+        with get_conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO model_metrics "
+                "(dataset_sha256, model_version, cv_folds, metrics_json, computed_at) VALUES (?,?,?,?,?)",
+                (*key, json.dumps(metrics), metrics["computed_at"]),
+            )
+        with self._metrics_lock:
+            self._metrics[key] = metrics
+        return metrics
+
+    def _stored_metrics(self, key: tuple[str, str, int]) -> dict | None:
+        with get_conn() as conn:
+            row = conn.execute(
+                "SELECT metrics_json FROM model_metrics WHERE dataset_sha256=? AND model_version=? AND cv_folds=?", key
+            ).fetchone()
+        if row is None:
+            return None
+        metrics = json.loads(row["metrics_json"])
+        with self._metrics_lock:
+            self._metrics[key] = metrics
+        return metrics
+
+    def load_metrics(self) -> int:
+        """Load stored metrics for the current dataset and model version; returns how many were found.
+
+        Metrics are computed once per key by whichever process is asked
+        first and shared with every other worker and later restarts.
+        """
+        digest = self.dataset_digest()
+        with get_conn() as conn:
+            rows = conn.execute(
+                "SELECT cv_folds, metrics_json FROM model_metrics WHERE dataset_sha256=? AND model_version=?",
+                (digest, self.VERSION),
+            ).fetchall()
+        with self._metrics_lock:
+            for row in rows:
+                self._metrics[(digest, self.VERSION, row["cv_folds"])] = json.loads(row["metrics_json"])
+        return len(rows)
+
+    def refresh_metrics(self, cv_folds: int | None = None) -> Future:
+        """Start (or join) a background evaluation for the current dataset and model version."""
+        key = self._metrics_key(cv_folds)
+        with self._metrics_lock:
+            job = self._metrics_jobs.get(key)
+            if job is None:
+                if self._metrics_executor is None:
+                    self._metrics_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="metrics")
+                job = self._metrics_executor.submit(self._compute_metrics, key)
+                self._metrics_jobs[key] = job
+                job.add_done_callback(lambda _job, k=key: self._forget_job(k))
+        return job
+
+    def _forget_job(self, key: tuple[str, str, int]) -> None:
+        with self._metrics_lock:
+            self._metrics_jobs.pop(key, None)
+
+    def metrics(self, cv_folds: int | None = None, wait: bool = True) -> dict | None:
+        """Metrics keyed by dataset content hash, model version and fold count.
+
+        Served from memory, else from the ``model_metrics`` table. Only when
+        neither has them does the evaluation run, in the background in a child
+        process; with ``wait=False`` this returns None instead of blocking
+        until it finishes, and the error of a failed run is raised once on
+        the next call.
+        """
+        key = self._metrics_key(cv_folds)
+        with self._metrics_lock:
+            cached = self._metrics.get(key)
+            error = self._metrics_errors.pop(key, None)
+        if error is not None and not wait:
+            raise error
+        if cached is None:
+            cached = self._stored_metrics(key)
+        if cached is not None:
+            return cached
+        job = self.refresh_metrics(cv_folds)
+        return job.result() if wait else None
+
+    def shutdown(self) -> None:
+        with self._metrics_lock:
+            executor, self._metrics_executor = self._metrics_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,195 @@
+"""Group-commit writer for ``audit_logs``.
+
+Entries are queued in memory and a single background thread inserts them in
+batches, one transaction (and one fsync) per batch instead of one per request.
+Durability is configurable with ``AUDIT_DURABILITY``:
+
+``async``
+    ``write`` returns immediately; a batch is committed once ``batch_size``
+    entries are waiting or ``flush_ms`` has passed since the oldest one. A
+    crash can lose at most that window.
+``group``
+    ``write`` blocks until the batch holding its entry is committed.
+    Concurrent requests share the commit, so this is durable and still far
+    cheaper than a commit each.
+``sync``
+    Every entry is committed on the calling thread, like before.
+
+While the database keeps failing, at most ``max_pending`` entries wait; beyond
+that the oldest are dropped, and a failed batch is retried after a fixed
+backoff. Entries are committed and dropped strictly in write order, which is
+what lets a single counter tell each ``group`` writer whether its entry has
+been settled; the tickets of dropped ``group`` entries are kept apart, and
+their writers get ``AuditEntryDropped`` instead of returning.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+
+from .config import AUDIT_BATCH_SIZE, AUDIT_DURABILITY, AUDIT_FLUSH_MS, AUDIT_MAX_PENDING
+from .db import get_conn
+
+logger = logging.getLogger(__name__)
+
+AuditEntry = tuple  # (user_id, action, ip_address, device_id, details, created_at)
+
+class AuditEntryDropped(RuntimeError):
+    """A ``group`` mode entry was shed from a full backlog instead of being committed."""
+
+
+_INSERT = "INSERT INTO audit_logs (user_id,action,ip_address,device_id,details,created_at) VALUES (?,?,?,?,?,?)"
+MODES = ("async", "group", "sync")
+
+
+class AuditWriter:
+    def __init__(
+        self,
+        mode: str = AUDIT_DURABILITY,
+        batch_size: int = AUDIT_BATCH_SIZE,
+        flush_ms: int = AUDIT_FLUSH_MS,
+        max_pending: int = AUDIT_MAX_PENDING,
+    ) -> None:
+        if mode not in MODES:
+            raise ValueError(f"AUDIT_DURABILITY must be one of {', '.join(MODES)}")
+        self.mode = mode
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(0, flush_ms) / 1000
+        self.max_pending = max(self.batch_size, max_pending)
+        self._pending: deque[AuditEntry] = deque()
+        self._inflight = 0  # entries taken by the writer thread and not yet settled
+        self._cond = threading.Condition()
+        self._enqueued = 0  # entries ever queued
+        self._settled = 0  # entries ever committed or dropped
+        self._dropped: set[int] = set()  # tickets of dropped group entries whose writer has not been told
+        self._oldest_at = 0.0
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def start(self) -> None:
+        if self.mode == "sync":
+            return
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+
+    def write(self, entry: AuditEntry) -> None:
+        if self.mode == "sync" or self._thread is None:
+            self._commit([entry])
+            return
+        with self._cond:
+            if not self._pending:
+                self._oldest_at = time.monotonic()
+            self._pending.append(entry)
+            self._enqueued += 1
+            ticket = self._enqueued
+            self._shed()
+            self._cond.notify_all()
+            if self.mode == "group":
+                while self._settled < ticket and self._thread is not None:
+                    self._cond.wait()
+                if ticket in self._dropped:
+                    self._dropped.discard(ticket)
+                    raise AuditEntryDropped(f"audit entry {entry[1]!r} was dropped: the audit backlog is full")
+
+    def flush(self) -> None:
+        """Block until everything queued so far is committed (or dropped from a full backlog)."""
+        with self._cond:
+            target = self._enqueued
+            self._oldest_at = float("-inf")  # make the writer go now
+            self._cond.notify_all()
+            while self._settled < target and self._thread is not None:
+                self._cond.wait()
+
+    def shutdown(self) -> None:
+        with self._cond:
+            thread = self._thread
+            self._stopping = True
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join()
+
+    def _shed(self) -> None:
+        """Drop the oldest waiting entries beyond ``max_pending``; call with the lock held.
+
+        While a batch is being committed its entries are older than anything
+        queued, so nothing is dropped until that batch is settled: either
+        committed, or put back at the front for ``_shed`` to consider again.
+        """
+        overflow = len(self._pending) - self.max_pending
+        if overflow <= 0 or self._inflight:
+            return
+        # The database has been failing for a while; shed the oldest.
+        logger.warning("Audit backlog full, dropping %d oldest entries", overflow)
+        self._drop(overflow)
+
+    def _drop(self, count: int) -> None:
+        """Settle the ``count`` oldest waiting entries without committing them; call with the lock held."""
+        for _ in range(count):
+            self._pending.popleft()
+            self._settled += 1
+            if self.mode == "group":
+                self._dropped.add(self._settled)
+        self._cond.notify_all()
+
+    def _ready(self) -> bool:
+        if self._stopping or len(self._pending) >= self.batch_size:
+            return True
+        if self.mode == "group":
+            return bool(self._pending)
+        return bool(self._pending) and time.monotonic() - self._oldest_at >= self.flush_interval
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._ready():
+                    timeout = None
+                    if self._pending:
+                        timeout = max(0.0, self._oldest_at + self.flush_interval - time.monotonic())
+                    self._cond.wait(timeout)
+                if self._stopping and not self._pending:
+                    self._thread = None
+                    self._cond.notify_all()
+                    return
+                batch = [self._pending.popleft() for _ in range(min(len(self._pending), self.batch_size))]
+                self._inflight = len(batch)
+                if self._pending:
+                    self._oldest_at = time.monotonic()
+            try:
+                self._commit(batch)
+            except Exception:
+                logger.exception("Failed to write %d audit entries; retrying", len(batch))
+                with self._cond:
+                    # The batch holds the oldest entries: back to the front, then shed.
+                    self._pending.extendleft(reversed(batch))
+                    self._inflight = 0
+                    self._shed()
+                    if self._stopping:
+                        # Nothing will retry after shutdown; give up rather than hang.
+                        self._drop(len(self._pending))
+                        continue
+                    # Back off before retrying. New writes notify the condition,
+                    # so wait against a deadline rather than for one wakeup.
+                    retry_at = time.monotonic() + max(self.flush_interval, 0.5)
+                    while not self._stopping and (remaining := retry_at - time.monotonic()) > 0:
+                        self._cond.wait(remaining)
+                continue
+            with self._cond:
+                self._settled += len(batch)
+                self._inflight = 0
+                self._shed()
+                self._cond.notify_all()
+
+    @staticmethod
+    def _commit(batch: list[AuditEntry]) -> None:
+        with get_conn() as conn:
+            conn.executemany(_INSERT, batch)
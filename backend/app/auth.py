@@ -1,14 +1,30 @@
 from __future__ import annotations
 
+import asyncio
 import base64
 import hashlib
 import hmac
 import json
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
 
 from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
 
-from .config import SECRET_KEY, TOKEN_EXPIRE_HOURS
+from .config import (
+    AUTH_HASH_MAX_PENDING,
+    AUTH_HASH_NICE,
+    AUTH_HASH_WORKERS,
+    SECRET_KEY,
+    TOKEN_CACHE_SIZE,
+    TOKEN_CACHE_TTL_SECONDS,
+    TOKEN_EXPIRE_HOURS,
+)
 
 
 def hash_password(password: str, salt: str | None = None) -> str:
@@ -25,6 +41,140 @@ def verify_password(password: str, stored_hash: str) -> bool:
     return hmac.compare_digest(hash_password(password, salt), stored_hash)
 
 
+def _init_hash_worker(niceness: int) -> None:
+    # Logins can wait a little; report submission on the API process should not.
+    if niceness and hasattr(os, "nice"):
+        os.nice(niceness)
+
+
+def _ping() -> bool:
+    return True
+
+
+class PasswordHasher:
+    """Runs PBKDF2 on a small dedicated process pool.
+
+    At 120k iterations a hash costs tens of milliseconds of CPU. Run in the
+    shared FastAPI threadpool, a burst of logins occupies every worker thread
+    and report submission queues behind it. Here login and register await a
+    future instead, so they hold no API thread while hashing. At most
+    ``max_pending`` hashes may be queued or running; past that, callers get a
+    503 with Retry-After instead of building an unbounded backlog. With
+    ``workers=0`` hashing runs in the API threadpool as before.
+    """
+
+    def __init__(
+        self, workers: int = AUTH_HASH_WORKERS, max_pending: int = AUTH_HASH_MAX_PENDING, niceness: int = AUTH_HASH_NICE
+    ) -> None:
+        self.workers = max(0, workers)
+        self.max_pending = max_pending
+        self.niceness = niceness
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_hash_worker,
+                    initargs=(self.niceness,),
+                )
+            return self._executor
+
+    def start(self) -> None:
+        if self.workers:
+            executor = self._get_executor()
+            for future in [executor.submit(_ping) for _ in range(self.workers)]:
+                future.result()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    async def _run(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication is busy, retry shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+        try:
+            if not self.workers:
+                return await run_in_threadpool(fn, *args)
+            try:
+                return await asyncio.wrap_future(self._get_executor().submit(fn, *args))
+            except BrokenProcessPool:
+                with self._lock:
+                    self._executor = None
+                return await run_in_threadpool(fn, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, password: str, stored_hash: str) -> bool:
+        return await self._run(verify_password, password, stored_hash)
+
+
+class TokenCache:
+    """Bounded LRU of verified token payloads, keyed by signature.
+
+    An entry lives until the token's own expiry or ``ttl`` seconds, whichever
+    comes first. A hit still checks that the body matches the one that was
+    verified, so a valid signature cannot be paired with a different body.
+    """
+
+    def __init__(self, maxsize: int = TOKEN_CACHE_SIZE, ttl: float = TOKEN_CACHE_TTL_SECONDS) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[str, dict, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, b64: str, sig: str, now: float) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(sig)
+            if entry is None:
+                return None
+            body, payload, expires_at = entry
+            if now >= expires_at:
+                del self._entries[sig]
+                return None
+            if not hmac.compare_digest(body, b64):
+                return None
+            self._entries.move_to_end(sig)
+            return payload
+
+    def put(self, b64: str, sig: str, payload: dict, now: float) -> None:
+        if self.maxsize <= 0:
+            return
+        expires_at = min(float(payload.get("exp", 0)), now + self.ttl)
+        with self._lock:
+            self._entries[sig] = (b64, payload, expires_at)
+            self._entries.move_to_end(sig)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+token_cache = TokenCache()
+
+
 def create_token(payload: dict) -> str:
     exp = (datetime.utcnow() + timedelta(hours=TOKEN_EXPIRE_HOURS)).timestamp()
     body = {**payload, "exp": exp}
@@ -40,12 +190,18 @@ def decode_token(token: str) -> dict:
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token") from exc
 
+    now = datetime.utcnow().timestamp()  # same clock as "exp"
+    cached = token_cache.get(b64, sig, now)
+    if cached is not None:
+        return dict(cached)
+
     expected = hmac.new(SECRET_KEY.encode(), b64.encode(), hashlib.sha256).hexdigest()
     if not hmac.compare_digest(sig, expected):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid signature")
 
     padded = b64 + "=" * (-len(b64) % 4)
     payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
-    if datetime.utcnow().timestamp() > payload.get("exp", 0):
+    if now > payload.get("exp", 0):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired")
-    return payload
+    token_cache.put(b64, sig, payload, now)
+    return dict(payload)
@@ -1,14 +1,81 @@
 import os
+import tempfile
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parents[1]
-UPLOAD_DIR = BASE_DIR / "uploads"
-DB_PATH = BASE_DIR / "emergency.db"
+UPLOAD_DIR = Path(os.getenv("UPLOAD_DIR", str(BASE_DIR / "uploads")))
+EXPORT_DIR = Path(os.getenv("EXPORT_DIR", str(Path(tempfile.gettempdir()) / "slsu-exports")))
+DB_PATH = Path(os.getenv("DB_PATH", str(BASE_DIR / "emergency.db")))
 MODEL_PATH = BASE_DIR.parent / "data" / "model.pkl"
 DATASET_PATH = BASE_DIR.parent / "data" / "severity_dataset.csv"
+# Compact NumPy scoring artifact exported next to model.pkl by train_model.py.
+SCORER_DIR = BASE_DIR.parent / "data" / "severity_scorer"
+USE_COMPILED_SCORER = os.getenv("USE_COMPILED_SCORER", "1").lower() in {"1", "true", "yes"}
 SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-change-me")
 TOKEN_EXPIRE_HOURS = int(os.getenv("TOKEN_EXPIRE_HOURS", "24"))
 RATE_LIMIT_PER_HOUR = int(os.getenv("RATE_LIMIT_PER_HOUR", "3"))
+RATE_LIMIT_DEVICE_PER_HOUR = int(os.getenv("RATE_LIMIT_DEVICE_PER_HOUR", "6"))
+RATE_LIMIT_IP_PER_HOUR = int(os.getenv("RATE_LIMIT_IP_PER_HOUR", "60"))
+RATE_LIMIT_PERSIST = os.getenv("RATE_LIMIT_PERSIST", "1").lower() in {"1", "true", "yes"}
 SUSPICIOUS_VERIFICATION_THRESHOLD = float(os.getenv("SUSPICIOUS_VERIFICATION_THRESHOLD", "35"))
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(15 * 1024 * 1024)))
+UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", str(256 * 1024)))
+# Unreferenced uploads younger than this are kept: their report may still be committing.
+UPLOAD_GC_GRACE_SECONDS = float(os.getenv("UPLOAD_GC_GRACE_SECONDS", "86400"))
+# Accident photos within this dHash Hamming distance of an earlier report count as reused.
+PHASH_MAX_DISTANCE = int(os.getenv("PHASH_MAX_DISTANCE", "6"))
+# Parallel jobs for k-fold model evaluation (-1 = all cores).
+METRICS_CV_JOBS = int(os.getenv("METRICS_CV_JOBS", "-1"))
+REPORTS_PAGE_SIZE = int(os.getenv("REPORTS_PAGE_SIZE", "50"))
+REPORTS_PAGE_MAX = int(os.getenv("REPORTS_PAGE_MAX", "500"))
+EVENT_BUFFER_SIZE = int(os.getenv("EVENT_BUFFER_SIZE", "1024"))
+EVENT_MAX_SUBSCRIBERS = int(os.getenv("EVENT_MAX_SUBSCRIBERS", "2000"))
+EVENT_HEARTBEAT_SECONDS = float(os.getenv("EVENT_HEARTBEAT_SECONDS", "15"))
+MAX_PREDICT_BATCH = int(os.getenv("MAX_PREDICT_BATCH", "1000"))
+
+# SQLite connection pool and pragma tuning.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "8"))
+DB_BUSY_TIMEOUT_MS = int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000"))
+DB_SYNCHRONOUS = os.getenv("DB_SYNCHRONOUS", "NORMAL").upper()
+DB_CACHE_SIZE_KIB = int(os.getenv("DB_CACHE_SIZE_KIB", "16384"))
+DB_MMAP_SIZE = int(os.getenv("DB_MMAP_SIZE", str(64 * 1024 * 1024)))
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "256"))
+
+# Asynchronous report ingestion (verification + severity scoring off the request path).
+ASYNC_INGESTION = os.getenv("ASYNC_INGESTION", "0").lower() in {"1", "true", "yes"}
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "2"))
+INGEST_MAX_PENDING = int(os.getenv("INGEST_MAX_PENDING", "64"))
+# Thumbnail generation and upload cleanup get their own small pool, so they never take scoring slots.
+UPLOAD_JOB_WORKERS = int(os.getenv("UPLOAD_JOB_WORKERS", "1"))
+UPLOAD_JOB_MAX_PENDING = int(os.getenv("UPLOAD_JOB_MAX_PENDING", "32"))
+
+# Image validation worker processes (0 = validate in the request thread).
+CV_WORKERS = int(os.getenv("CV_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Large photos are decoded at 1/2, 1/4 or 1/8 scale while the long side stays >= this.
+CV_ANALYSIS_MIN_SIDE = int(os.getenv("CV_ANALYSIS_MIN_SIDE", "960"))
+
+# Password hashing (PBKDF2) worker processes, kept off the API threadpool.
+AUTH_HASH_WORKERS = int(os.getenv("AUTH_HASH_WORKERS", str(min(2, os.cpu_count() or 1))))
+AUTH_HASH_MAX_PENDING = int(os.getenv("AUTH_HASH_MAX_PENDING", "64"))
+AUTH_HASH_NICE = int(os.getenv("AUTH_HASH_NICE", "5"))
+# Verified token payloads, keyed by signature.
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "4096"))
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+
+# Audit log group commit: "async" (flush every AUDIT_FLUSH_MS or AUDIT_BATCH_SIZE entries),
+# "group" (callers wait for the shared commit) or "sync" (one commit per entry).
+AUDIT_DURABILITY = os.getenv("AUDIT_DURABILITY", "async").lower()
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "256"))
+AUDIT_FLUSH_MS = int(os.getenv("AUDIT_FLUSH_MS", "200"))
+AUDIT_MAX_PENDING = int(os.getenv("AUDIT_MAX_PENDING", "10000"))
+
+# PDF export jobs: rendered on a background worker into EXPORT_DIR, kept for EXPORT_TTL_SECONDS.
+EXPORT_WORKERS = int(os.getenv("EXPORT_WORKERS", "1"))
+EXPORT_MAX_JOBS = int(os.getenv("EXPORT_MAX_JOBS", "4"))
+EXPORT_MAX_REPORTS = int(os.getenv("EXPORT_MAX_REPORTS", "10000"))
+EXPORT_TTL_SECONDS = float(os.getenv("EXPORT_TTL_SECONDS", "3600"))
+# Long side of the recompressed JPEG derivatives served under /uploads/thumb/ and /uploads/medium/.
+THUMBNAIL_MAX_SIDE = int(os.getenv("THUMBNAIL_MAX_SIDE", "160"))
+MEDIUM_MAX_SIDE = int(os.getenv("MEDIUM_MAX_SIDE", "1024"))
 
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
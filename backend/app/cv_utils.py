@@ -1,8 +1,14 @@
 from __future__ import annotations
 
 import hashlib
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
+
+from .config import CV_ANALYSIS_MIN_SIDE, CV_WORKERS, SUSPICIOUS_VERIFICATION_THRESHOLD
 
 try:
     import cv2  # type: ignore
@@ -11,67 +17,218 @@ except Exception:  # pragma: no cover - optional dependency fallback
     cv2 = None
     np = None
 
+try:
+    from PIL import Image as PILImage  # type: ignore
+except Exception:  # pragma: no cover - installed with reportlab
+    PILImage = None
+
+
+_FACE_DETECTOR = None
+
+
+def _face_detector():
+    """Haar cascade loaded once per process (each pool worker gets its own)."""
+    global _FACE_DETECTOR
+    if _FACE_DETECTOR is None:
+        _FACE_DETECTOR = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
+    return _FACE_DETECTOR
+
+
+def _init_worker() -> None:
+    if cv2 is not None:
+        cv2.setNumThreads(1)
+        _face_detector()
+
 
 def _file_size_ok(path: Path, min_bytes: int = 5_000) -> bool:
     return path.exists() and path.stat().st_size >= min_bytes
 
 
 def _quick_hash(path: Path) -> str:
-    return hashlib.sha256(path.read_bytes()).hexdigest()
+    with path.open("rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
 
 
-def _opencv_validate(selfie_path: Path, accident_path: Path) -> dict[str, Any]:
-    selfie = cv2.imread(str(selfie_path))
-    accident = cv2.imread(str(accident_path))
-    if selfie is None or accident is None:
-        return {
-            "face_ok": False,
-            "accident_image_ok": False,
-            "suspicious": True,
-            "verification_score": 0.0,
-            "flags": ["image_load_failed"],
-        }
+def _same_content(
+    selfie_path: Path, accident_path: Path, selfie_sha256: str | None = None, accident_sha256: str | None = None
+) -> bool:
+    """Compare content hashes, reusing digests computed while the uploads were written."""
+    return (selfie_sha256 or _quick_hash(selfie_path)) == (accident_sha256 or _quick_hash(accident_path))
 
-    def blur_score(image):
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        return float(cv2.Laplacian(gray, cv2.CV_64F).var())
 
-    def is_blank(image):
-        return float(np.std(image)) < 5.0
+_REDUCED_GRAYSCALE_FLAGS = {}
+if cv2 is not None:
+    _REDUCED_GRAYSCALE_FLAGS = {
+        8: cv2.IMREAD_REDUCED_GRAYSCALE_8,
+        4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+        2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    }
+
+_REDUCED_COLOR_FLAGS = {}
+if cv2 is not None:
+    _REDUCED_COLOR_FLAGS = {8: cv2.IMREAD_REDUCED_COLOR_8, 4: cv2.IMREAD_REDUCED_COLOR_4, 2: cv2.IMREAD_REDUCED_COLOR_2}
+
+# Bump whenever a change to the checks, weights or thresholds below can change a
+# verdict: cached verdicts from another version are ignored and recomputed.
+VALIDATOR_VERSION = 2
+
+# Verification score weights; the face check is the most expensive stage.
+FACE_WEIGHT = 0.5
+ACCIDENT_WEIGHT = 0.35
+SELFIE_SHARP_WEIGHT = 0.15
+# Sharpness is measured with the long side resized to BLUR_ANALYSIS_SIDE, so the
+# score does not depend on upload resolution or decode scale. The threshold is
+# calibrated to match the former full-resolution rule (variance >= 25) on
+# 960-2016 px photos.
+BLUR_ANALYSIS_SIDE = 640
+BLUR_THRESHOLD = 60
+
+
+def _image_dimensions(path: Path) -> tuple[int, int] | None:
+    """Read (width, height) from the image header without decoding pixels."""
+    if PILImage is None:
+        return None
+    try:
+        with PILImage.open(path) as img:
+            return img.size
+    except Exception:
+        return None
+
+
+def _decode_scale(path: Path, min_side: int = CV_ANALYSIS_MIN_SIDE) -> int:
+    """Largest JPEG-style reduction (1/2/4/8) that keeps the long side >= ``min_side``."""
+    size = _image_dimensions(path)
+    if not size:
+        return 1
+    long_side = max(size)
+    for factor in (8, 4, 2):
+        if long_side // factor >= min_side:
+            return factor
+    return 1
+
+
+def _read_gray(path: Path) -> tuple[Any, int]:
+    scale = _decode_scale(path)
+    flag = _REDUCED_GRAYSCALE_FLAGS.get(scale, cv2.IMREAD_GRAYSCALE)
+    return cv2.imread(str(path), flag), scale
+
+
+def _blur_score(gray) -> float:
+    """Variance of the Laplacian at ``BLUR_ANALYSIS_SIDE``; smaller images are measured as-is."""
+    height, width = gray.shape[:2]
+    factor = BLUR_ANALYSIS_SIDE / max(height, width)
+    if factor < 1:
+        size = (max(1, round(width * factor)), max(1, round(height * factor)))
+        gray = cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+    return float(cv2.Laplacian(gray, cv2.CV_64F).var())
+
+
+def dhash(path: Path, hash_size: int = 8) -> int | None:
+    """64-bit difference hash; near-identical photos differ in only a few bits."""
+    if cv2 is None or np is None:
+        return None
+    image = cv2.imread(str(path), cv2.IMREAD_REDUCED_GRAYSCALE_4)
+    if image is None:
+        return None
+    small = cv2.resize(image, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def encode_thumbnail(path: Path, max_side: int, quality: int = 80) -> bytes | None:
+    """JPEG bytes of ``path`` scaled to fit ``max_side``, decoded at reduced scale where possible."""
+    if cv2 is None:
+        return None
+    scale = _decode_scale(path, max_side)
+    image = cv2.imread(str(path), _REDUCED_COLOR_FLAGS.get(scale, cv2.IMREAD_COLOR))
+    if image is None:
+        return None
+    height, width = image.shape[:2]
+    factor = max_side / max(height, width)
+    if factor < 1:
+        size = (max(1, round(width * factor)), max(1, round(height * factor)))
+        image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+    ok, encoded = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return encoded.tobytes() if ok else None
+
+
+def _load_failed(decided_by: str) -> dict[str, Any]:
+    return {
+        "face_ok": False,
+        "accident_image_ok": False,
+        "suspicious": True,
+        "verification_score": 0.0,
+        "flags": ["image_load_failed"],
+        "decided_by": decided_by,
+    }
+
+
+def _opencv_validate(
+    selfie_path: Path, accident_path: Path, selfie_sha256: str | None = None, accident_sha256: str | None = None
+) -> dict[str, Any]:
+    """Staged verification, cheapest checks first.
+
+    Stages: ``load`` (file present), ``hash`` (selfie reused as accident photo),
+    ``decode`` (grayscale, reduced resolution for large photos), ``quality``
+    (blank/blur) and ``face``. Face detection is skipped only when the score
+    could not reach ``SUSPICIOUS_VERIFICATION_THRESHOLD`` even with a face,
+    so skipping never changes the verdict; a skipped check earns no face
+    weight. The last stage that ran is reported as ``decided_by``.
+    """
+    if not (_file_size_ok(selfie_path, 1) and _file_size_ok(accident_path, 1)):
+        return _load_failed("load")
 
     flags: list[str] = []
-    detector = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
-    faces = detector.detectMultiScale(cv2.cvtColor(selfie, cv2.COLOR_BGR2GRAY), scaleFactor=1.1, minNeighbors=4)
-    face_ok = len(faces) > 0
-    if not face_ok:
-        flags.append("no_face_detected")
-
-    accident_blur = blur_score(accident)
-    selfie_blur = blur_score(selfie)
-    accident_not_blank = not is_blank(accident)
-    if not accident_not_blank:
-        flags.append("accident_blank")
-    if accident_blur < 25:
-        flags.append("accident_too_blurry")
-
-    same_hash = _quick_hash(selfie_path) == _quick_hash(accident_path)
+    same_hash = _same_content(selfie_path, accident_path, selfie_sha256, accident_sha256)
     if same_hash:
         flags.append("selfie_and_accident_same_file")
 
-    accident_image_ok = accident_not_blank and accident_blur >= 25 and not same_hash
-    suspicious = (not face_ok) or (not accident_image_ok)
-    score = (0.5 if face_ok else 0.0) + (0.35 if accident_image_ok else 0.0) + (0.15 if selfie_blur >= 25 else 0.0)
+    selfie, _ = _read_gray(selfie_path)
+    # An identical file cannot pass as the accident photo, so skip decoding it.
+    accident = None if same_hash else _read_gray(accident_path)[0]
+    if selfie is None or (accident is None and not same_hash):
+        return _load_failed("decode")
+
+    def is_blank(image):
+        return float(np.std(image)) < 5.0
+
+    accident_image_ok = False
+    if accident is not None:
+        accident_not_blank = not is_blank(accident)
+        accident_blur = _blur_score(accident)
+        if not accident_not_blank:
+            flags.append("accident_blank")
+        if accident_blur < BLUR_THRESHOLD:
+            flags.append("accident_too_blurry")
+        accident_image_ok = accident_not_blank and accident_blur >= BLUR_THRESHOLD
+    selfie_sharp = _blur_score(selfie) >= BLUR_THRESHOLD
+
+    score = (ACCIDENT_WEIGHT if accident_image_ok else 0.0) + (SELFIE_SHARP_WEIGHT if selfie_sharp else 0.0)
+    decided_by = "quality"
+    face_ok = False
+    if (score + FACE_WEIGHT) * 100 < SUSPICIOUS_VERIFICATION_THRESHOLD:
+        flags.append("face_check_skipped")
+    else:
+        decided_by = "face"
+        faces = _face_detector().detectMultiScale(selfie, scaleFactor=1.1, minNeighbors=4)
+        face_ok = len(faces) > 0
+        if not face_ok:
+            flags.append("no_face_detected")
+        score += FACE_WEIGHT if face_ok else 0.0
 
     return {
         "face_ok": face_ok,
         "accident_image_ok": accident_image_ok,
-        "suspicious": suspicious,
+        "suspicious": (not face_ok) or (not accident_image_ok),
         "verification_score": round(score * 100, 1),
         "flags": flags,
+        "decided_by": decided_by,
     }
 
 
-def _heuristic_validate(selfie_path: Path, accident_path: Path) -> dict[str, Any]:
+def _heuristic_validate(
+    selfie_path: Path, accident_path: Path, selfie_sha256: str | None = None, accident_sha256: str | None = None
+) -> dict[str, Any]:
     """Fallback validator when OpenCV is unavailable in local environment."""
     flags: list[str] = ["opencv_unavailable_using_heuristics"]
     selfie_ok = _file_size_ok(selfie_path)
@@ -81,7 +238,7 @@ def _heuristic_validate(selfie_path: Path, accident_path: Path) -> dict[str, Any
     if not accident_ok:
         flags.append("accident_too_small")
 
-    same_hash = _quick_hash(selfie_path) == _quick_hash(accident_path)
+    same_hash = _same_content(selfie_path, accident_path, selfie_sha256, accident_sha256)
     if same_hash:
         flags.append("selfie_and_accident_same_file")
 
@@ -96,10 +253,109 @@ def _heuristic_validate(selfie_path: Path, accident_path: Path) -> dict[str, Any
         "suspicious": suspicious,
         "verification_score": score,
         "flags": flags,
+        "decided_by": "heuristic",
     }
 
 
-def validate_images(selfie_path: Path, accident_path: Path) -> dict[str, Any]:
+def _validate_local(
+    selfie_path: Path, accident_path: Path, selfie_sha256: str | None = None, accident_sha256: str | None = None
+) -> dict[str, Any]:
     if cv2 is None or np is None:
-        return _heuristic_validate(selfie_path, accident_path)
-    return _opencv_validate(selfie_path, accident_path)
+        return _heuristic_validate(selfie_path, accident_path, selfie_sha256, accident_sha256)
+    return _opencv_validate(selfie_path, accident_path, selfie_sha256, accident_sha256)
+
+
+# (selfie_path, accident_path) or (selfie_path, accident_path, selfie_sha256, accident_sha256)
+ValidationJob = tuple[Any, ...]
+
+
+def _job_args(job: ValidationJob) -> tuple[str, str, str | None, str | None]:
+    selfie, accident, *digests = job
+    selfie_sha256, accident_sha256 = (list(digests) + [None, None])[:2]
+    return str(selfie), str(accident), selfie_sha256, accident_sha256
+
+
+class ValidationService:
+    """Runs image validation on a pool of worker processes.
+
+    OpenCV work holds the GIL for long stretches, so a process pool lets
+    validation throughput scale with cores instead of competing with the API
+    threadpool. Workers preload the Haar cascade and receive jobs as file
+    paths, never image bytes. With ``workers=0`` (or without OpenCV) jobs run
+    in the calling thread.
+    """
+
+    def __init__(self, workers: int = CV_WORKERS) -> None:
+        self.workers = max(0, workers)
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0 and cv2 is not None and np is not None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+            return self._executor
+
+    def start(self) -> None:
+        if self.enabled:
+            executor = self._get_executor()
+            for future in [executor.submit(_init_worker) for _ in range(self.workers)]:
+                future.result()
+
+    def _reset(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def validate_many(self, pairs: Iterable[ValidationJob]) -> list[dict[str, Any]]:
+        jobs = [_job_args(job) for job in pairs]
+        if not self.enabled or not jobs:
+            return [_validate_by_path(*job) for job in jobs]
+        try:
+            futures = [self._get_executor().submit(_validate_by_path, *job) for job in jobs]
+            return [future.result() for future in futures]
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM on a huge image); recreate the pool next time.
+            self._reset()
+            return [_validate_by_path(*job) for job in jobs]
+
+    def validate(
+        self, selfie_path: Path, accident_path: Path, selfie_sha256: str | None = None, accident_sha256: str | None = None
+    ) -> dict[str, Any]:
+        return self.validate_many([(selfie_path, accident_path, selfie_sha256, accident_sha256)])[0]
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+def _validate_by_path(
+    selfie_path: str, accident_path: str, selfie_sha256: str | None = None, accident_sha256: str | None = None
+) -> dict[str, Any]:
+    return _validate_local(Path(selfie_path), Path(accident_path), selfie_sha256, accident_sha256)
+
+
+validation_service = ValidationService()
+
+
+def validate_images(
+    selfie_path: Path, accident_path: Path, selfie_sha256: str | None = None, accident_sha256: str | None = None
+) -> dict[str, Any]:
+    """Validate one report's images; pass upload digests to avoid re-reading files to hash them."""
+    return validation_service.validate(selfie_path, accident_path, selfie_sha256, accident_sha256)
+
+
+def validate_images_many(pairs: Iterable[ValidationJob]) -> list[dict[str, Any]]:
+    """Validate many (selfie, accident[, selfie_sha256, accident_sha256]) jobs across the worker pool."""
+    return validation_service.validate_many(pairs)
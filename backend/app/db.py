@@ -1,85 +1,161 @@
 from __future__ import annotations
 
+import queue
 import sqlite3
+import threading
 from contextlib import contextmanager
 from datetime import datetime
+from pathlib import Path
 
-from .config import DB_PATH
+from .config import (
+    DB_BUSY_TIMEOUT_MS,
+    DB_CACHE_SIZE_KIB,
+    DB_MMAP_SIZE,
+    DB_PATH,
+    DB_POOL_SIZE,
+    DB_STATEMENT_CACHE_SIZE,
+    DB_SYNCHRONOUS,
+)
+from .migrations import run_migrations
 
+_SYNCHRONOUS_MODES = {"OFF", "NORMAL", "FULL", "EXTRA"}
 
-def init_db() -> None:
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                email TEXT UNIQUE NOT NULL,
-                password_hash TEXT NOT NULL,
-                role TEXT NOT NULL DEFAULT 'citizen',
-                risk_score REAL NOT NULL DEFAULT 0,
-                account_flagged INTEGER NOT NULL DEFAULT 0,
-                created_at TEXT NOT NULL
-            )
-            """
-        )
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS reports (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                device_id TEXT,
-                emergency_type TEXT NOT NULL,
-                description TEXT NOT NULL,
-                latitude REAL NOT NULL,
-                longitude REAL NOT NULL,
-                selfie_path TEXT NOT NULL,
-                accident_path TEXT NOT NULL,
-                lora_payload TEXT,
-                severity_label TEXT NOT NULL,
-                severity_confidence REAL NOT NULL,
-                verification_score REAL NOT NULL,
-                face_ok INTEGER NOT NULL,
-                accident_image_ok INTEGER NOT NULL,
-                suspicious INTEGER NOT NULL,
-                status TEXT NOT NULL DEFAULT 'Pending',
-                created_at TEXT NOT NULL,
-                updated_at TEXT NOT NULL,
-                FOREIGN KEY(user_id) REFERENCES users(id)
-            )
-            """
-        )
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS audit_logs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER,
-                action TEXT NOT NULL,
-                ip_address TEXT,
-                device_id TEXT,
-                details TEXT,
-                created_at TEXT NOT NULL
-            )
-            """
+
+class ConnectionPool:
+    """Thread-safe pool of long-lived SQLite connections running in WAL mode.
+
+    Connections are opened lazily up to ``size`` and handed out one thread at a
+    time. Keeping them open lets sqlite3's per-connection statement cache reuse
+    prepared statements across requests.
+    """
+
+    def __init__(self, path: Path, size: int = DB_POOL_SIZE, timeout: float = DB_BUSY_TIMEOUT_MS / 1000) -> None:
+        self.path = Path(path)
+        self.size = max(1, size)
+        self.timeout = timeout
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            timeout=DB_BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=False,
+            cached_statements=DB_STATEMENT_CACHE_SIZE,
         )
+        conn.row_factory = sqlite3.Row
+        configure_connection(conn)
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._opened < self.size:
+                self._opened += 1
+                try:
+                    return self._connect()
+                except Exception:
+                    self._opened -= 1
+                    raise
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty as exc:
+            raise sqlite3.OperationalError("Timed out waiting for a pooled database connection") from exc
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        if conn.in_transaction:
+            conn.rollback()
+        if self._closed:
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+            return
+        self._idle.put(conn)
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+
+
+def configure_connection(conn: sqlite3.Connection) -> None:
+    synchronous = DB_SYNCHRONOUS if DB_SYNCHRONOUS in _SYNCHRONOUS_MODES else "NORMAL"
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(f"PRAGMA synchronous={synchronous}")
+    conn.execute(f"PRAGMA cache_size=-{int(DB_CACHE_SIZE_KIB)}")
+    conn.execute(f"PRAGMA mmap_size={int(DB_MMAP_SIZE)}")
+    conn.execute(f"PRAGMA busy_timeout={int(DB_BUSY_TIMEOUT_MS)}")
+    conn.execute("PRAGMA temp_store=MEMORY")
 
-        # Safe, idempotent migration helpers for Phase 2 fields.
-        user_cols = {row[1] for row in conn.execute("PRAGMA table_info(users)").fetchall()}
-        if "risk_score" not in user_cols:
-            conn.execute("ALTER TABLE users ADD COLUMN risk_score REAL NOT NULL DEFAULT 0")
-        if "account_flagged" not in user_cols:
-            conn.execute("ALTER TABLE users ADD COLUMN account_flagged INTEGER NOT NULL DEFAULT 0")
+
+_pool: ConnectionPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DB_PATH)
+    return _pool
+
+
+def close_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+def init_db() -> None:
+    with get_conn() as conn:
+        run_migrations(conn)
 
 
 @contextmanager
 def get_conn():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    pool = get_pool()
+    conn = pool.acquire()
     try:
         yield conn
         conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
     finally:
-        conn.close()
+        pool.release(conn)
 
 
 def now_iso() -> str:
-    return datetime.utcnow().isoformat()
+    """UTC timestamp in SQLite's own ``YYYY-MM-DD HH:MM:SS`` form.
+
+    Matching ``datetime('now')`` keeps range filters and ORDER BY on the text
+    column correct.
+    """
+    return datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def api_timestamp(stored: str | None) -> str | None:
+    """A stored ``now_iso`` value as ISO-8601 UTC (``YYYY-MM-DDTHH:MM:SSZ``) for API responses.
+
+    Browsers parse the zone-less SQLite form inconsistently (as local time,
+    or not at all), so it never leaves the server.
+    """
+    if not stored or stored.endswith("Z"):
+        return stored
+    return stored.replace(" ", "T", 1) + "Z"
@@ -0,0 +1,175 @@
+"""In-process broadcast hub behind the live report feed (Server-Sent Events).
+
+Publishers (request handlers and ingestion workers, on any thread) append an
+already-encoded SSE frame to a bounded ring buffer and wake the event loop
+once. Subscribers never get a queue of their own: each one is just a cursor
+into the shared buffer, so publishing costs the same for one dashboard or a
+thousand, and no subscriber ever touches the database.
+
+Backpressure is per connection. A subscriber only advances as fast as its
+socket drains, and whatever piled up meanwhile goes out as one coalesced
+write. One that falls so far behind that its next event has been evicted
+from the buffer gets a ``resync`` event instead and should catch up through
+``GET /reports/changes``. Event ids are ``<boot>-<n>``: ``n`` increases
+monotonically and ``boot`` is drawn fresh for every hub, so a client
+reconnecting with ``Last-Event-ID`` resumes where it stopped, while an id from
+before a restart (or from another worker process) gets ``resync``.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+import weakref
+from collections import deque
+from typing import AsyncIterator, NamedTuple
+from uuid import uuid4
+
+from .config import EVENT_BUFFER_SIZE, EVENT_HEARTBEAT_SECONDS, EVENT_MAX_SUBSCRIBERS
+
+logger = logging.getLogger(__name__)
+
+
+class Event(NamedTuple):
+    id: int
+    frame: bytes
+
+
+def encode_frame(event_id: str | None, event: str, data: dict) -> bytes:
+    lines = [] if event_id is None else [f"id: {event_id}"]
+    lines += [f"event: {event}", f"data: {json.dumps(data, separators=(',', ':'))}"]
+    return ("\n".join(lines) + "\n\n").encode()
+
+
+class BroadcastHub:
+    def __init__(
+        self,
+        buffer_size: int = EVENT_BUFFER_SIZE,
+        max_subscribers: int = EVENT_MAX_SUBSCRIBERS,
+        heartbeat: float = EVENT_HEARTBEAT_SECONDS,
+    ) -> None:
+        self.max_subscribers = max_subscribers
+        self.heartbeat = heartbeat
+        self.boot = uuid4().hex[:12]
+        self._events: deque[Event] = deque(maxlen=buffer_size)
+        self._last_id = 0
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._slots: set[object] = set()
+        self._closed = False
+
+    @property
+    def last_id(self) -> int:
+        return self._last_id
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._slots)
+
+    def publish(self, event: str, data: dict) -> int:
+        """Append an event for every subscriber; safe to call from any thread."""
+        with self._lock:
+            self._last_id += 1
+            event_id = self._last_id
+            self._events.append(Event(event_id, encode_frame(f"{self.boot}-{event_id}", event, data)))
+            loop = self._loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._notify)
+            except RuntimeError:
+                # The loop that served the last subscriber has shut down.
+                pass
+        return event_id
+
+    def close(self) -> None:
+        """End every open stream, e.g. on shutdown so the server can exit."""
+        with self._lock:
+            self._closed = True
+            loop = self._loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._notify)
+            except RuntimeError:
+                pass
+
+    def _notify(self) -> None:
+        # Swap in a fresh Event before setting the old one: every waiter wakes
+        # exactly once and later waits block until the next publish.
+        wakeup, self._wakeup = self._wakeup, asyncio.Event()
+        if wakeup is not None:
+            wakeup.set()
+
+    def _bind(self) -> asyncio.Event:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._loop is not loop or self._wakeup is None:
+                self._loop = loop
+                self._wakeup = asyncio.Event()
+            return self._wakeup
+
+    def _after(self, cursor: int) -> tuple[list[Event], bool]:
+        """Buffered events newer than ``cursor``, and whether some were already evicted."""
+        with self._lock:
+            if not self._events or cursor >= self._last_id:
+                return [], False
+            missing = self._last_id - cursor
+            if missing > len(self._events):
+                return list(self._events), True
+            # Live subscribers sit near the tail; index from the right so this
+            # stays proportional to what they missed, not to the buffer size.
+            return [self._events[-i] for i in range(missing, 0, -1)], False
+
+    def _cursor(self, last_event_id: str) -> int | None:
+        """Sequence number of a ``Last-Event-ID`` from this boot, else None."""
+        boot, _, seq = last_event_id.rpartition("-")
+        if boot != self.boot or not seq.isdigit() or int(seq) > self._last_id:
+            return None
+        return int(seq)
+
+    def _release(self, slot: object) -> None:
+        with self._lock:
+            self._slots.discard(slot)
+
+    def subscribe(self, last_event_id: str | None = None) -> AsyncIterator[bytes] | None:
+        """Reserve a subscriber slot and return its stream, or None at ``max_subscribers``.
+
+        The stream yields SSE chunks from ``last_event_id`` (exclusive), or from
+        now when None. The slot is taken here, before any response starts, and
+        given back when the stream finishes, is closed or is garbage collected
+        without ever being iterated.
+        """
+        slot = object()
+        with self._lock:
+            if len(self._slots) >= self.max_subscribers:
+                return None
+            self._slots.add(slot)
+        stream = self._stream(slot, last_event_id)
+        weakref.finalize(stream, self._release, slot)
+        return stream
+
+    async def _stream(self, slot: object, last_event_id: str | None) -> AsyncIterator[bytes]:
+        try:
+            cursor = self._last_id if last_event_id is None else self._cursor(last_event_id)
+            yield b"retry: 3000\n\n"
+            if cursor is None:
+                # An id from another boot (or not one of ours): nothing here lines up with it.
+                yield encode_frame(None, "resync", {"last_event_id": last_event_id})
+                cursor = self._last_id
+            while not self._closed:
+                wakeup = self._bind()
+                events, lagged = self._after(cursor)
+                if lagged:
+                    yield encode_frame(None, "resync", {"last_event_id": f"{self.boot}-{cursor}"})
+                    logger.info("Live feed subscriber lagged past the buffer at event %s", cursor)
+                if events:
+                    cursor = events[-1].id
+                    yield b"".join(e.frame for e in events)
+                    continue
+                try:
+                    await asyncio.wait_for(wakeup.wait(), self.heartbeat)
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+        finally:
+            self._release(slot)
@@ -0,0 +1,271 @@
+"""Background PDF export of report summaries.
+
+An export is a job: ``ExportManager.submit`` queues it on a small worker pool
+and returns at once, and the caller polls the job for progress. The worker
+reads matching reports in keyset batches (never holding a pooled connection
+while it draws), embeds cached thumbnails instead of decoding the full-size
+photos, and writes the PDF to a temp file in ``EXPORT_DIR``. That file is then
+streamed to the client from disk. Finished jobs and their files are dropped
+after ``EXPORT_TTL_SECONDS``.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, Iterator
+from uuid import uuid4
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from .config import EXPORT_DIR, EXPORT_MAX_JOBS, EXPORT_MAX_REPORTS, EXPORT_TTL_SECONDS, EXPORT_WORKERS, UPLOAD_DIR
+from .db import get_conn, now_iso
+from .storage import derivative
+
+logger = logging.getLogger(__name__)
+
+_BATCH = 200
+
+
+@dataclass(frozen=True)
+class ExportFilters:
+    start: date | None = None
+    end: date | None = None  # inclusive
+    severity: tuple[str, ...] = ()
+    status: tuple[str, ...] = ()
+
+    def where(self) -> tuple[str, list[Any]]:
+        clauses, args = [], []
+        if self.start is not None:
+            clauses.append("r.created_at >= ?")
+            args.append(self.start.isoformat())
+        if self.end is not None:
+            clauses.append("r.created_at < ?")
+            args.append((self.end + timedelta(days=1)).isoformat())
+        for column, values in (("r.severity_label", self.severity), ("r.status", self.status)):
+            if values:
+                clauses.append(f"{column} IN ({','.join('?' * len(values))})")
+                args.extend(values)
+        return " AND ".join(clauses) or "1", args
+
+
+@dataclass
+class ExportJob:
+    id: str
+    user_id: int
+    filters: ExportFilters
+    status: str = "queued"  # queued -> running -> done | failed
+    total: int = 0
+    rendered: int = 0
+    path: Path | None = None
+    error: str | None = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+    future: Future | None = field(default=None, repr=False)
+
+    @property
+    def progress(self) -> float:
+        if self.status == "done":
+            return 1.0
+        return round(self.rendered / self.total, 3) if self.total else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "total": self.total,
+            "rendered": self.rendered,
+            "progress": self.progress,
+            "error": self.error,
+            "filters": {
+                "start": self.filters.start.isoformat() if self.filters.start else None,
+                "end": self.filters.end.isoformat() if self.filters.end else None,
+                "severity": list(self.filters.severity),
+                "status": list(self.filters.status),
+            },
+        }
+
+
+def count_reports(filters: ExportFilters, limit: int = EXPORT_MAX_REPORTS) -> tuple[int, int]:
+    """(matching reports, capped at ``limit``; highest matching id) at this moment."""
+    where, args = filters.where()
+    with get_conn() as conn:
+        row = conn.execute(f"SELECT COUNT(*), MAX(r.id) FROM reports r WHERE {where}", args).fetchone()
+    return min(row[0], limit), row[1] or 0
+
+
+def iter_reports(filters: ExportFilters, upto_id: int, limit: int, batch: int = _BATCH) -> Iterator[dict]:
+    """Matching reports with id <= ``upto_id``, newest first, one short read per batch."""
+    where, args = filters.where()
+    cursor, remaining = upto_id + 1, limit
+    while remaining > 0:
+        with get_conn() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT r.id, r.emergency_type, r.severity_label, r.status, r.verification_score, r.created_at,
+                       r.latitude, r.longitude, r.selfie_path, r.accident_path, u.email AS reporter_email
+                FROM reports r JOIN users u ON u.id = r.user_id
+                WHERE r.id < ? AND {where}
+                ORDER BY r.id DESC LIMIT ?
+                """,
+                [cursor, *args, min(batch, remaining)],
+            ).fetchall()
+        if not rows:
+            return
+        for row in rows:
+            yield dict(row)
+        cursor, remaining = rows[-1]["id"], remaining - len(rows)
+
+
+def render_summary(reports: Iterator[dict], target: Path, on_report: Callable[[], None] | None = None) -> int:
+    """Draw the summary page by page into ``target``; returns the number of reports drawn."""
+    pdf = canvas.Canvas(str(target), pagesize=letter, pageCompression=1)
+    width, height = letter
+
+    y = height - 40
+    pdf.setFont("Helvetica-Bold", 14)
+    pdf.drawString(40, y, "SLSU Emergency Reports Summary")
+    y -= 18
+    pdf.setFont("Helvetica", 10)
+    pdf.drawString(40, y, f"Generated: {now_iso()}")
+    y -= 20
+
+    drawn = 0
+    for r in reports:
+        if y < 140:
+            pdf.showPage()
+            y = height - 40
+
+        pdf.setStrokeColor(colors.darkblue)
+        pdf.rect(35, y - 95, width - 70, 90, stroke=1, fill=0)
+        pdf.setFont("Helvetica-Bold", 10)
+        pdf.drawString(45, y - 15, f"Report #{r['id']} | {r['emergency_type']} | {r['severity_label']} | {r['status']}")
+        pdf.setFont("Helvetica", 9)
+        pdf.drawString(45, y - 30, f"User: {r.get('reporter_email', 'N/A')}")
+        pdf.drawString(45, y - 43, f"Verification: {r['verification_score']}  |  Time: {r['created_at']}")
+        pdf.drawString(45, y - 56, f"Location: {r['latitude']}, {r['longitude']}")
+
+        img_y = y - 90
+        for idx, stored in enumerate([r["selfie_path"], r["accident_path"]]):
+            x = 380 + (idx * 100)
+            source = UPLOAD_DIR / Path(stored).name
+            if not source.exists():
+                continue
+            thumb = derivative(source, "thumb")
+            try:
+                if thumb is None:
+                    raise ValueError("undecodable image")
+                # JPEG thumbnails are embedded as-is; identical photos share one image object.
+                pdf.drawImage(str(thumb), x, img_y, width=85, height=55, preserveAspectRatio=True)
+            except Exception:
+                pdf.setFont("Helvetica", 8)
+                pdf.drawString(x, img_y + 25, "img err")
+
+        y -= 105
+        drawn += 1
+        if on_report is not None:
+            on_report()
+
+    pdf.save()
+    return drawn
+
+
+class ExportManager:
+    """Runs export jobs on a bounded worker pool and keeps them for ``ttl`` seconds."""
+
+    def __init__(
+        self,
+        workers: int = EXPORT_WORKERS,
+        max_jobs: int = EXPORT_MAX_JOBS,
+        ttl: float = EXPORT_TTL_SECONDS,
+        directory: Path = EXPORT_DIR,
+        max_reports: int = EXPORT_MAX_REPORTS,
+    ) -> None:
+        self.workers = max(1, workers)
+        self.max_jobs = max(1, max_jobs)
+        self.ttl = ttl
+        self.directory = Path(directory)
+        self.max_reports = max_reports
+        self._jobs: dict[str, ExportJob] = {}
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Create the export directory and remove files left by a previous run."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for leftover in self.directory.glob("export_*.pdf*"):
+            leftover.unlink(missing_ok=True)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="export")
+        return self._executor
+
+    @property
+    def active(self) -> int:
+        return sum(job.status in {"queued", "running"} for job in self._jobs.values())
+
+    def submit(self, user_id: int, filters: ExportFilters) -> ExportJob | None:
+        """Queue an export; returns None when ``max_jobs`` are already queued or running."""
+        self.expire()
+        with self._lock:
+            if self.active >= self.max_jobs:
+                return None
+            job = ExportJob(id=uuid4().hex, user_id=user_id, filters=filters)
+            self._jobs[job.id] = job
+            job.future = self._get_executor().submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> ExportJob | None:
+        """The job, or None if it is unknown or has expired (its file is then deleted)."""
+        self.expire()
+        return self._jobs.get(job_id)
+
+    def _run(self, job: ExportJob) -> ExportJob:
+        job.status = "running"
+        partial = self.directory / f"export_{job.id}.pdf.part"
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            job.total, upto_id = count_reports(job.filters, self.max_reports)
+
+            def tick() -> None:
+                job.rendered += 1
+
+            drawn = render_summary(iter_reports(job.filters, upto_id, job.total), partial, tick)
+            job.total = drawn  # reports deleted mid-export are simply skipped
+            target = partial.with_suffix("")
+            partial.replace(target)
+            job.path = target
+            job.status = "done"
+        except Exception as exc:
+            logger.exception("PDF export %s failed", job.id)
+            partial.unlink(missing_ok=True)
+            job.error = str(exc) or exc.__class__.__name__
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+        return job
+
+    def expire(self, now: float | None = None) -> int:
+        """Forget finished jobs older than ``ttl`` and delete their files."""
+        now = time.time() if now is None else now
+        with self._lock:
+            stale = [j for j in self._jobs.values() if j.finished_at is not None and now - j.finished_at >= self.ttl]
+            for job in stale:
+                del self._jobs[job.id]
+        for job in stale:
+            if job.path is not None:
+                job.path.unlink(missing_ok=True)
+        return len(stale)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,159 @@
+"""Perceptual-hash index of accident photos and cache of verification results.
+
+Accident photos are fingerprinted with a 64-bit dHash and kept in an
+in-memory BK-tree, so finding earlier photos within a small Hamming distance
+costs roughly O(log n) instead of a scan. Both the fingerprints and the
+verification results per (selfie, accident) content pair are persisted in
+SQLite and reloaded on startup. Cached results are tagged with the
+``VALIDATOR_VERSION`` that produced them and only reused by the same version.
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from typing import Any, Generic, TypeVar
+
+from .config import PHASH_MAX_DISTANCE
+from .cv_utils import VALIDATOR_VERSION
+from .db import get_conn, now_iso
+
+T = TypeVar("T")
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class BKTree(Generic[T]):
+    """Burkhard-Keller tree over integer hashes with Hamming distance."""
+
+    def __init__(self) -> None:
+        # node = (hash, items, children keyed by distance to this node)
+        self._root: tuple[int, list[T], dict[int, Any]] | None = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, value: int, item: T) -> None:
+        self._size += 1
+        if self._root is None:
+            self._root = (value, [item], {})
+            return
+        node = self._root
+        while True:
+            distance = hamming(value, node[0])
+            if distance == 0:
+                node[1].append(item)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = (value, [item], {})
+                return
+            node = child
+
+    def search(self, value: int, max_distance: int) -> list[tuple[int, T]]:
+        """Return ``(distance, item)`` pairs within ``max_distance``, nearest first."""
+        if self._root is None:
+            return []
+        found: list[tuple[int, T]] = []
+        stack = [self._root]
+        while stack:
+            node_value, items, children = stack.pop()
+            distance = hamming(value, node_value)
+            if distance <= max_distance:
+                found.extend((distance, item) for item in items)
+            # Triangle inequality: only subtrees at distance d +/- max_distance can match.
+            for edge, child in children.items():
+                if distance - max_distance <= edge <= distance + max_distance:
+                    stack.append(child)
+        found.sort(key=lambda pair: pair[0])
+        return found
+
+
+class ImageIndex:
+    """Thread-safe fingerprint index for accident photos, backed by SQLite."""
+
+    def __init__(self, max_distance: int = PHASH_MAX_DISTANCE) -> None:
+        self.max_distance = max_distance
+        self._tree: BKTree[int] = BKTree()
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def load(self) -> None:
+        tree: BKTree[int] = BKTree()
+        with get_conn() as conn:
+            for row in conn.execute("SELECT dhash, report_id FROM image_fingerprints ORDER BY report_id"):
+                tree.add(int(row["dhash"], 16), row["report_id"])
+        with self._lock:
+            self._tree = tree
+            self._loaded = True
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.load()
+
+    def similar_reports(self, dhash: int, max_distance: int | None = None) -> list[tuple[int, int]]:
+        """Earlier report ids whose accident photo is within the Hamming threshold."""
+        self._ensure_loaded()
+        limit = self.max_distance if max_distance is None else max_distance
+        with self._lock:
+            return [(report_id, distance) for distance, report_id in self._tree.search(dhash, limit)]
+
+    def add(self, report_id: int, sha256: str, dhash: int) -> None:
+        with get_conn() as conn:
+            self.record(conn, report_id, sha256, dhash)
+        self.remember(report_id, dhash)
+
+    @staticmethod
+    def record(conn: sqlite3.Connection, report_id: int, sha256: str, dhash: int) -> None:
+        """Store a fingerprint inside the caller's transaction; call ``remember`` once it commits."""
+        conn.execute(
+            "INSERT OR IGNORE INTO image_fingerprints (report_id, sha256, dhash, created_at) VALUES (?,?,?,?)",
+            (report_id, sha256, f"{dhash:016x}", now_iso()),
+        )
+
+    @staticmethod
+    def stored_dhash(sha256: str | None) -> int | None:
+        """Fingerprint already computed for this content by an earlier report, if any."""
+        if not sha256:
+            return None
+        with get_conn() as conn:
+            row = conn.execute("SELECT dhash FROM image_fingerprints WHERE sha256=? LIMIT 1", (sha256,)).fetchone()
+        return int(row["dhash"], 16) if row else None
+
+    def remember(self, report_id: int, dhash: int) -> None:
+        if not self._loaded:
+            self.load()  # picks up the committed row itself
+            return
+        with self._lock:
+            self._tree.add(dhash, report_id)
+
+
+def cached_verification(selfie_sha256: str | None, accident_sha256: str | None) -> dict[str, Any] | None:
+    if not selfie_sha256 or not accident_sha256:
+        return None
+    with get_conn() as conn:
+        row = conn.execute(
+            "SELECT result FROM verification_cache WHERE selfie_sha256=? AND accident_sha256=? AND validator_version=?",
+            (selfie_sha256, accident_sha256, VALIDATOR_VERSION),
+        ).fetchone()
+    if not row:
+        return None
+    result = json.loads(row["result"])
+    result["decided_by"] = "cache"
+    return result
+
+
+def store_verification(selfie_sha256: str | None, accident_sha256: str | None, result: dict[str, Any]) -> None:
+    if not selfie_sha256 or not accident_sha256:
+        return
+    with get_conn() as conn:
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO verification_cache (selfie_sha256, accident_sha256, result, validator_version, created_at)
+            VALUES (?,?,?,?,?)
+            """,
+            (selfie_sha256, accident_sha256, json.dumps(result), VALIDATOR_VERSION, now_iso()),
+        )
@@ -0,0 +1,72 @@
+"""Bounded background worker pools for report scoring and upload housekeeping."""
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+from .config import INGEST_MAX_PENDING, INGEST_WORKERS
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionQueue:
+    """Run report processing jobs on a fixed-size pool with a capped backlog.
+
+    ``submit`` never blocks: when ``max_pending`` jobs are already queued or
+    running it returns ``None`` and the caller decides how to degrade.
+    """
+
+    def __init__(
+        self, workers: int = INGEST_WORKERS, max_pending: int = INGEST_MAX_PENDING, name: str = "ingest"
+    ) -> None:
+        self.name = name
+        self.workers = max(1, workers)
+        self.max_pending = max(1, max_pending)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=self.name)
+            return self._executor
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future | None:
+        if not self._slots.acquire(blocking=False):
+            return None
+        with self._lock:
+            self._pending += 1
+        try:
+            future = self._get_executor().submit(self._run, fn, *args)
+        except Exception:
+            self._done()
+            raise
+        return future
+
+    def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        try:
+            return fn(*args)
+        except Exception:
+            logger.exception("Background %s job %s%r failed", self.name, getattr(fn, "__name__", fn), args)
+            raise
+        finally:
+            self._done()
+
+    def _done(self) -> None:
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
@@ -1,25 +1,44 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
-import io
 import json
+import sqlite3
+from contextlib import contextmanager
+from datetime import date, datetime
 from pathlib import Path
-from uuid import uuid4
+from typing import Iterator, Literal
 
-from fastapi import Depends, FastAPI, File, Form, Header, HTTPException, Request, UploadFile
+from fastapi import Depends, FastAPI, File, Form, Header, HTTPException, Query, Request, Response, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
-from fastapi.staticfiles import StaticFiles
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.utils import ImageReader
-from reportlab.pdfgen import canvas
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field
 
+from . import rollups
 from .ai import SeverityModel
-from .auth import create_token, decode_token, hash_password, verify_password
-from .config import RATE_LIMIT_PER_HOUR, SUSPICIOUS_VERIFICATION_THRESHOLD, UPLOAD_DIR
-from .cv_utils import validate_images
-from .db import get_conn, init_db, now_iso
+from .audit import AuditWriter
+from .auth import PasswordHasher, create_token, decode_token, hash_password
+from .config import (
+    ASYNC_INGESTION,
+    MAX_PREDICT_BATCH,
+    RATE_LIMIT_PER_HOUR,
+    REPORTS_PAGE_MAX,
+    REPORTS_PAGE_SIZE,
+    SUSPICIOUS_VERIFICATION_THRESHOLD,
+    UPLOAD_DIR,
+    UPLOAD_JOB_MAX_PENDING,
+    UPLOAD_JOB_WORKERS,
+)
+from .cv_utils import dhash, validate_images, validation_service
+from .db import api_timestamp, close_pool, get_conn, init_db, now_iso
+from .events import BroadcastHub
+from .exports import ExportFilters, ExportJob, ExportManager
+from .image_index import ImageIndex, cached_verification, store_verification
+from .ingestion import IngestionQueue
+from .ratelimit import Decision, RateLimiter
+from .storage import DERIVATIVE_SIZES, UploadFiles, collect_garbage, make_derivatives, save_upload
+from .sync import changes_since, etag_matches, make_etag, reports_seq, users_version
 
 app = FastAPI(title="SLSU Emergency AI MVP")
 app.add_middleware(
@@ -27,17 +46,48 @@ app.add_middleware(
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Sync-Cursor", "Link", "ETag"],
 )
-app.mount("/uploads", StaticFiles(directory=str(UPLOAD_DIR)), name="uploads")
+app.mount("/uploads", UploadFiles(directory=str(UPLOAD_DIR)), name="uploads")
 
 severity_model = SeverityModel()
+ingestion = IngestionQueue()
+upload_jobs = IngestionQueue(UPLOAD_JOB_WORKERS, UPLOAD_JOB_MAX_PENDING, name="uploads")
+image_index = ImageIndex()
+report_events = BroadcastHub()
+rate_limiter = RateLimiter()
+password_hasher = PasswordHasher()
+audit_writer = AuditWriter()
+export_manager = ExportManager()
 
 
 @app.on_event("startup")
 def startup() -> None:
     init_db()
+    audit_writer.start()
     severity_model.load()
+    severity_model.load_metrics()
+    validation_service.start()
+    password_hasher.start()
+    export_manager.start()
+    image_index.load()
+    rate_limiter.load()
     seed_accounts()
+    resume_pending_ingestion()
+    upload_jobs.submit(collect_garbage)
+
+
+@app.on_event("shutdown")
+def shutdown() -> None:
+    report_events.close()
+    ingestion.shutdown(wait=True)
+    upload_jobs.shutdown(wait=True)
+    export_manager.shutdown()
+    audit_writer.shutdown()
+    severity_model.shutdown()
+    validation_service.shutdown()
+    password_hasher.shutdown()
+    close_pool()
 
 
 def seed_accounts() -> None:
@@ -53,14 +103,11 @@ def seed_accounts() -> None:
 
 def write_audit(user_id: int | None, action: str, request: Request, device_id: str | None = None, details: str = "") -> None:
     ip = request.client.host if request.client else "unknown"
-    with get_conn() as conn:
-        conn.execute(
-            "INSERT INTO audit_logs (user_id,action,ip_address,device_id,details,created_at) VALUES (?,?,?,?,?,?)",
-            (user_id, action, ip, device_id, details, now_iso()),
-        )
+    audit_writer.write((user_id, action, ip, device_id, details, now_iso()))
 
 
-def get_current_user(authorization: str = Header(default="")) -> dict:
+async def get_current_user(authorization: str = Header(default="")) -> dict:
+    # Async so the (usually cached) token check does not hop through the threadpool.
     if not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Missing bearer token")
     return decode_token(authorization.replace("Bearer ", "", 1))
@@ -71,120 +118,129 @@ def role_guard(user: dict, allowed: set[str]) -> None:
         raise HTTPException(status_code=403, detail="Forbidden")
 
 
-def update_user_risk_score(user_id: int, *, increase_by: float = 0.0, flagged: bool | None = None) -> None:
-    with get_conn() as conn:
-        row = conn.execute("SELECT risk_score, account_flagged FROM users WHERE id=?", (user_id,)).fetchone()
-        if not row:
-            return
-        risk_score = float(row["risk_score"]) + increase_by
-        account_flagged = int(row["account_flagged"])
-        if flagged is True:
-            account_flagged = 1
-        conn.execute(
-            "UPDATE users SET risk_score=?, account_flagged=? WHERE id=?",
-            (round(risk_score, 2), account_flagged, user_id),
+def update_user_risk_score(
+    user_id: int, *, increase_by: float = 0.0, flagged: bool | None = None, conn: sqlite3.Connection | None = None
+) -> None:
+    """Add to a user's risk score in one statement, so concurrent increments are never lost.
+
+    Pass ``conn`` to apply it inside the caller's transaction.
+    """
+    if conn is None:
+        with get_conn() as conn:
+            update_user_risk_score(user_id, increase_by=increase_by, flagged=flagged, conn=conn)
+        return
+    conn.execute(
+        "UPDATE users SET risk_score = round(risk_score + ?, 2), account_flagged = MAX(account_flagged, ?) WHERE id=?",
+        (increase_by, int(flagged is True), user_id),
+    )
+
+
+def _rate_limit_keys(user_id: int, device_id: str | None, ip: str | None) -> dict[str, str | None]:
+    return {
+        "user": str(user_id),
+        "device": None if device_id in (None, "", "unknown-device") else device_id,
+        "ip": ip,
+    }
+
+
+def enforce_rate_limit(user_id: int, device_id: str | None = None, ip: str | None = None) -> Decision:
+    """Take one submission slot, or block the submission if any limit is exceeded.
+
+    Going over the per-user limit also flags the account; device and IP limits
+    only refuse the request, since those keys can be shared. The slot is
+    counted together with the check, so parallel submissions cannot all pass
+    it; ``submission_quota`` gives it back if the report is not stored.
+    """
+    decision = rate_limiter.hit(_rate_limit_keys(user_id, device_id, ip), save=False)
+    if not decision.allowed:
+        headers = {"Retry-After": str(int(decision.retry_after) + 1)}
+        if decision.blocked_by == "user":
+            update_user_risk_score(user_id, increase_by=25, flagged=True)
+            raise HTTPException(
+                status_code=429,
+                detail=f"Rate limit exceeded: max {RATE_LIMIT_PER_HOUR} reports per hour. Account flagged.",
+                headers=headers,
+            )
+        raise HTTPException(
+            status_code=429, detail=f"Rate limit exceeded for this {decision.blocked_by}. Try again later.", headers=headers
         )
+    return decision
 
 
-def enforce_rate_limit(user_id: int) -> int:
-    """Return count in the last hour. If limit exceeded, flag user and block submission."""
+@contextmanager
+def submission_quota(user_id: int, device_id: str | None = None, ip: str | None = None) -> Iterator[Decision]:
+    """Hold a submission slot while the report is stored.
+
+    If the block raises, the slot is released: only stored reports use up
+    quota. The block charges the slot with ``charge_submission`` inside the
+    report's transaction.
+    """
+    decision = enforce_rate_limit(user_id, device_id, ip)
+    try:
+        yield decision
+    except BaseException:
+        rate_limiter.release(_rate_limit_keys(user_id, device_id, ip), decision.at)
+        raise
+
+
+def charge_submission(
+    conn: sqlite3.Connection, user_id: int, device_id: str | None, ip: str | None, decision: Decision
+) -> None:
+    """Persist a held slot on the report's transaction.
+
+    The report that brings the user to one under the hourly limit also adds
+    8 to their risk score; the count comes from ``hit``, so exactly one of
+    several parallel submissions matches.
+    """
+    rate_limiter.save(_rate_limit_keys(user_id, device_id, ip), decision.at, conn)
+    if decision.counts.get("user") == RATE_LIMIT_PER_HOUR - 1:
+        update_user_risk_score(user_id, increase_by=8, conn=conn)
+
+
+def _insert_citizen(email: str, password_hash: str) -> sqlite3.Row:
     with get_conn() as conn:
-        count = conn.execute(
-            "SELECT COUNT(*) as c FROM reports WHERE user_id=? AND created_at >= datetime('now','-1 hour')",
-            (user_id,),
-        ).fetchone()["c"]
-
-    if count >= RATE_LIMIT_PER_HOUR:
-        update_user_risk_score(user_id, increase_by=25, flagged=True)
-        raise HTTPException(status_code=429, detail="Rate limit exceeded: max 3 reports per hour. Account flagged.")
-    return int(count)
-
-
-def safe_save(upload: UploadFile, prefix: str) -> Path:
-    ext = Path(upload.filename or "img.jpg").suffix.lower() or ".jpg"
-    filename = f"{prefix}_{uuid4().hex}{ext}"
-    target = UPLOAD_DIR / filename
-    target.write_bytes(upload.file.read())
-    return target
-
-
-def _build_pdf_summary(reports: list[dict]) -> bytes:
-    buff = io.BytesIO()
-    pdf = canvas.Canvas(buff, pagesize=letter)
-    width, height = letter
-
-    y = height - 40
-    pdf.setFont("Helvetica-Bold", 14)
-    pdf.drawString(40, y, "SLSU Emergency Reports Summary")
-    y -= 18
-    pdf.setFont("Helvetica", 10)
-    pdf.drawString(40, y, f"Generated: {now_iso()}")
-    y -= 20
-
-    for r in reports:
-        if y < 140:
-            pdf.showPage()
-            y = height - 40
-
-        pdf.setStrokeColor(colors.darkblue)
-        pdf.rect(35, y - 95, width - 70, 90, stroke=1, fill=0)
-        pdf.setFont("Helvetica-Bold", 10)
-        pdf.drawString(45, y - 15, f"Report #{r['id']} | {r['emergency_type']} | {r['severity_label']} | {r['status']}")
-        pdf.setFont("Helvetica", 9)
-        pdf.drawString(45, y - 30, f"User: {r.get('reporter_email', 'N/A')}")
-        pdf.drawString(45, y - 43, f"Verification: {r['verification_score']}  |  Time: {r['created_at']}")
-        pdf.drawString(45, y - 56, f"Location: {r['latitude']}, {r['longitude']}")
-
-        selfie = UPLOAD_DIR / Path(r["selfie_path"]).name
-        accident = UPLOAD_DIR / Path(r["accident_path"]).name
-
-        img_y = y - 90
-        for idx, p in enumerate([selfie, accident]):
-            x = 380 + (idx * 100)
-            if p.exists():
-                try:
-                    pdf.drawImage(ImageReader(str(p)), x, img_y, width=85, height=55, preserveAspectRatio=True)
-                except Exception:
-                    pdf.setFont("Helvetica", 8)
-                    pdf.drawString(x, img_y + 25, "img err")
-
-        y -= 105
-
-    pdf.save()
-    buff.seek(0)
-    return buff.read()
+        try:
+            conn.execute(
+                "INSERT INTO users (email,password_hash,role,created_at) VALUES (?,?,?,?)",
+                (email, password_hash, "citizen", now_iso()),
+            )
+        except sqlite3.IntegrityError as exc:
+            raise HTTPException(status_code=400, detail="Email already exists") from exc
+        return conn.execute("SELECT id,email,role,risk_score,account_flagged FROM users WHERE email=?", (email,)).fetchone()
 
 
-@app.post("/auth/register")
-def register(email: str = Form(...), password: str = Form(...), request: Request = None):
+def _find_login_user(email: str) -> sqlite3.Row | None:
     with get_conn() as conn:
-        existing = conn.execute("SELECT id FROM users WHERE email=?", (email.lower(),)).fetchone()
-        if existing:
-            raise HTTPException(status_code=400, detail="Email already exists")
-        conn.execute(
-            "INSERT INTO users (email,password_hash,role,created_at) VALUES (?,?,?,?)",
-            (email.lower(), hash_password(password), "citizen", now_iso()),
-        )
-        user = conn.execute("SELECT id,email,role,risk_score,account_flagged FROM users WHERE email=?", (email.lower(),)).fetchone()
+        return conn.execute(
+            "SELECT id,email,role,password_hash,risk_score,account_flagged FROM users WHERE email=?",
+            (email,),
+        ).fetchone()
+
+
+# Both auth routes are async: PBKDF2 runs on password_hasher's process pool,
+# and only the short DB steps borrow a threadpool thread.
+@app.post("/auth/register")
+async def register(email: str = Form(...), password: str = Form(...), request: Request = None):
+    email = email.lower()
+    if await run_in_threadpool(_find_login_user, email):
+        raise HTTPException(status_code=400, detail="Email already exists")
+    password_hash = await password_hasher.hash(password)
+    user = await run_in_threadpool(_insert_citizen, email, password_hash)
 
     if request:
-        write_audit(user["id"], "register", request)
+        await run_in_threadpool(write_audit, user["id"], "register", request)
     token = create_token({"user_id": user["id"], "email": user["email"], "role": user["role"]})
     return {"token": token, "user": dict(user)}
 
 
 @app.post("/auth/login")
-def login(email: str = Form(...), password: str = Form(...), request: Request = None):
-    with get_conn() as conn:
-        user = conn.execute(
-            "SELECT id,email,role,password_hash,risk_score,account_flagged FROM users WHERE email=?",
-            (email.lower(),),
-        ).fetchone()
-    if not user or not verify_password(password, user["password_hash"]):
+async def login(email: str = Form(...), password: str = Form(...), request: Request = None):
+    user = await run_in_threadpool(_find_login_user, email.lower())
+    if not user or not await password_hasher.verify(password, user["password_hash"]):
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
     if request:
-        write_audit(user["id"], "login", request)
+        await run_in_threadpool(write_audit, user["id"], "login", request)
     token = create_token({"user_id": user["id"], "email": user["email"], "role": user["role"]})
     return {
         "token": token,
@@ -198,158 +254,658 @@ def login(email: str = Form(...), password: str = Form(...), request: Request =
     }
 
 
-@app.post("/reports")
-def create_report(
-    request: Request,
-    emergency_type: str = Form(...),
-    description: str = Form(...),
-    latitude: float = Form(...),
-    longitude: float = Form(...),
-    device_id: str = Form("unknown-device"),
-    lora_payload: str = Form(""),
-    selfie: UploadFile = File(...),
-    accident_photo: UploadFile = File(...),
-    user: dict = Depends(get_current_user),
-):
-    recent_count = enforce_rate_limit(user["user_id"])
-
-    selfie_path = safe_save(selfie, "selfie")
-    accident_path = safe_save(accident_photo, "accident")
-
+def assess_report(
+    user_id: int,
+    emergency_type: str,
+    description: str,
+    selfie_path: Path,
+    accident_path: Path,
+    selfie_sha256: str | None = None,
+    accident_sha256: str | None = None,
+) -> dict:
+    """Score severity and verify images.
+
+    Nothing is written here: ``risk_increase`` is what the caller should add
+    to the reporter's risk score in the same transaction as the report.
+    """
     risk_score = 0.8 if emergency_type.lower() in {"fire", "crime", "accident"} else 0.5
     severity_label, confidence = severity_model.predict(emergency_type, description, risk_score)
-    verification = validate_images(selfie_path, accident_path)
+    verification = cached_verification(selfie_sha256, accident_sha256)
+    if verification is None:
+        verification = validate_images(selfie_path, accident_path, selfie_sha256, accident_sha256)
+        store_verification(selfie_sha256, accident_sha256, verification)
+
+    # Accident photos that match an earlier report's photo are likely reused or pranks.
+    # Identical content was fingerprinted when it was first reported.
+    accident_hash = image_index.stored_dhash(accident_sha256)
+    if accident_hash is None:
+        accident_hash = dhash(accident_path)
+    reused = image_index.similar_reports(accident_hash) if accident_hash is not None else []
+    if reused:
+        verification["flags"].append("accident_photo_reused")
+        verification["reused_from_reports"] = [report_id for report_id, _ in reused[:5]]
+        verification["suspicious"] = True
 
-    status_label = "Pending"
+    status_label = "Needs Review" if reused else "Pending"
+    risk_increase = 0
     if verification["verification_score"] < SUSPICIOUS_VERIFICATION_THRESHOLD:
         status_label = "Needs Review"
         verification["suspicious"] = True
-        update_user_risk_score(user["user_id"], increase_by=12)
+        risk_increase = 12
     if verification["verification_score"] < 20:
         status_label = "Rejected"
 
-    # Escalate risk score for frequent submissions near threshold.
-    if recent_count == RATE_LIMIT_PER_HOUR - 1:
-        update_user_risk_score(user["user_id"], increase_by=8)
+    return {
+        "severity": {"label": severity_label, "confidence": confidence},
+        "verification": verification,
+        "status": status_label,
+        "accident_dhash": accident_hash,
+        "risk_increase": risk_increase,
+    }
+
 
+def process_report(report_id: int) -> dict | None:
+    """Background job: finish a report acknowledged with status 'Processing'."""
+    with get_conn() as conn:
+        row = conn.execute(
+            """
+            SELECT user_id, emergency_type, description, selfie_path, accident_path, selfie_sha256, accident_sha256
+            FROM reports WHERE id=? AND status='Processing'
+            """,
+            (report_id,),
+        ).fetchone()
+    if not row:
+        return None
+
+    try:
+        result = assess_report(
+            row["user_id"],
+            row["emergency_type"],
+            row["description"],
+            UPLOAD_DIR / Path(row["selfie_path"]).name,
+            UPLOAD_DIR / Path(row["accident_path"]).name,
+            row["selfie_sha256"],
+            row["accident_sha256"],
+        )
+    except Exception:
+        with get_conn() as conn:
+            conn.execute(
+                "UPDATE reports SET status='Needs Review', suspicious=1, verification_flags=?, updated_at=? WHERE id=? AND status='Processing'",
+                (json.dumps(["processing_failed"]), now_iso(), report_id),
+            )
+        publish_report_event(report_id, "report.updated")
+        raise
+
+    verification = result["verification"]
     with get_conn() as conn:
-        conn.execute(
+        conn.execute("BEGIN IMMEDIATE")
+        updated = conn.execute(
             """
-            INSERT INTO reports (
-                user_id,device_id,emergency_type,description,latitude,longitude,selfie_path,accident_path,lora_payload,
-                severity_label,severity_confidence,verification_score,face_ok,accident_image_ok,suspicious,status,created_at,updated_at
-            ) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+            UPDATE reports SET
+                severity_label=?, severity_confidence=?, verification_score=?, face_ok=?, accident_image_ok=?,
+                suspicious=?, verification_flags=?, status=?, updated_at=?
+            WHERE id=? AND status='Processing'
             """,
             (
-                user["user_id"],
-                device_id,
-                emergency_type,
-                description,
-                latitude,
-                longitude,
-                str(selfie_path.relative_to(UPLOAD_DIR.parent)),
-                str(accident_path.relative_to(UPLOAD_DIR.parent)),
-                lora_payload,
-                severity_label,
-                confidence,
+                result["severity"]["label"],
+                result["severity"]["confidence"],
                 verification["verification_score"],
                 int(verification["face_ok"]),
                 int(verification["accident_image_ok"]),
                 int(verification["suspicious"]),
-                status_label,
-                now_iso(),
+                json.dumps(verification["flags"]),
+                result["status"],
                 now_iso(),
+                report_id,
             ),
-        )
-        report_id = conn.execute("SELECT last_insert_rowid() as id").fetchone()["id"]
+        ).rowcount
+        if updated:
+            if result["risk_increase"]:
+                update_user_risk_score(row["user_id"], increase_by=result["risk_increase"], conn=conn)
+            if result["accident_dhash"] is not None:
+                image_index.record(conn, report_id, row["accident_sha256"] or "", result["accident_dhash"])
+    if updated and result["accident_dhash"] is not None:
+        image_index.remember(report_id, result["accident_dhash"])
+    publish_report_event(report_id, "report.updated")
+    return result
+
+
+def resume_pending_ingestion() -> None:
+    """Requeue reports left in 'Processing' by a previous process."""
+    with get_conn() as conn:
+        rows = conn.execute("SELECT id FROM reports WHERE status='Processing' ORDER BY id").fetchall()
+    for row in rows:
+        if ingestion.submit(process_report, row["id"]) is None:
+            break
+
 
+@app.post("/reports")
+def create_report(
+    request: Request,
+    emergency_type: str = Form(...),
+    description: str = Form(...),
+    latitude: float = Form(...),
+    longitude: float = Form(...),
+    device_id: str = Form("unknown-device"),
+    lora_payload: str = Form(""),
+    async_processing: bool = Form(ASYNC_INGESTION),
+    selfie: UploadFile = File(...),
+    accident_photo: UploadFile = File(...),
+    user: dict = Depends(get_current_user),
+):
+    client_ip = request.client.host if request.client else None
+    # A failed request gives its slot back; only stored reports use up quota.
+    with submission_quota(user["user_id"], device_id, client_ip) as quota:
+        # Files of a failed request stay behind: another report may already share
+        # them. collect_garbage() removes them once nothing references them.
+        saved_selfie = save_upload(selfie, "selfie")
+        saved_accident = save_upload(accident_photo, "accident")
+
+        if async_processing:
+            result = {
+                "severity": {"label": "Processing", "confidence": 0.0},
+                "verification": {
+                    "face_ok": False,
+                    "accident_image_ok": False,
+                    "suspicious": False,
+                    "verification_score": 0.0,
+                    "flags": [],
+                },
+                "status": "Processing",
+            }
+        else:
+            result = assess_report(
+                user["user_id"],
+                emergency_type,
+                description,
+                saved_selfie.path,
+                saved_accident.path,
+                saved_selfie.sha256,
+                saved_accident.sha256,
+            )
+        verification = result["verification"]
+
+        risk_increase = result.get("risk_increase", 0)
+
+        # One unit of work: the report, the reporter's risk score, the quota hit
+        # and the photo fingerprint commit together or not at all.
+        with get_conn() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            cursor = conn.execute(
+                """
+                INSERT INTO reports (
+                    user_id,device_id,emergency_type,description,latitude,longitude,selfie_path,accident_path,lora_payload,
+                    selfie_sha256,accident_sha256,severity_label,severity_confidence,verification_score,face_ok,accident_image_ok,
+                    suspicious,verification_flags,status,created_at,updated_at
+                ) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+                """,
+                (
+                    user["user_id"],
+                    device_id,
+                    emergency_type,
+                    description,
+                    latitude,
+                    longitude,
+                    str(saved_selfie.path.relative_to(UPLOAD_DIR.parent)),
+                    str(saved_accident.path.relative_to(UPLOAD_DIR.parent)),
+                    lora_payload,
+                    saved_selfie.sha256,
+                    saved_accident.sha256,
+                    result["severity"]["label"],
+                    result["severity"]["confidence"],
+                    verification["verification_score"],
+                    int(verification["face_ok"]),
+                    int(verification["accident_image_ok"]),
+                    int(verification["suspicious"]),
+                    json.dumps(verification["flags"]),
+                    result["status"],
+                    now_iso(),
+                    now_iso(),
+                ),
+            )
+            report_id = cursor.lastrowid
+            if risk_increase:
+                update_user_risk_score(user["user_id"], increase_by=risk_increase, conn=conn)
+            charge_submission(conn, user["user_id"], device_id, client_ip, quota)
+            if result.get("accident_dhash") is not None:
+                image_index.record(conn, report_id, saved_accident.sha256, result["accident_dhash"])
+
+    if result.get("accident_dhash") is not None:
+        image_index.remember(report_id, result["accident_dhash"])
     write_audit(user["user_id"], "create_report", request, device_id, f"report_id={report_id}")
+    publish_report_event(report_id, "report.created")
+
+    if async_processing and ingestion.submit(process_report, report_id) is None:
+        # Worker backlog is full: finish the report on the request thread instead.
+        result = process_report(report_id) or result
+        verification = result["verification"]
+    # Best effort: if the backlog is full, /uploads generates them on first view instead.
+    upload_jobs.submit(make_derivatives, saved_selfie.path, saved_accident.path)
+
     return {
         "id": report_id,
-        "severity": {"label": severity_label, "confidence": confidence},
+        "severity": result["severity"],
         "verification": verification,
-        "status": status_label,
+        "status": result["status"],
+        "status_url": f"/reports/{report_id}",
+    }
+
+
+_REPORT_COLUMNS = (
+    "id", "user_id", "device_id", "emergency_type", "description", "latitude", "longitude", "selfie_path",
+    "accident_path", "lora_payload", "severity_label", "severity_confidence", "verification_score", "face_ok",
+    "accident_image_ok", "suspicious", "status", "created_at", "updated_at", "verification_flags",
+    "selfie_sha256", "accident_sha256",
+)
+REPORT_LIST_FIELDS = {
+    **{column: f"r.{column}" for column in _REPORT_COLUMNS},
+    "reporter_email": "u.email",
+    "risk_score": "u.risk_score",
+    "account_flagged": "u.account_flagged",
+}
+MY_REPORT_FIELDS = {
+    column: f"r.{column}"
+    for column in (
+        "id", "emergency_type", "description", "latitude", "longitude", "severity_label", "severity_confidence",
+        "verification_score", "status", "created_at",
+    )
+}
+STAFF_REPORT_SOURCE = "reports r JOIN users u ON u.id = r.user_id"
+MY_REPORT_SOURCE = "reports r"
+# Computed per row in Python, only when requested; values are the columns they need.
+REPORT_DERIVED_FIELDS = {
+    "selfie_url": ("selfie_path",),
+    "selfie_thumb_url": ("selfie_path",),
+    "selfie_medium_url": ("selfie_path",),
+    "accident_url": ("accident_path",),
+    "accident_thumb_url": ("accident_path",),
+    "accident_medium_url": ("accident_path",),
+    "map_url": ("latitude", "longitude"),
+}
+
+
+def _upload_urls(photo: str, stored_path: str) -> dict:
+    """Original and derivative URLs (``<photo>_url``, ``<photo>_thumb_url``, ...) for an upload."""
+    name = Path(stored_path).name
+    return {
+        f"{photo}_url": f"/uploads/{name}",
+        **{f"{photo}_{size}_url": f"/uploads/{size}/{name}" for size in DERIVATIVE_SIZES},
     }
 
 
+def _derive_report_urls(row: dict) -> dict:
+    for photo in ("selfie", "accident"):
+        if f"{photo}_path" in row:
+            row.update(_upload_urls(photo, row[f"{photo}_path"]))
+    if "latitude" in row and "longitude" in row:
+        row["map_url"] = f"https://www.google.com/maps?q={row['latitude']},{row['longitude']}"
+    return row
+
+
+def _report_projection(
+    fields: str | None, allowed: dict[str, str], derived: dict[str, tuple[str, ...]]
+) -> tuple[list[str], str]:
+    """Validate ``fields`` and return (requested names, SELECT list covering them)."""
+    if fields:
+        requested = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+        unknown = [f for f in requested if f not in allowed and f not in derived]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    else:
+        requested = list(allowed) + list(derived)
+
+    columns = {"id"} | {f for f in requested if f in allowed}
+    for name in requested:
+        columns.update(derived.get(name, ()))
+    select = ", ".join(f"{allowed[name]} AS {name}" for name in allowed if name in columns)
+    return requested, select
+
+
+_TIMESTAMP_FIELDS = ("created_at", "updated_at")
+
+
+def _project_rows(rows: list, requested: list[str], derived: dict[str, tuple[str, ...]]) -> list[dict]:
+    wanted = set(requested)
+    out = []
+    for row in rows:
+        d = dict(row)
+        for name in _TIMESTAMP_FIELDS:
+            if name in d:
+                d[name] = api_timestamp(d[name])
+        if wanted & derived.keys():
+            _derive_report_urls(d)
+        out.append({k: v for k, v in d.items() if k in wanted})
+    return out
+
+
+def publish_report_event(report_id: int, event: str) -> None:
+    """Push the staff view of a report to the live feed: one query however many are listening."""
+    requested, select = _report_projection(None, REPORT_LIST_FIELDS, REPORT_DERIVED_FIELDS)
+    with get_conn() as conn:
+        row = conn.execute(f"SELECT {select} FROM {STAFF_REPORT_SOURCE} WHERE r.id = ?", (report_id,)).fetchone()
+    if row is not None:
+        report_events.publish(event, {"report": _project_rows([row], requested, REPORT_DERIVED_FIELDS)[0]})
+
+
+def fetch_report_page(
+    *,
+    allowed: dict[str, str],
+    derived: dict[str, tuple[str, ...]],
+    fields: str | None,
+    source: str,
+    where: str,
+    params: tuple,
+    cursor: int | None,
+    limit: int,
+) -> tuple[list[dict], int | None]:
+    """One keyset page of reports, newest first, projected to ``fields``.
+
+    ``cursor`` is the smallest id of the previous page; the returned cursor is
+    None on the last page.
+    """
+    requested, select = _report_projection(fields, allowed, derived)
+    sql = f"SELECT {select} FROM {source} WHERE {where}"
+    args = list(params)
+    if cursor is not None:
+        sql += " AND r.id < ?"
+        args.append(cursor)
+    sql += " ORDER BY r.id DESC LIMIT ?"
+    args.append(limit + 1)
+
+    with get_conn() as conn:
+        rows = conn.execute(sql, args).fetchall()
+
+    more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = rows[-1]["id"] if more and rows else None
+    return _project_rows(rows, requested, derived), next_cursor
+
+
+def _set_page_headers(response: Response, request: Request, next_cursor: int | None) -> None:
+    if next_cursor is None:
+        return
+    response.headers["X-Next-Cursor"] = str(next_cursor)
+    response.headers["Link"] = f'<{request.url.include_query_params(cursor=next_cursor)}>; rel="next"'
+
+
+def _not_modified(request: Request, response: Response, *versions: object) -> Response | None:
+    """Stamp ``response`` with an ETag over the URL and ``versions``; return a 304 if the client has it."""
+    etag = make_etag(request.url.path, request.url.query, *versions)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
 @app.get("/reports/me")
-def my_reports(user: dict = Depends(get_current_user)):
+def my_reports(
+    request: Request,
+    response: Response,
+    cursor: int | None = Query(default=None, ge=1),
+    limit: int = Query(default=REPORTS_PAGE_SIZE, ge=1, le=REPORTS_PAGE_MAX),
+    fields: str | None = None,
+    user: dict = Depends(get_current_user),
+):
+    """The caller's reports, newest first. Paginate with ``cursor`` from the ``X-Next-Cursor`` header."""
     with get_conn() as conn:
-        rows = conn.execute(
-            "SELECT id, emergency_type, description, latitude, longitude, severity_label, severity_confidence, verification_score, status, created_at FROM reports WHERE user_id=? ORDER BY id DESC",
-            (user["user_id"],),
-        ).fetchall()
-    return [dict(r) for r in rows]
+        seq = reports_seq(conn, user["user_id"])
+    if cached := _not_modified(request, response, user["user_id"], seq):
+        return cached
+    rows, next_cursor = fetch_report_page(
+        allowed=MY_REPORT_FIELDS,
+        derived={},
+        fields=fields,
+        source=MY_REPORT_SOURCE,
+        where="r.user_id = ?",
+        params=(user["user_id"],),
+        cursor=cursor,
+        limit=limit,
+    )
+    _set_page_headers(response, request, next_cursor)
+    response.headers["X-Sync-Cursor"] = str(seq)
+    return rows
 
 
 @app.get("/reports")
-def all_reports(user: dict = Depends(get_current_user)):
+def all_reports(
+    request: Request,
+    response: Response,
+    cursor: int | None = Query(default=None, ge=1),
+    limit: int = Query(default=REPORTS_PAGE_SIZE, ge=1, le=REPORTS_PAGE_MAX),
+    fields: str | None = None,
+    user: dict = Depends(get_current_user),
+):
+    """All reports, newest first, with keyset pagination and optional ``fields=a,b,c`` projection."""
     role_guard(user, {"admin", "responder"})
     with get_conn() as conn:
-        rows = conn.execute(
-            """
-            SELECT r.*, u.email as reporter_email, u.risk_score, u.account_flagged
-            FROM reports r JOIN users u ON u.id = r.user_id
-            ORDER BY r.id DESC
-            """
-        ).fetchall()
-    out = []
-    for r in rows:
-        d = dict(r)
-        d["selfie_url"] = f"/uploads/{Path(d['selfie_path']).name}"
-        d["accident_url"] = f"/uploads/{Path(d['accident_path']).name}"
-        d["map_url"] = f"https://www.google.com/maps?q={d['latitude']},{d['longitude']}"
-        out.append(d)
-    return out
+        seq, users_seq = reports_seq(conn), users_version(conn)
+    if cached := _not_modified(request, response, user["user_id"], seq, users_seq):
+        return cached
+    rows, next_cursor = fetch_report_page(
+        allowed=REPORT_LIST_FIELDS,
+        derived=REPORT_DERIVED_FIELDS,
+        fields=fields,
+        source=STAFF_REPORT_SOURCE,
+        where="1 = 1",
+        params=(),
+        cursor=cursor,
+        limit=limit,
+    )
+    _set_page_headers(response, request, next_cursor)
+    response.headers["X-Sync-Cursor"] = str(seq)
+    return rows
+
+
+@app.get("/reports/changes")
+def report_changes(
+    since: int = Query(default=0, ge=0),
+    limit: int = Query(default=REPORTS_PAGE_MAX, ge=1, le=REPORTS_PAGE_MAX),
+    fields: str | None = None,
+    user: dict = Depends(get_current_user),
+):
+    """Reports created or updated after change ``since``, plus ids of deleted reports.
+
+    Start from the ``X-Sync-Cursor`` of a list response and pass back the
+    returned ``cursor`` each poll; keep polling while ``has_more`` is true.
+    Staff see every report, citizens only their own.
+    """
+    staff = user.get("role") in {"admin", "responder"}
+    allowed, derived, source = (
+        (REPORT_LIST_FIELDS, REPORT_DERIVED_FIELDS, STAFF_REPORT_SOURCE)
+        if staff
+        else (MY_REPORT_FIELDS, {}, MY_REPORT_SOURCE)
+    )
+    requested, select = _report_projection(fields, allowed, derived)
+
+    with get_conn() as conn:
+        changes, more = changes_since(conn, since, limit, None if staff else user["user_id"])
+        live = [c["report_id"] for c in changes if not c["deleted"]]
+        rows = []
+        if live:
+            placeholders = ",".join("?" * len(live))
+            rows = conn.execute(f"SELECT {select} FROM {source} WHERE r.id IN ({placeholders})", live).fetchall()
+
+    by_id = {row["id"]: row for row in rows}
+    ordered = [by_id[report_id] for report_id in live if report_id in by_id]
+    return {
+        "reports": _project_rows(ordered, requested, derived),
+        "deleted": [c["report_id"] for c in changes if c["deleted"]],
+        "cursor": changes[-1]["seq"] if changes else since,
+        "has_more": more,
+    }
+
+
+@app.get("/reports/stream")
+async def report_stream(
+    token: str | None = None,
+    last_event_id: str | None = None,
+    last_event_id_header: str | None = Header(default=None, alias="Last-Event-ID"),
+    authorization: str = Header(default=""),
+):
+    """Server-Sent Events feed of report.created / report.updated for staff.
+
+    ``EventSource`` cannot set headers, so the token may also come as
+    ``?token=``. Reconnects resume after ``Last-Event-ID``; a ``resync`` event
+    means events were missed and the client should catch up via /reports/changes.
+    """
+    if token is None:
+        token = authorization.removeprefix("Bearer ") if authorization.startswith("Bearer ") else ""
+    if not token:
+        raise HTTPException(status_code=401, detail="Missing bearer token")
+    role_guard(decode_token(token), {"admin", "responder"})
+    stream = report_events.subscribe(last_event_id or last_event_id_header or None)
+    if stream is None:
+        raise HTTPException(status_code=503, detail="Live feed is at capacity; poll /reports/changes instead")
+    return StreamingResponse(
+        stream,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.get("/reports/analytics")
-def reports_analytics(user: dict = Depends(get_current_user)):
+def reports_analytics(
+    request: Request,
+    response: Response,
+    start: date | None = None,
+    end: date | None = None,
+    granularity: Literal["day", "hour"] = "day",
+    user: dict = Depends(get_current_user),
+):
+    """Report counts from the rollup tables, optionally limited to ``start``..``end`` (inclusive, UTC dates)."""
     role_guard(user, {"admin", "responder"})
+    if start and end and start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
     with get_conn() as conn:
-        by_type = conn.execute(
-            "SELECT emergency_type as name, COUNT(*) as value FROM reports GROUP BY emergency_type ORDER BY value DESC"
-        ).fetchall()
-        by_severity = conn.execute(
-            "SELECT severity_label as name, COUNT(*) as value FROM reports GROUP BY severity_label ORDER BY value DESC"
-        ).fetchall()
-        by_day = conn.execute(
-            "SELECT substr(created_at,1,10) as day, COUNT(*) as value FROM reports GROUP BY day ORDER BY day"
-        ).fetchall()
-        status_counts = conn.execute(
-            "SELECT status as name, COUNT(*) as value FROM reports GROUP BY status ORDER BY value DESC"
-        ).fetchall()
+        seq, users_seq = reports_seq(conn), users_version(conn)
+    if cached := _not_modified(request, response, user["user_id"], seq, users_seq):
+        return cached
+    with get_conn() as conn:
+        analytics = rollups.read(conn, start, end, granularity)
         flagged_users = conn.execute(
             "SELECT id,email,risk_score,account_flagged FROM users WHERE account_flagged=1 OR risk_score>=20 ORDER BY risk_score DESC"
         ).fetchall()
+    return {**analytics, "flagged_users": [dict(r) for r in flagged_users]}
+
+
+class ExportRequest(BaseModel):
+    start: date | None = None
+    end: date | None = None
+    severity: list[str] = Field(default_factory=list)
+    status: list[str] = Field(default_factory=list)
+
+
+def _submit_export(user: dict, body: ExportRequest) -> ExportJob:
+    role_guard(user, {"admin", "responder"})
+    if body.start and body.end and body.start > body.end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    filters = ExportFilters(body.start, body.end, tuple(body.severity), tuple(body.status))
+    job = export_manager.submit(user["user_id"], filters)
+    if job is None:
+        raise HTTPException(status_code=503, detail="Too many exports running, retry shortly", headers={"Retry-After": "5"})
+    return job
+
+
+def _export_job(job_id: str, user: dict) -> ExportJob:
+    job = export_manager.get(job_id)
+    if job is None or (job.user_id != user["user_id"] and user.get("role") != "admin"):
+        raise HTTPException(status_code=404, detail="Export not found")
+    return job
+
+
+def _export_file(job: ExportJob) -> FileResponse:
+    return FileResponse(
+        job.path,
+        media_type="application/pdf",
+        filename="emergency_reports_summary.pdf",
+        headers={"Cache-Control": "no-store"},
+    )
+
 
+def _export_status(job: ExportJob) -> dict:
     return {
-        "reports_per_type": [dict(r) for r in by_type],
-        "severity_distribution": [dict(r) for r in by_severity],
-        "reports_over_time": [dict(r) for r in by_day],
-        "status_distribution": [dict(r) for r in status_counts],
-        "flagged_users": [dict(r) for r in flagged_users],
+        **job.to_dict(),
+        "status_url": f"/reports/exports/{job.id}",
+        "download_url": f"/reports/exports/{job.id}/download" if job.status == "done" else None,
     }
 
 
+@app.post("/reports/exports", status_code=202)
+def create_export(body: ExportRequest, user: dict = Depends(get_current_user)):
+    """Start a PDF export of the reports matching the filters; poll ``status_url`` for progress."""
+    return _export_status(_submit_export(user, body))
+
+
+@app.get("/reports/exports/{job_id}")
+def export_status(job_id: str, user: dict = Depends(get_current_user)):
+    return _export_status(_export_job(job_id, user))
+
+
+@app.get("/reports/exports/{job_id}/download")
+def download_export(job_id: str, user: dict = Depends(get_current_user)):
+    job = _export_job(job_id, user)
+    if job.status != "done":
+        raise HTTPException(status_code=409, detail=f"Export is {job.status}")
+    return _export_file(job)
+
+
 @app.get("/reports/export/pdf")
-def export_reports_pdf(user: dict = Depends(get_current_user)):
-    role_guard(user, {"admin", "responder"})
+async def export_reports_pdf(
+    start: date | None = None,
+    end: date | None = None,
+    severity: list[str] = Query(default=[]),
+    status: list[str] = Query(default=[]),
+    user: dict = Depends(get_current_user),
+):
+    """One-shot export: runs a job and streams the file when it is ready.
+
+    Waiting is non-blocking, so no API worker thread is held while the PDF renders.
+    """
+    job = _submit_export(user, ExportRequest(start=start, end=end, severity=severity, status=status))
+    await asyncio.wrap_future(job.future)
+    if job.status != "done":
+        raise HTTPException(status_code=500, detail="Export failed")
+    return _export_file(job)
+
+
+@app.get("/reports/{report_id}")
+def report_detail(report_id: int, user: dict = Depends(get_current_user)):
+    """Poll a single report, e.g. until an async submission leaves 'Processing'."""
     with get_conn() as conn:
-        rows = conn.execute(
-            """
-            SELECT r.*, u.email as reporter_email
-            FROM reports r JOIN users u ON u.id = r.user_id
-            ORDER BY r.id DESC
-            LIMIT 100
+        row = conn.execute(
             """
-        ).fetchall()
-    content = _build_pdf_summary([dict(r) for r in rows])
-    return StreamingResponse(
-        io.BytesIO(content),
-        media_type="application/pdf",
-        headers={"Content-Disposition": "attachment; filename=emergency_reports_summary.pdf"},
-    )
+            SELECT id, user_id, emergency_type, description, latitude, longitude, severity_label, severity_confidence,
+                   verification_score, face_ok, accident_image_ok, suspicious, verification_flags, status, created_at, updated_at,
+                   selfie_path, accident_path
+            FROM reports WHERE id=?
+            """,
+            (report_id,),
+        ).fetchone()
+    if not row or (row["user_id"] != user["user_id"] and user.get("role") not in {"admin", "responder"}):
+        raise HTTPException(status_code=404, detail="Report not found")
+    return {
+        "id": row["id"],
+        "emergency_type": row["emergency_type"],
+        "description": row["description"],
+        "latitude": row["latitude"],
+        "longitude": row["longitude"],
+        "severity": {"label": row["severity_label"], "confidence": row["severity_confidence"]},
+        "verification": {
+            "face_ok": bool(row["face_ok"]),
+            "accident_image_ok": bool(row["accident_image_ok"]),
+            "suspicious": bool(row["suspicious"]),
+            "verification_score": row["verification_score"],
+            "flags": json.loads(row["verification_flags"] or "[]"),
+        },
+        "status": row["status"],
+        "processing": row["status"] == "Processing",
+        "created_at": api_timestamp(row["created_at"]),
+        "updated_at": api_timestamp(row["updated_at"]),
+        **_upload_urls("selfie", row["selfie_path"]),
+        **_upload_urls("accident", row["accident_path"]),
+        "map_url": f"https://www.google.com/maps?q={row['latitude']},{row['longitude']}",
+    }
 
 
 @app.patch("/reports/{report_id}/status")
@@ -362,21 +918,66 @@ def update_status(report_id: int, status_label: str = Form(...), request: Reques
         conn.execute("UPDATE reports SET status=?, updated_at=? WHERE id=?", (status_label, now_iso(), report_id))
     if request:
         write_audit(user["user_id"], "update_status", request, details=f"report_id={report_id};status={status_label}")
+    publish_report_event(report_id, "report.updated")
     return {"ok": True, "report_id": report_id, "status": status_label}
 
 
 @app.get("/audit-logs")
 def audit_logs(user: dict = Depends(get_current_user)):
     role_guard(user, {"admin", "responder"})
+    audit_writer.flush()
     with get_conn() as conn:
         rows = conn.execute("SELECT * FROM audit_logs ORDER BY id DESC LIMIT 300").fetchall()
-    return [dict(r) for r in rows]
+    return [{**dict(r), "created_at": api_timestamp(r["created_at"])} for r in rows]
 
 
 @app.get("/model/metrics")
-def model_metrics(user: dict = Depends(get_current_user)):
+def model_metrics(
+    response: Response, cv: int | None = Query(default=None, ge=2, le=20), user: dict = Depends(get_current_user)
+):
+    """Cached evaluation metrics; ``cv=k`` reports parallel stratified k-fold results instead of the holdout.
+
+    On a cache miss the evaluation starts in the background and this answers
+    ``202 {"status": "pending"}`` until the result is stored.
+    """
+    role_guard(user, {"admin", "responder"})
+    try:
+        metrics = severity_model.metrics(cv_folds=cv, wait=False)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if metrics is None:
+        response.status_code = 202
+        response.headers["Retry-After"] = "5"
+        return {"status": "pending"}
+    return metrics
+
+
+class PredictRecord(BaseModel):
+    emergency_type: str
+    description: str
+    risk_score: float = 0.5
+    hour_of_day: int | None = Field(default=None, ge=0, le=23)
+
+
+class PredictBatchRequest(BaseModel):
+    reports: list[PredictRecord] = Field(max_length=MAX_PREDICT_BATCH)
+
+
+@app.post("/model/predict-batch")
+def model_predict_batch(body: PredictBatchRequest, user: dict = Depends(get_current_user)):
+    """Score many reports in one call (LoRa gateway relays, re-scoring jobs)."""
     role_guard(user, {"admin", "responder"})
-    return severity_model.evaluate()
+    hour = datetime.utcnow().hour
+    results = severity_model.predict_batch(
+        [r.emergency_type for r in body.reports],
+        [r.description for r in body.reports],
+        [r.risk_score for r in body.reports],
+        [hour if r.hour_of_day is None else r.hour_of_day for r in body.reports],
+    )
+    return {
+        "count": len(results),
+        "predictions": [{"label": label, "confidence": confidence} for label, confidence in results],
+    }
 
 
 @app.get("/health")
@@ -388,7 +989,7 @@ def health():
 def lora_payload_preview(device_id: str, emergency_type: str, latitude: float, longitude: float):
     payload = {
         "device_id": device_id,
-        "timestamp": now_iso(),
+        "timestamp": api_timestamp(now_iso()),
         "lat": latitude,
         "lng": longitude,
         "emergency_type": emergency_type,
@@ -0,0 +1,361 @@
+"""Versioned schema migrations for the SQLite database.
+
+Each migration runs once, in order, inside its own ``BEGIN IMMEDIATE``
+transaction and is recorded in ``schema_migrations``. Add new migrations to the
+end of ``MIGRATIONS``; never edit one that has already shipped.
+"""
+from __future__ import annotations
+
+import sqlite3
+from typing import Callable, NamedTuple
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    apply: Callable[[sqlite3.Connection], None]
+
+
+def _initial_schema(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            email TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            role TEXT NOT NULL DEFAULT 'citizen',
+            created_at TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS reports (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            device_id TEXT,
+            emergency_type TEXT NOT NULL,
+            description TEXT NOT NULL,
+            latitude REAL NOT NULL,
+            longitude REAL NOT NULL,
+            selfie_path TEXT NOT NULL,
+            accident_path TEXT NOT NULL,
+            lora_payload TEXT,
+            severity_label TEXT NOT NULL,
+            severity_confidence REAL NOT NULL,
+            verification_score REAL NOT NULL,
+            face_ok INTEGER NOT NULL,
+            accident_image_ok INTEGER NOT NULL,
+            suspicious INTEGER NOT NULL,
+            status TEXT NOT NULL DEFAULT 'Pending',
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            FOREIGN KEY(user_id) REFERENCES users(id)
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS audit_logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            action TEXT NOT NULL,
+            ip_address TEXT,
+            device_id TEXT,
+            details TEXT,
+            created_at TEXT NOT NULL
+        )
+        """
+    )
+
+
+def _add_column(conn: sqlite3.Connection, table: str, column: str, ddl: str) -> None:
+    # Databases created before migrations were versioned may already have the column.
+    cols = {row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()}
+    if column not in cols:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+
+
+def _user_risk_columns(conn: sqlite3.Connection) -> None:
+    _add_column(conn, "users", "risk_score", "REAL NOT NULL DEFAULT 0")
+    _add_column(conn, "users", "account_flagged", "INTEGER NOT NULL DEFAULT 0")
+
+
+def _sqlite_timestamps(conn: sqlite3.Connection) -> None:
+    """Rewrite ISO ``T``-separated timestamps as ``YYYY-MM-DD HH:MM:SS``.
+
+    That is the format ``datetime('now', ...)`` produces, so string comparison
+    and ordering against it are correct.
+    """
+    for table, columns in {
+        "users": ("created_at",),
+        "reports": ("created_at", "updated_at"),
+        "audit_logs": ("created_at",),
+    }.items():
+        for column in columns:
+            conn.execute(
+                f"UPDATE {table} SET {column} = datetime({column}) "
+                f"WHERE {column} LIKE '____-__-__T%' AND datetime({column}) IS NOT NULL"
+            )
+
+
+def _hot_path_indexes(conn: sqlite3.Connection) -> None:
+    statements = [
+        # Rate limiting: WHERE user_id=? AND created_at >= ...
+        "CREATE INDEX IF NOT EXISTS idx_reports_user_created ON reports(user_id, created_at)",
+        # /reports/me: WHERE user_id=? ORDER BY id DESC
+        "CREATE INDEX IF NOT EXISTS idx_reports_user_id ON reports(user_id, id)",
+        # Analytics GROUP BYs become covering index scans.
+        "CREATE INDEX IF NOT EXISTS idx_reports_type ON reports(emergency_type)",
+        "CREATE INDEX IF NOT EXISTS idx_reports_severity ON reports(severity_label)",
+        "CREATE INDEX IF NOT EXISTS idx_reports_status ON reports(status)",
+        "CREATE INDEX IF NOT EXISTS idx_reports_day ON reports(substr(created_at, 1, 10))",
+        # Flagged users: WHERE account_flagged=1 OR risk_score>=?
+        "CREATE INDEX IF NOT EXISTS idx_users_flagged ON users(account_flagged)",
+        "CREATE INDEX IF NOT EXISTS idx_users_risk_score ON users(risk_score)",
+        # Audit trail lookups per user and by time.
+        "CREATE INDEX IF NOT EXISTS idx_audit_logs_user_created ON audit_logs(user_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_audit_logs_created ON audit_logs(created_at)",
+    ]
+    for sql in statements:
+        conn.execute(sql)
+
+
+def _verification_flags(conn: sqlite3.Connection) -> None:
+    conn.execute("ALTER TABLE reports ADD COLUMN verification_flags TEXT NOT NULL DEFAULT '[]'")
+
+
+def _upload_digests(conn: sqlite3.Connection) -> None:
+    conn.execute("ALTER TABLE reports ADD COLUMN selfie_sha256 TEXT")
+    conn.execute("ALTER TABLE reports ADD COLUMN accident_sha256 TEXT")
+
+
+def _image_index(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS image_fingerprints (
+            report_id INTEGER PRIMARY KEY,
+            sha256 TEXT NOT NULL,
+            dhash TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_image_fingerprints_sha ON image_fingerprints(sha256)")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS verification_cache (
+            selfie_sha256 TEXT NOT NULL,
+            accident_sha256 TEXT NOT NULL,
+            result TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            PRIMARY KEY (selfie_sha256, accident_sha256)
+        )
+        """
+    )
+
+
+def _change_feed(conn: sqlite3.Connection) -> None:
+    # One row per report holding the sequence number of its latest write; a
+    # deleted report keeps its row as a tombstone. Triggers keep it current
+    # whichever code path touches ``reports``.
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS report_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            report_id INTEGER NOT NULL UNIQUE,
+            user_id INTEGER NOT NULL,
+            deleted INTEGER NOT NULL DEFAULT 0
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_report_changes_user_seq ON report_changes(user_id, seq)")
+    for event, row in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_report_changes_{event.lower()} AFTER {event} ON reports
+            BEGIN
+                DELETE FROM report_changes WHERE report_id = {row}.id;
+                INSERT INTO report_changes (report_id, user_id, deleted)
+                VALUES ({row}.id, {row}.user_id, {int(event == "DELETE")});
+            END
+            """
+        )
+    conn.execute(
+        "INSERT OR IGNORE INTO report_changes (report_id, user_id) SELECT id, user_id FROM reports ORDER BY id"
+    )
+
+    # Analytics and the staff list also read from ``users``; bump a counter on
+    # the columns they show so ETags change with them.
+    conn.execute("CREATE TABLE IF NOT EXISTS sync_versions (name TEXT PRIMARY KEY, version INTEGER NOT NULL)")
+    conn.execute("INSERT OR IGNORE INTO sync_versions (name, version) VALUES ('users', 0)")
+    for event in ("INSERT", "UPDATE OF email, risk_score, account_flagged", "DELETE"):
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_users_version_{event.split()[0].lower()} AFTER {event} ON users
+            BEGIN
+                UPDATE sync_versions SET version = version + 1 WHERE name = 'users';
+            END
+            """
+        )
+
+
+# Rollup layout as of migration 9, frozen here so later changes to rollups.py
+# cannot alter what this migration does.
+_ROLLUP_GRAINS = {"day": 10, "hour": 13}
+_ROLLUP_DIMENSIONS = {"type": "emergency_type", "severity": "severity_label", "status": "status", "total": "'all'"}
+
+
+def _rollup_counters(row: str, delta: int) -> str:
+    statements = []
+    for grain, length in _ROLLUP_GRAINS.items():
+        for dimension, column in _ROLLUP_DIMENSIONS.items():
+            value = column if column.startswith("'") else f"{row}.{column}"
+            statements.append(
+                "INSERT INTO report_rollups (grain, bucket, dimension, value, count) "
+                f"VALUES ('{grain}', substr({row}.created_at, 1, {length}), '{dimension}', {value}, {delta}) "
+                f"ON CONFLICT (grain, bucket, dimension, value) DO UPDATE SET count = count + ({delta});"
+            )
+    return "\n".join(statements)
+
+
+def _analytics_rollups(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS report_rollups (
+            grain TEXT NOT NULL,
+            bucket TEXT NOT NULL,
+            dimension TEXT NOT NULL,
+            value TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (grain, bucket, dimension, value)
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_report_rollups_insert AFTER INSERT ON reports
+        BEGIN
+            {_rollup_counters("NEW", 1)}
+        END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_report_rollups_update
+        AFTER UPDATE OF emergency_type, severity_label, status, created_at ON reports
+        WHEN OLD.emergency_type IS NOT NEW.emergency_type OR OLD.severity_label IS NOT NEW.severity_label
+            OR OLD.status IS NOT NEW.status OR OLD.created_at IS NOT NEW.created_at
+        BEGIN
+            {_rollup_counters("OLD", -1)}
+            {_rollup_counters("NEW", 1)}
+        END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_report_rollups_delete AFTER DELETE ON reports
+        BEGIN
+            {_rollup_counters("OLD", -1)}
+        END
+        """
+    )
+    # Backfill from the reports that already exist.
+    conn.execute("DELETE FROM report_rollups")
+    for grain, length in _ROLLUP_GRAINS.items():
+        for dimension, column in _ROLLUP_DIMENSIONS.items():
+            conn.execute(
+                f"""
+                INSERT INTO report_rollups (grain, bucket, dimension, value, count)
+                SELECT '{grain}', substr(created_at, 1, {length}), '{dimension}', {column}, COUNT(*)
+                FROM reports GROUP BY 2, 4
+                """
+            )
+
+
+def _rate_limit_hits(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS rate_limit_hits (
+            policy TEXT NOT NULL,
+            key TEXT NOT NULL,
+            hit_at REAL NOT NULL
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_rate_limit_hits_at ON rate_limit_hits(hit_at)")
+
+
+def _model_metrics(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS model_metrics (
+            dataset_sha256 TEXT NOT NULL,
+            model_version TEXT NOT NULL,
+            cv_folds INTEGER NOT NULL,
+            metrics_json TEXT NOT NULL,
+            computed_at TEXT NOT NULL,
+            PRIMARY KEY (dataset_sha256, model_version, cv_folds)
+        )
+        """
+    )
+
+
+def _verification_cache_version(conn: sqlite3.Connection) -> None:
+    # Verdicts cached before the column existed came from an older validator; drop them.
+    conn.execute("DELETE FROM verification_cache")
+    conn.execute("ALTER TABLE verification_cache ADD COLUMN validator_version INTEGER NOT NULL DEFAULT 0")
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "initial_schema", _initial_schema),
+    Migration(2, "user_risk_columns", _user_risk_columns),
+    Migration(3, "sqlite_timestamps", _sqlite_timestamps),
+    Migration(4, "hot_path_indexes", _hot_path_indexes),
+    Migration(5, "verification_flags", _verification_flags),
+    Migration(6, "upload_digests", _upload_digests),
+    Migration(7, "image_index", _image_index),
+    Migration(8, "change_feed", _change_feed),
+    Migration(9, "analytics_rollups", _analytics_rollups),
+    Migration(10, "rate_limit_hits", _rate_limit_hits),
+    Migration(11, "model_metrics", _model_metrics),
+    Migration(12, "verification_cache_version", _verification_cache_version),
+]
+
+
+def applied_versions(conn: sqlite3.Connection) -> set[int]:
+    return {row[0] for row in conn.execute("SELECT version FROM schema_migrations").fetchall()}
+
+
+def run_migrations(conn: sqlite3.Connection, migrations: list[Migration] = MIGRATIONS) -> list[int]:
+    """Apply pending migrations in version order and return the versions applied."""
+    if conn.in_transaction:
+        conn.commit()
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TEXT NOT NULL DEFAULT (datetime('now'))
+        )
+        """
+    )
+    applied: list[int] = []
+    for migration in sorted(migrations, key=lambda m: m.version):
+        if migration.version in applied_versions(conn):
+            continue
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another worker may have applied it while we waited for the write lock.
+            if migration.version not in applied_versions(conn):
+                migration.apply(conn)
+                conn.execute(
+                    "INSERT INTO schema_migrations (version, name) VALUES (?, ?)",
+                    (migration.version, migration.name),
+                )
+                applied.append(migration.version)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    return applied
@@ -0,0 +1,182 @@
+"""In-memory sliding-window rate limiting for report submission.
+
+Each policy (e.g. "user": 3 per hour) keeps, per key, a deque of the
+timestamps of its hits inside the window, capped at the policy limit. Checking
+a key drops expired timestamps from the left and compares the length, which is
+amortized O(1) and exact, with no query against ``reports``. One request can be
+checked against several policies at once (user, device, IP).
+
+``hit`` checks and counts in one locked step, so of many parallel requests
+at the limit only ``limit`` get through. A request that fails afterwards,
+e.g. an oversized upload, gives its slot back with ``release`` and does not
+use up quota.
+
+With persistence on, every counted hit is also written to ``rate_limit_hits``
+and the still-live ones are reloaded on startup, so a restart does not reset
+anyone's window.
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import NamedTuple
+
+from .config import (
+    RATE_LIMIT_DEVICE_PER_HOUR,
+    RATE_LIMIT_IP_PER_HOUR,
+    RATE_LIMIT_PER_HOUR,
+    RATE_LIMIT_PERSIST,
+)
+from .db import get_conn
+
+_SWEEP_EVERY = 1024
+
+
+class Policy(NamedTuple):
+    limit: int
+    window_seconds: float
+
+
+class Decision(NamedTuple):
+    allowed: bool
+    counts: dict[str, int]  # hits already in the window per policy, before this one
+    blocked_by: str | None = None
+    retry_after: float = 0.0
+    at: float | None = None  # timestamp of the counted hit, for ``release``
+
+
+DEFAULT_POLICIES = {
+    "user": Policy(RATE_LIMIT_PER_HOUR, 3600),
+    "device": Policy(RATE_LIMIT_DEVICE_PER_HOUR, 3600),
+    "ip": Policy(RATE_LIMIT_IP_PER_HOUR, 3600),
+}
+
+
+class RateLimiter:
+    def __init__(self, policies: dict[str, Policy] | None = None, persist: bool = RATE_LIMIT_PERSIST) -> None:
+        # A limit of 0 turns a policy off.
+        self.policies = {name: p for name, p in (policies or DEFAULT_POLICIES).items() if p.limit > 0}
+        self.persist = persist
+        self._hits: dict[tuple[str, str], deque[float]] = {}
+        self._lock = threading.Lock()
+        self._since_sweep = 0
+
+    def _window(self, policy: str, key: str, now: float) -> deque[float]:
+        hits = self._hits.get((policy, key))
+        if hits is None:
+            return deque()
+        horizon = now - self.policies[policy].window_seconds
+        while hits and hits[0] <= horizon:
+            hits.popleft()
+        return hits
+
+    def _active(self, keys: dict[str, str | None]) -> dict[str, str]:
+        return {name: key for name, key in keys.items() if key is not None and name in self.policies}
+
+    def _check(self, active: dict[str, str], now: float) -> Decision:
+        counts = {}
+        for name, key in active.items():
+            window = self._window(name, key, now)
+            counts[name] = len(window)
+            policy = self.policies[name]
+            if len(window) >= policy.limit:
+                retry_after = window[0] + policy.window_seconds - now
+                return Decision(False, counts, name, max(retry_after, 0.0))
+        return Decision(True, counts, at=now)
+
+    def check(self, keys: dict[str, str | None], now: float | None = None) -> Decision:
+        """Whether ``keys`` (policy name -> key; None skips that policy) are all under their limits. Records nothing."""
+        now = time.time() if now is None else now
+        with self._lock:
+            return self._check(self._active(keys), now)
+
+    def hit(self, keys: dict[str, str | None], now: float | None = None, save: bool = True) -> Decision:
+        """Check ``keys`` and, if allowed, count one hit against each, atomically.
+
+        ``counts`` are the hits already in each window before this one. Pass
+        ``save=False`` to persist the hit later with ``save``, inside the
+        caller's own transaction.
+        """
+        now = time.time() if now is None else now
+        active = self._active(keys)
+        with self._lock:
+            decision = self._check(active, now)
+            if not decision.allowed:
+                return decision
+            for name, key in active.items():
+                limit = self.policies[name].limit
+                self._hits.setdefault((name, key), deque(maxlen=limit)).append(now)
+            self._since_sweep += 1
+            if self._since_sweep >= _SWEEP_EVERY:
+                self._sweep(now)
+        if save:
+            self.save(keys, now)
+        return decision
+
+    def save(self, keys: dict[str, str | None], at: float, conn: sqlite3.Connection | None = None) -> None:
+        """Write the hit counted at ``at`` to ``rate_limit_hits``; pass ``conn`` to join the caller's transaction."""
+        active = self._active(keys)
+        if not (self.persist and active):
+            return
+        if conn is None:
+            with get_conn() as conn:
+                self.save(keys, at, conn)
+            return
+        conn.executemany(
+            "INSERT INTO rate_limit_hits (policy, key, hit_at) VALUES (?,?,?)",
+            [(name, key, at) for name, key in active.items()],
+        )
+
+    def release(self, keys: dict[str, str | None], at: float) -> None:
+        """Give back the hit ``hit`` counted at ``at``, e.g. because the request failed."""
+        active = self._active(keys)
+        with self._lock:
+            for name, key in active.items():
+                hits = self._hits.get((name, key))
+                if hits is not None and at in hits:
+                    hits.remove(at)
+        if self.persist and active:
+            with get_conn() as conn:
+                conn.executemany(
+                    """
+                    DELETE FROM rate_limit_hits WHERE rowid IN (
+                        SELECT rowid FROM rate_limit_hits WHERE policy=? AND key=? AND hit_at=? LIMIT 1
+                    )
+                    """,
+                    [(name, key, at) for name, key in active.items()],
+                )
+
+    def _sweep(self, now: float) -> None:
+        """Forget keys whose whole window has expired, so idle keys cost no memory."""
+        self._since_sweep = 0
+        for (name, key) in list(self._hits):
+            if not self._window(name, key, now):
+                del self._hits[(name, key)]
+        if self.persist:
+            self._prune(now)
+
+    def _prune(self, now: float) -> None:
+        longest = max((p.window_seconds for p in self.policies.values()), default=0)
+        with get_conn() as conn:
+            conn.execute("DELETE FROM rate_limit_hits WHERE hit_at <= ?", (now - longest,))
+
+    def load(self, now: float | None = None) -> int:
+        """Restore live windows from SQLite; returns the number of hits restored."""
+        if not self.persist:
+            return 0
+        now = time.time() if now is None else now
+        self._prune(now)
+        with get_conn() as conn:
+            rows = conn.execute("SELECT policy, key, hit_at FROM rate_limit_hits ORDER BY hit_at").fetchall()
+        restored = 0
+        with self._lock:
+            self._hits.clear()
+            for row in rows:
+                policy = self.policies.get(row["policy"])
+                if policy is None or row["hit_at"] <= now - policy.window_seconds:
+                    continue
+                self._hits.setdefault((row["policy"], row["key"]), deque(maxlen=policy.limit)).append(row["hit_at"])
+                restored += 1
+        return restored
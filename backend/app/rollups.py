@@ -0,0 +1,79 @@
+"""Pre-aggregated report counters behind ``GET /reports/analytics``.
+
+``report_rollups`` holds one counter per (grain, bucket, dimension, value):
+grain is ``day`` or ``hour``, the bucket is the matching prefix of
+``created_at`` and the dimensions are ``type``, ``severity``, ``status`` and
+``total``. Triggers on ``reports`` (created by migration 9,
+``analytics_rollups``) adjust the counters in the same transaction as the
+write, so analytics reads a few hundred small rows instead of grouping the
+whole table. Run ``python rebuild_rollups.py`` from ``backend/`` to recompute
+them from scratch.
+"""
+from __future__ import annotations
+
+import sqlite3
+from datetime import date, timedelta
+
+GRAINS = {"day": 10, "hour": 13}  # length of the created_at prefix that forms the bucket
+DIMENSIONS = {"type": "emergency_type", "severity": "severity_label", "status": "status", "total": "'all'"}
+
+
+def rebuild(conn: sqlite3.Connection) -> int:
+    """Recompute every counter from ``reports``; returns the number of rollup rows."""
+    conn.execute("DELETE FROM report_rollups")
+    for grain, length in GRAINS.items():
+        for dimension, column in DIMENSIONS.items():
+            conn.execute(
+                f"""
+                INSERT INTO report_rollups (grain, bucket, dimension, value, count)
+                SELECT '{grain}', substr(created_at, 1, {length}), '{dimension}', {column}, COUNT(*)
+                FROM reports GROUP BY 2, 4
+                """
+            )
+    return conn.execute("SELECT COUNT(*) FROM report_rollups").fetchone()[0]
+
+
+def _bucket_range(start: date | None, end: date | None) -> tuple[str, list[str]]:
+    clauses, args = [], []
+    if start is not None:
+        clauses.append("bucket >= ?")
+        args.append(start.isoformat())
+    if end is not None:
+        # Hour buckets ("2026-10-16 14") sort between the day and the next day.
+        clauses.append("bucket < ?")
+        args.append((end + timedelta(days=1)).isoformat())
+    return "".join(f" AND {c}" for c in clauses), args
+
+
+def read(conn: sqlite3.Connection, start: date | None = None, end: date | None = None, granularity: str = "day") -> dict:
+    """Distributions over [start, end] (inclusive dates) and counts per ``granularity`` bucket."""
+    if granularity not in GRAINS:
+        raise ValueError(f"granularity must be one of {', '.join(GRAINS)}")
+
+    where, args = _bucket_range(start, end)
+    distributions = {}
+    for dimension in ("type", "severity", "status"):
+        rows = conn.execute(
+            f"""
+            SELECT value, SUM(count) AS total FROM report_rollups
+            WHERE grain = 'day' AND dimension = ?{where}
+            GROUP BY value HAVING total > 0 ORDER BY total DESC, value
+            """,
+            [dimension, *args],
+        ).fetchall()
+        distributions[dimension] = [{"name": r["value"], "value": r["total"]} for r in rows]
+
+    over_time = conn.execute(
+        f"""
+        SELECT bucket, count FROM report_rollups
+        WHERE grain = ? AND dimension = 'total' AND count > 0{where}
+        ORDER BY bucket
+        """,
+        [granularity, *args],
+    ).fetchall()
+    return {
+        "reports_per_type": distributions["type"],
+        "severity_distribution": distributions["severity"],
+        "status_distribution": distributions["status"],
+        "reports_over_time": [{granularity: r["bucket"], "value": r["count"]} for r in over_time],
+    }
@@ -0,0 +1,163 @@
+"""NumPy-only severity scorer compiled from the trained sklearn pipeline.
+
+``export_scorer`` writes the fitted pieces of the pipeline to a directory:
+``meta.json`` (TF-IDF vocabulary and settings, emergency-type categories,
+class labels) plus ``idf.npy``, ``coef.npy`` and ``intercept.npy``, which are
+memory-mapped on load. ``CompiledScorer`` reproduces
+``Pipeline.predict_proba`` from those arrays, so serving predictions needs
+neither pandas nor scikit-learn.
+"""
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+
+FORMAT_VERSION = 1
+
+
+def export_scorer(pipeline, directory: Path, model_sha256: str = "") -> None:
+    """Write the compact scoring artifact for a fitted severity ``Pipeline``."""
+    pre = pipeline.named_steps["pre"]
+    clf = pipeline.named_steps["clf"]
+    tfidf = pre.named_transformers_["desc"]
+    encoder = pre.named_transformers_["cat"]
+
+    unsupported = {
+        "analyzer": tfidf.analyzer != "word",
+        "binary": tfidf.binary,
+        "stop_words": tfidf.stop_words is not None,
+        "strip_accents": tfidf.strip_accents is not None,
+        "tokenizer": tfidf.tokenizer is not None,
+        "preprocessor": tfidf.preprocessor is not None,
+        "use_idf": not tfidf.use_idf,
+    }
+    bad = [name for name, flag in unsupported.items() if flag]
+    if bad:
+        raise ValueError(f"Cannot compile TfidfVectorizer with custom {', '.join(bad)}")
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    vocabulary = {term: int(idx) for term, idx in tfidf.vocabulary_.items()}
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "model_sha256": model_sha256,
+        "token_pattern": tfidf.token_pattern,
+        "lowercase": bool(tfidf.lowercase),
+        "ngram_range": list(tfidf.ngram_range),
+        "norm": tfidf.norm,
+        "sublinear_tf": bool(tfidf.sublinear_tf),
+        "vocabulary": vocabulary,
+        "categories": [str(c) for c in encoder.categories_[0]],
+        "classes": [str(c) for c in clf.classes_],
+    }
+    np.save(directory / "idf.npy", np.asarray(tfidf.idf_, dtype=np.float64))
+    np.save(directory / "coef.npy", np.asarray(clf.coef_, dtype=np.float64))
+    np.save(directory / "intercept.npy", np.asarray(clf.intercept_, dtype=np.float64))
+    # meta.json is written last: its presence marks a complete artifact.
+    (directory / "meta.json").write_text(json.dumps(meta))
+
+
+class CompiledScorer:
+    def __init__(self, meta: dict, idf: np.ndarray, coef: np.ndarray, intercept: np.ndarray) -> None:
+        self.meta = meta
+        self.classes = list(meta["classes"])
+        self._token_re = re.compile(meta["token_pattern"])
+        self._lowercase = meta["lowercase"]
+        self._min_n, self._max_n = meta["ngram_range"]
+        self._norm = meta["norm"]
+        self._sublinear_tf = meta["sublinear_tf"]
+        self._vocabulary: dict[str, int] = meta["vocabulary"]
+        self._categories = {category: idx for idx, category in enumerate(meta["categories"])}
+        self._idf = idf
+        self._n_terms = len(idf)
+        self._n_categories = len(self._categories)
+        # Split the coefficient matrix by feature block: text | one-hot | numeric.
+        self._coef_text = coef[:, : self._n_terms]
+        self._coef_cat = coef[:, self._n_terms : self._n_terms + self._n_categories]
+        self._coef_num = coef[:, self._n_terms + self._n_categories :]
+        self._intercept = intercept
+
+    @classmethod
+    def load(cls, directory: Path) -> "CompiledScorer":
+        directory = Path(directory)
+        meta = json.loads((directory / "meta.json").read_text())
+        if meta.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported scorer format {meta.get('format_version')}")
+        return cls(
+            meta,
+            np.load(directory / "idf.npy", mmap_mode="r"),
+            np.load(directory / "coef.npy", mmap_mode="r"),
+            np.load(directory / "intercept.npy", mmap_mode="r"),
+        )
+
+    def _terms(self, text: str) -> list[str]:
+        if self._lowercase:
+            text = text.lower()
+        tokens = self._token_re.findall(text)
+        if self._min_n == 1 and self._max_n == 1:
+            return tokens
+        terms = tokens[:] if self._min_n == 1 else []
+        for n in range(max(2, self._min_n), self._max_n + 1):
+            terms.extend(" ".join(tokens[i : i + n]) for i in range(len(tokens) - n + 1))
+        return terms
+
+    def _text_contribution(self, descriptions: Sequence[str]) -> np.ndarray:
+        """TF-IDF rows (l2-normalised) multiplied into the text coefficients."""
+        out = np.zeros((len(descriptions), self._coef_text.shape[0]))
+        for row, text in enumerate(descriptions):
+            counts: dict[int, int] = {}
+            for term in self._terms(text):
+                idx = self._vocabulary.get(term)
+                if idx is not None:
+                    counts[idx] = counts.get(idx, 0) + 1
+            if not counts:
+                continue
+            cols = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+            tf = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+            if self._sublinear_tf:
+                tf = np.log(tf) + 1.0
+            weights = tf * self._idf[cols]
+            if self._norm == "l2":
+                weights /= np.sqrt(np.dot(weights, weights))
+            elif self._norm == "l1":
+                weights /= np.abs(weights).sum()
+            out[row] = self._coef_text[:, cols] @ weights
+        return out
+
+    def decision_function(
+        self,
+        emergency_types: Sequence[str],
+        descriptions: Sequence[str],
+        hours: Sequence[float],
+        risk_scores: Sequence[float],
+    ) -> np.ndarray:
+        scores = self._text_contribution(descriptions)
+        cat_cols = np.fromiter(
+            (self._categories.get(t, -1) for t in emergency_types), dtype=np.int64, count=len(emergency_types)
+        )
+        known = cat_cols >= 0
+        scores[known] += self._coef_cat[:, cat_cols[known]].T
+        numeric = np.column_stack([np.asarray(hours, dtype=float), np.asarray(risk_scores, dtype=float)])
+        scores += numeric @ self._coef_num.T
+        scores += self._intercept
+        return scores
+
+    def predict_proba(
+        self,
+        emergency_types: Sequence[str],
+        descriptions: Sequence[str],
+        hours: Sequence[float],
+        risk_scores: Sequence[float],
+    ) -> np.ndarray:
+        scores = self.decision_function(emergency_types, descriptions, hours, risk_scores)
+        if scores.shape[1] == 1:
+            positive = 1.0 / (1.0 + np.exp(-scores[:, 0]))
+            return np.column_stack([1.0 - positive, positive])
+        scores -= scores.max(axis=1, keepdims=True)
+        np.exp(scores, out=scores)
+        scores /= scores.sum(axis=1, keepdims=True)
+        return scores
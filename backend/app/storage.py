@@ -0,0 +1,185 @@
+"""Content-addressed upload store.
+
+Uploads are streamed to disk in chunks and hashed while writing, then stored
+as ``<sha256><ext>`` so identical images shared by several reports are kept
+once. Recompressed JPEG derivatives (``thumb`` and ``medium``) live under
+``derived/`` next to the originals; ``UploadFiles`` serves both with immutable
+cache headers.
+
+A stored file may belong to several reports, so request error paths never
+delete one; ``collect_garbage`` removes files that no report references.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import time
+from pathlib import Path
+from typing import NamedTuple
+from uuid import uuid4
+
+from fastapi import HTTPException, UploadFile
+from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import Response
+from starlette.types import Scope
+
+from .config import (
+    MAX_UPLOAD_BYTES,
+    MEDIUM_MAX_SIDE,
+    THUMBNAIL_MAX_SIDE,
+    UPLOAD_CHUNK_BYTES,
+    UPLOAD_DIR,
+    UPLOAD_GC_GRACE_SECONDS,
+)
+from .cv_utils import encode_thumbnail
+from .db import get_conn
+
+DERIVED_DIR = UPLOAD_DIR / "derived"
+DERIVATIVE_SIZES = {"thumb": THUMBNAIL_MAX_SIDE, "medium": MEDIUM_MAX_SIDE}
+# Every file under /uploads is named after its content (or a one-off uuid) and never rewritten.
+# Selfies and accident photos (and their derivatives) are personal data, so only
+# the client may keep them; shared proxies and CDNs must not.
+IMMUTABLE_CACHE = "private, max-age=31536000, immutable"
+_CONTENT_NAME = re.compile(r"[0-9a-f]{64}")
+
+
+class SavedUpload(NamedTuple):
+    path: Path
+    sha256: str
+    size: int
+    created: bool = True
+
+
+def save_upload(upload: UploadFile, prefix: str, max_bytes: int = MAX_UPLOAD_BYTES) -> SavedUpload:
+    """Stream ``upload`` into ``UPLOAD_DIR`` without holding it in memory.
+
+    The SHA-256 digest is computed from the chunks as they are written, so
+    callers never need to read the file back just to hash it. If an upload with
+    the same content already exists the new copy is dropped, the existing file's
+    mtime is refreshed (so ``collect_garbage`` leaves it alone while the report
+    commits) and ``created`` is False. Uploads larger than ``max_bytes`` are rejected with 413 as soon as
+    the limit is crossed.
+    """
+    declared = getattr(upload, "size", None)
+    if declared is not None and declared > max_bytes:
+        raise HTTPException(status_code=413, detail=f"{prefix} image exceeds {max_bytes} bytes")
+
+    ext = Path(upload.filename or "img.jpg").suffix.lower() or ".jpg"
+    partial = UPLOAD_DIR / f"{prefix}_{uuid4().hex}{ext}.part"
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with partial.open("wb") as out:
+            while chunk := upload.file.read(UPLOAD_CHUNK_BYTES):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(status_code=413, detail=f"{prefix} image exceeds {max_bytes} bytes")
+                digest.update(chunk)
+                out.write(chunk)
+        sha256 = digest.hexdigest()
+        target = UPLOAD_DIR / f"{sha256}{ext}"
+        created = not target.exists()
+        if created:
+            partial.replace(target)
+        else:
+            partial.unlink()
+            os.utime(target)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+    return SavedUpload(target, sha256, size, created)
+
+
+def collect_garbage(grace_seconds: float = UPLOAD_GC_GRACE_SECONDS) -> int:
+    """Delete uploads (and their derivatives) that no report references.
+
+    A file counts as referenced while any ``reports`` row or
+    ``image_fingerprints`` row names its sha256. Files modified within
+    ``grace_seconds`` are kept, since the request that wrote or reused them may
+    not have committed its report yet; ``.part`` leftovers of crashed uploads
+    older than that are removed too. Returns the number of originals deleted.
+    """
+    cutoff = time.time() - grace_seconds
+    candidates: dict[str, list[Path]] = {}
+    for path in UPLOAD_DIR.iterdir():
+        if not path.is_file() or path.stat().st_mtime > cutoff:
+            continue
+        if path.suffix == ".part":
+            path.unlink(missing_ok=True)
+        elif _CONTENT_NAME.fullmatch(path.stem):
+            candidates.setdefault(path.stem, []).append(path)
+    if not candidates:
+        return 0
+
+    with get_conn() as conn:
+        for row in conn.execute("SELECT selfie_sha256, accident_sha256 FROM reports"):
+            candidates.pop(row["selfie_sha256"], None)
+            candidates.pop(row["accident_sha256"], None)
+        for row in conn.execute("SELECT sha256 FROM image_fingerprints"):
+            candidates.pop(row["sha256"], None)
+
+    removed = 0
+    for sha256, paths in candidates.items():
+        for path in paths:
+            # Reused by an upload since the scan above: keep it.
+            if not path.exists() or path.stat().st_mtime > cutoff:
+                continue
+            path.unlink(missing_ok=True)
+            removed += 1
+        for max_side in DERIVATIVE_SIZES.values():
+            (DERIVED_DIR / f"{sha256}_{max_side}.jpg").unlink(missing_ok=True)
+    return removed
+
+
+def derivative(source: Path, size: str) -> Path | None:
+    """Cached ``size`` derivative of an upload, generated on first use.
+
+    Uploads are content-addressed, so a derivative named after its source never
+    goes stale. Returns None when the source is missing or cannot be decoded.
+    """
+    max_side = DERIVATIVE_SIZES[size]
+    target = DERIVED_DIR / f"{source.stem}_{max_side}.jpg"
+    if target.exists():
+        return target
+    if not source.exists():
+        return None
+    data = encode_thumbnail(source, max_side)
+    if data is None:
+        return None
+    DERIVED_DIR.mkdir(parents=True, exist_ok=True)
+    partial = DERIVED_DIR / f"{target.name}.{uuid4().hex}.part"
+    partial.write_bytes(data)
+    partial.replace(target)
+    return target
+
+
+def make_derivatives(*sources: Path) -> None:
+    """Pre-generate every derivative size, so first views are already cheap."""
+    for source in sources:
+        for size in DERIVATIVE_SIZES:
+            derivative(source, size)
+
+
+class UploadFiles(StaticFiles):
+    """``/uploads`` with long-lived caching and on-demand derivatives.
+
+    ``/uploads/<name>`` serves the original; ``/uploads/thumb/<name>`` and
+    ``/uploads/medium/<name>`` serve its recompressed JPEG derivatives,
+    generating them on the first request. Responses carry a private, immutable
+    ``Cache-Control`` next to StaticFiles' own ``ETag``/``Last-Modified``, so
+    revalidation is a 304 and most views never reach the server at all.
+    """
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        size, _, name = path.partition("/")
+        if size in DERIVATIVE_SIZES and name and Path(name).name == name:
+            target = await run_in_threadpool(derivative, Path(self.directory) / name, size)
+            if target is None:
+                raise HTTPException(status_code=404)
+            path = str(target.relative_to(self.directory))
+        response = await super().get_response(path, scope)
+        if response.status_code in (200, 304):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE
+        return response
@@ -0,0 +1,125 @@
+"""Report-submission latency during a login storm, with and without the hash pool.
+
+Starts the API under uvicorn twice: once with ``AUTH_HASH_WORKERS=0``
+(PBKDF2 in the shared threadpool, the old behaviour) and once with the
+dedicated password-hashing pool. Each run measures ``POST /reports`` latency
+alone, then again while ``--storm`` concurrent clients hammer ``/auth/login``.
+Run from ``backend/``::
+
+    python -m benchmarks.bench_auth_isolation --storm 64 --seconds 8
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.bench_event_stream import _free_port, wait_ready
+
+SELFIE = b"SELFIE" * 800
+ACCIDENT = b"ACCIDT" * 800
+
+
+def start_server(port: int, hash_workers: int) -> subprocess.Popen:
+    tmp = Path(tempfile.mkdtemp(prefix="bench-auth-"))
+    env = {
+        **os.environ,
+        "DB_PATH": str(tmp / "bench.db"),
+        "UPLOAD_DIR": str(tmp / "uploads"),
+        "AUTH_HASH_WORKERS": str(hash_workers),
+        "CV_WORKERS": "0",
+        # Measure latency, not the limiter.
+        "RATE_LIMIT_PER_HOUR": "0",
+        "RATE_LIMIT_DEVICE_PER_HOUR": "0",
+        "RATE_LIMIT_IP_PER_HOUR": "0",
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"], env=env
+    )
+
+
+async def submit_reports(client: httpx.AsyncClient, token: str, seconds: float, concurrency: int) -> list[float]:
+    latencies: list[float] = []
+    deadline = time.monotonic() + seconds
+
+    async def worker() -> None:
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            resp = await client.post(
+                "/reports",
+                headers={"Authorization": f"Bearer {token}"},
+                data={"emergency_type": "Fire", "description": "Kitchen fire", "latitude": "14.1", "longitude": "121.1"},
+                files={"selfie": ("s.jpg", SELFIE, "image/jpeg"), "accident_photo": ("a.jpg", ACCIDENT, "image/jpeg")},
+            )
+            resp.raise_for_status()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+async def login_storm(client: httpx.AsyncClient, stop: asyncio.Event, concurrency: int, stats: dict) -> None:
+    async def worker() -> None:
+        while not stop.is_set():
+            resp = await client.post("/auth/login", data={"email": "responder@slsu.local", "password": "password123"})
+            stats[resp.status_code] = stats.get(resp.status_code, 0) + 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+def _summary(latencies: list[float]) -> str:
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return f"n={len(latencies):4d}  p50 {statistics.median(latencies):7.1f} ms  p99 {p99:7.1f} ms"
+
+
+async def measure(base: str, args: argparse.Namespace) -> None:
+    limits = httpx.Limits(max_connections=args.storm + args.reporters + 10)
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=60) as client:
+        reg = await client.post("/auth/register", data={"email": "bench_auth@slsu.local", "password": "password123"})
+        token = reg.json()["token"]
+        await submit_reports(client, token, 1, args.reporters)  # warm-up
+
+        quiet = await submit_reports(client, token, args.seconds, args.reporters)
+        print(f"  reports, no logins:     {_summary(quiet)}")
+
+        stop, stats = asyncio.Event(), {}
+        storm = asyncio.create_task(login_storm(client, stop, args.storm, stats))
+        await asyncio.sleep(0.5)
+        busy = await submit_reports(client, token, args.seconds, args.reporters)
+        stop.set()
+        await storm
+        print(f"  reports, login storm:   {_summary(busy)}")
+        print(f"  login responses: {dict(sorted(stats.items()))}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--storm", type=int, default=64, help="concurrent login clients")
+    parser.add_argument("--reporters", type=int, default=4, help="concurrent report submitters")
+    parser.add_argument("--seconds", type=float, default=8)
+    args = parser.parse_args()
+
+    for label, workers in (("PBKDF2 in API threadpool", 0), ("PBKDF2 on hash pool", 2)):
+        port = _free_port()
+        server = start_server(port, workers)
+        try:
+            base = f"http://127.0.0.1:{port}"
+            asyncio.run(wait_ready(base))
+            print(label)
+            asyncio.run(measure(base, args))
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
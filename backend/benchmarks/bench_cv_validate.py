@@ -0,0 +1,74 @@
+"""Image validations/sec: legacy per-call cascade vs the process-pool service.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_cv_validate --pairs 16 --size 1280x720
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from app.cv_utils import ValidationService
+
+
+def legacy_validate(selfie_path: Path, accident_path: Path) -> dict:
+    """The original implementation: new cascade per call, selfie grayscaled twice."""
+    selfie = cv2.imread(str(selfie_path))
+    accident = cv2.imread(str(accident_path))
+    detector = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
+    faces = detector.detectMultiScale(cv2.cvtColor(selfie, cv2.COLOR_BGR2GRAY), scaleFactor=1.1, minNeighbors=4)
+    accident_blur = float(cv2.Laplacian(cv2.cvtColor(accident, cv2.COLOR_BGR2GRAY), cv2.CV_64F).var())
+    selfie_blur = float(cv2.Laplacian(cv2.cvtColor(selfie, cv2.COLOR_BGR2GRAY), cv2.CV_64F).var())
+    same = hashlib.sha256(selfie_path.read_bytes()).hexdigest() == hashlib.sha256(accident_path.read_bytes()).hexdigest()
+    return {"faces": len(faces), "blur": (accident_blur, selfie_blur), "same": same}
+
+
+def make_pairs(directory: Path, count: int, width: int, height: int) -> list[tuple[Path, Path]]:
+    rng = np.random.default_rng(0)
+    pairs = []
+    for i in range(count):
+        image = cv2.GaussianBlur(rng.integers(0, 255, (height, width, 3), dtype=np.uint8), (5, 5), 0)
+        selfie, accident = directory / f"selfie_{i}.jpg", directory / f"accident_{i}.jpg"
+        cv2.imwrite(str(selfie), image)
+        cv2.imwrite(str(accident), np.flipud(image))
+        pairs.append((selfie, accident))
+    return pairs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pairs", type=int, default=16)
+    parser.add_argument("--size", default="1280x720")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.size.split("x"))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pairs = make_pairs(Path(tmp), args.pairs, width, height)
+
+        start = time.perf_counter()
+        for selfie, accident in pairs:
+            legacy_validate(selfie, accident)
+        legacy = len(pairs) / (time.perf_counter() - start)
+
+        service = ValidationService(workers=args.workers)
+        service.start()
+        start = time.perf_counter()
+        service.validate_many(pairs)
+        pooled = len(pairs) / (time.perf_counter() - start)
+        service.shutdown()
+
+    print(f"legacy validate_images:              {legacy:7.2f} validations/s")
+    print(f"validate_images_many ({args.workers} workers):   {pooled:7.2f} validations/s  ({pooled / legacy:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Requests/sec on mixed read/write API traffic with and without the SQLite pool.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_db_pool --requests 400 --threads 8
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+_TMP_DIR = Path(tempfile.mkdtemp(prefix="bench-db-"))
+os.environ.setdefault("DB_PATH", str(_TMP_DIR / "bench.db"))
+os.environ.setdefault("UPLOAD_DIR", str(_TMP_DIR / "uploads"))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import main  # noqa: E402
+from app.config import DB_PATH  # noqa: E402
+from app.db import get_conn, now_iso  # noqa: E402
+
+
+@contextmanager
+def legacy_get_conn():
+    """The pre-pool behaviour: one fresh rollback-journal connection per block."""
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    try:
+        yield conn
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def seed_reports(count: int) -> None:
+    with get_conn() as conn:
+        user_id = conn.execute("SELECT id FROM users WHERE email='admin@slsu.local'").fetchone()["id"]
+        conn.executemany(
+            """
+            INSERT INTO reports (
+                user_id,device_id,emergency_type,description,latitude,longitude,selfie_path,accident_path,lora_payload,
+                severity_label,severity_confidence,verification_score,face_ok,accident_image_ok,suspicious,status,created_at,updated_at
+            ) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+            """,
+            [
+                (user_id, "bench", "Fire", "bench report", 14.1, 121.1, "uploads/s.jpg", "uploads/a.jpg", "",
+                 "Low", 0.5, 80.0, 1, 1, 0, "Pending", now_iso(), now_iso())
+                for _ in range(count)
+            ],
+        )
+
+
+def run(client: TestClient, token: str, requests: int, threads: int) -> float:
+    headers = {"Authorization": f"Bearer {token}"}
+    paths = ["/reports/me", "/reports/analytics", "/audit-logs"]
+
+    def hit(i: int) -> None:
+        if i % 4 == 3:
+            resp = client.patch(f"/reports/{i % 50 + 1}/status", headers=headers, data={"status_label": "Verified"})
+        else:
+            resp = client.get(paths[i % len(paths)], headers=headers)
+        assert resp.status_code == 200, resp.text
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(hit, range(requests)))
+    return requests / (time.perf_counter() - start)
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=200)
+    args = parser.parse_args()
+
+    main.startup()
+    seed_reports(args.seed)
+    client = TestClient(main.app)
+    token = client.post("/auth/login", data={"email": "admin@slsu.local", "password": "password123"}).json()["token"]
+
+    run(client, token, args.requests // 4, args.threads)  # warm-up
+    pooled = run(client, token, args.requests, args.threads)
+
+    main.close_pool()
+    with sqlite3.connect(DB_PATH) as conn:
+        conn.execute("PRAGMA journal_mode=DELETE")
+
+    original = main.get_conn
+    main.get_conn = legacy_get_conn
+    try:
+        run(client, token, args.requests // 4, args.threads)  # warm-up
+        legacy = run(client, token, args.requests, args.threads)
+    finally:
+        main.get_conn = original
+
+    print(f"legacy connect-per-block: {legacy:8.1f} req/s")
+    print(f"pooled WAL connections:   {pooled:8.1f} req/s  ({pooled / legacy:.2f}x)")
+    main.shutdown()
+
+
+if __name__ == "__main__":
+    main_cli()
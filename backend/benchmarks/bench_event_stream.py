@@ -0,0 +1,183 @@
+"""Load test for the live report feed: hundreds of SSE subscribers on one server.
+
+Starts the API under uvicorn against a throwaway database, opens
+``--subscribers`` concurrent ``/reports/stream`` connections (``--slow`` of
+them read with a delay, to exercise per-connection backpressure), then drives
+``--events`` status changes through ``PATCH /reports/{id}/status`` and
+reports how long each event took to reach every fast subscriber. Run from
+``backend/``::
+
+    python -m benchmarks.bench_event_stream --subscribers 300 --events 50
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int, buffer_size: int) -> subprocess.Popen:
+    tmp = Path(tempfile.mkdtemp(prefix="bench-events-"))
+    env = {
+        **os.environ,
+        "DB_PATH": str(tmp / "bench.db"),
+        "UPLOAD_DIR": str(tmp / "uploads"),
+        "EVENT_MAX_SUBSCRIBERS": "100000",
+        "EVENT_BUFFER_SIZE": str(buffer_size),
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+
+
+async def wait_ready(base: str, timeout: float = 120) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+async def seed_report(client: httpx.AsyncClient) -> tuple[str, int]:
+    admin = (await client.post("/auth/login", data={"email": "admin@slsu.local", "password": "password123"})).json()
+    citizen = (
+        await client.post("/auth/register", data={"email": "bench_events@slsu.local", "password": "password123"})
+    ).json()
+    resp = await client.post(
+        "/reports",
+        headers={"Authorization": f"Bearer {citizen['token']}"},
+        data={"emergency_type": "Fire", "description": "Warehouse fire", "latitude": "14.1", "longitude": "121.1"},
+        files={"selfie": ("s.jpg", b"SELFIE" * 800, "image/jpeg"), "accident_photo": ("a.jpg", b"ACCIDT" * 800, "image/jpeg")},
+    )
+    resp.raise_for_status()
+    return admin["token"], resp.json()["id"]
+
+
+async def subscriber(
+    client: httpx.AsyncClient, token: str, ready: asyncio.Event, ready_count: list, target: int,
+    arrivals: dict, delay: float, stats: dict,
+) -> None:
+    async with client.stream("GET", "/reports/stream", params={"token": token}) as resp:
+        async for line in resp.aiter_lines():
+            if line.startswith("retry:"):
+                ready_count[0] += 1
+                if ready_count[0] == target:
+                    ready.set()
+            elif line.startswith("id: "):
+                if delay == 0:
+                    arrivals.setdefault(int(line.rpartition("-")[2]), []).append(time.perf_counter())
+                stats["delivered"] += 1
+                if delay:
+                    await asyncio.sleep(delay)
+            elif line == "event: resync":
+                stats["resyncs"] += 1
+
+
+async def run(args: argparse.Namespace, base: str) -> None:
+    limits = httpx.Limits(max_connections=args.subscribers + 10, max_keepalive_connections=args.subscribers + 10)
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=None) as client:
+        token, report_id = await seed_report(client)
+        ready, ready_count = asyncio.Event(), [0]
+        arrivals: dict[int, list[float]] = {}
+        stats = {"delivered": 0, "resyncs": 0}
+        tasks = [
+            asyncio.create_task(
+                subscriber(client, token, ready, ready_count, args.subscribers, arrivals,
+                           args.slow_delay if i < args.slow else 0.0, stats)
+            )
+            for i in range(args.subscribers)
+        ]
+        t0 = time.perf_counter()
+        await asyncio.wait_for(ready.wait(), 120)
+        print(f"{args.subscribers} subscribers connected in {time.perf_counter() - t0:.2f}s ({args.slow} slow)")
+
+        sent: dict[int, float] = {}
+        statuses = ["Verified", "Dispatched"]
+        for i in range(args.events):
+            sent_at = time.perf_counter()
+            resp = await client.patch(
+                f"/reports/{report_id}/status",
+                headers={"Authorization": f"Bearer {token}"},
+                data={"status_label": statuses[i % 2]},
+            )
+            resp.raise_for_status()
+            sent[i] = sent_at
+            await asyncio.sleep(args.interval)
+        fast = args.subscribers - args.slow
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            complete = [eid for eid, times in arrivals.items() if len(times) >= fast]
+            if len(complete) >= args.events:
+                break
+            await asyncio.sleep(0.1)
+
+        first_id = min(arrivals) if arrivals else 0
+        fanout = []
+        for i, sent_at in sent.items():
+            times = arrivals.get(first_id + i, [])
+            if len(times) >= fast:
+                fanout.append((max(times) - sent_at) * 1000)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    fanout.sort()
+    if fanout:
+        p99 = fanout[min(len(fanout) - 1, int(len(fanout) * 0.99))]
+        print(
+            f"events fully delivered to {fast} fast subscribers: {len(fanout)}/{args.events}  "
+            f"last-subscriber latency p50 {statistics.median(fanout):.1f} ms  p99 {p99:.1f} ms"
+        )
+    print(f"frames delivered {stats['delivered']}  resyncs sent to slow subscribers {stats['resyncs']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--subscribers", type=int, default=300)
+    parser.add_argument("--slow", type=int, default=10, help="subscribers that read with a delay")
+    parser.add_argument("--slow-delay", type=float, default=0.5)
+    parser.add_argument("--events", type=int, default=50)
+    parser.add_argument("--interval", type=float, default=0.02)
+    parser.add_argument("--buffer", type=int, default=1024, help="EVENT_BUFFER_SIZE for the server")
+    args = parser.parse_args()
+
+    port = _free_port()
+    server = start_server(port, args.buffer)
+    try:
+        base = f"http://127.0.0.1:{port}"
+        asyncio.run(wait_ready(base))
+        asyncio.run(run(args, base))
+        rss = Path(f"/proc/{server.pid}/status")
+        if rss.exists():
+            vm = next(line for line in rss.read_text().splitlines() if line.startswith("VmRSS"))
+            print(f"server {vm}")
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    print(f"client max RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Cold-start time and memory: compiled NumPy scorer vs unpickled sklearn pipeline.
+
+Each mode runs in a fresh interpreter that imports ``app.ai``, loads the model
+and scores one report. Run from ``backend/``::
+
+    python -m benchmarks.bench_model_startup --runs 5
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+CHILD = """
+import json, resource, sys, time
+start = time.perf_counter()
+from app.ai import SeverityModel
+model = SeverityModel()
+model.load()
+model.predict("Fire", "House fire spreading with people trapped", 0.8)
+elapsed = time.perf_counter() - start
+heavy = sorted(m for m in ("pandas", "sklearn", "scipy") if m in sys.modules)
+print(json.dumps({"seconds": elapsed, "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, "heavy": heavy}))
+"""
+
+
+def measure(compiled: bool, runs: int) -> dict:
+    env = {**os.environ, "USE_COMPILED_SCORER": "1" if compiled else "0"}
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", CHILD], env=env, capture_output=True, text=True, check=True)
+        samples.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return {
+        "seconds": statistics.median(s["seconds"] for s in samples),
+        "max_rss_mb": statistics.median(s["max_rss_mb"] for s in samples),
+        "heavy": samples[-1]["heavy"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    measure(True, 1)  # make sure model.pkl and the scorer artifact exist
+    for label, compiled in (("sklearn pipeline", False), ("compiled scorer", True)):
+        result = measure(compiled, args.runs)
+        print(
+            f"{label:17s} load+first predict {result['seconds'] * 1000:8.1f} ms  "
+            f"max RSS {result['max_rss_mb']:6.1f} MB  imports: {', '.join(result['heavy']) or 'numpy only'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
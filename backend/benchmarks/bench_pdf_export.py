@@ -0,0 +1,136 @@
+"""Time and peak memory of a large PDF export, old renderer vs export job.
+
+Seeds ``--reports`` reports that cycle through ``--photos`` distinct
+full-resolution photos, then runs each renderer in a fresh subprocess:
+
+``legacy``
+    every row loaded at once, both full-size photos decoded per report with
+    ``ImageReader`` and the document built in a ``BytesIO`` (the previous
+    ``/reports/export/pdf``, without its 100-report cap);
+``job``
+    ``ExportManager`` with keyset batches, cached thumbnails and a temp file,
+    measured cold (thumbnails generated on the way) and warm.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_pdf_export --reports 5000 --photos 200
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def seed(reports: int, photos: int) -> None:
+    import cv2
+    import numpy as np
+
+    from app.config import UPLOAD_DIR
+    from app.db import get_conn, init_db, now_iso
+
+    init_db()
+    names = []
+    for i in range(photos):
+        x = np.linspace(0, 255, 1600, dtype=np.float32)
+        y = np.linspace(0, 255, 1200, dtype=np.float32)[:, None]
+        image = np.dstack([(x + i * 7) % 256 + 0 * y, (y + i * 13) % 256 + 0 * x, (x + y) / 2]).astype(np.uint8)
+        name = f"bench_{i}.jpg"
+        cv2.imwrite(str(UPLOAD_DIR / name), image, [cv2.IMWRITE_JPEG_QUALITY, 90])
+        names.append(f"uploads/{name}")
+    with get_conn() as conn:
+        conn.execute(
+            "INSERT OR IGNORE INTO users (email,password_hash,role,created_at) VALUES ('bench@x','x','citizen',?)", (now_iso(),)
+        )
+        user_id = conn.execute("SELECT id FROM users WHERE email='bench@x'").fetchone()[0]
+        conn.executemany(
+            """
+            INSERT INTO reports (
+                user_id,device_id,emergency_type,description,latitude,longitude,selfie_path,accident_path,lora_payload,
+                severity_label,severity_confidence,verification_score,face_ok,accident_image_ok,suspicious,status,created_at,updated_at
+            ) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+            """,
+            [
+                (user_id, "bench", "Fire", "bench report", 14.1, 121.1, names[i % photos], names[(i + 1) % photos], "",
+                 "Low", 0.5, 80.0, 1, 1, 0, "Pending", now_iso(), now_iso())
+                for i in range(reports)
+            ],
+        )
+
+
+def legacy_export() -> int:
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.utils import ImageReader
+    from reportlab.pdfgen import canvas
+
+    from app.config import UPLOAD_DIR
+    from app.db import get_conn
+
+    with get_conn() as conn:
+        rows = [dict(r) for r in conn.execute("SELECT * FROM reports ORDER BY id DESC").fetchall()]
+    buff = io.BytesIO()
+    pdf = canvas.Canvas(buff, pagesize=letter)
+    y = letter[1] - 40
+    for r in rows:
+        if y < 140:
+            pdf.showPage()
+            y = letter[1] - 40
+        pdf.drawString(45, y - 15, f"Report #{r['id']} | {r['emergency_type']} | {r['severity_label']} | {r['status']}")
+        for idx, stored in enumerate([r["selfie_path"], r["accident_path"]]):
+            path = UPLOAD_DIR / Path(stored).name
+            pdf.drawImage(ImageReader(str(path)), 380 + idx * 100, y - 90, width=85, height=55, preserveAspectRatio=True)
+        y -= 105
+    pdf.save()
+    return len(buff.getvalue())
+
+
+def job_export() -> int:
+    from app.exports import ExportFilters, ExportManager
+
+    manager = ExportManager()
+    manager.start()
+    job = manager.submit(user_id=0, filters=ExportFilters())
+    job.future.result()
+    assert job.status == "done", job.error
+    size = job.path.stat().st_size
+    manager.shutdown()
+    return size
+
+
+def child(mode: str) -> None:
+    start = time.perf_counter()
+    size = legacy_export() if mode == "legacy" else job_export()
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"  {mode + ':':12s} {elapsed:7.2f} s  peak RSS {peak_mb:6.0f} MB  pdf {size / 1e6:6.1f} MB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reports", type=int, default=2000)
+    parser.add_argument("--photos", type=int, default=200, help="distinct full-size photos")
+    parser.add_argument("--mode", choices=["legacy", "job"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.mode:
+        child(args.mode)
+        return
+
+    tmp = Path(tempfile.mkdtemp(prefix="bench-export-"))
+    os.environ.update(
+        DB_PATH=str(tmp / "bench.db"), UPLOAD_DIR=str(tmp / "uploads"), EXPORT_DIR=str(tmp / "exports"),
+        EXPORT_MAX_REPORTS=str(args.reports),
+    )
+    seed(args.reports, args.photos)
+    print(f"{args.reports} reports, {args.photos} distinct photos")
+    for mode in ("legacy", "job", "job"):  # second job run reuses the thumbnails
+        subprocess.run([sys.executable, "-m", "benchmarks.bench_pdf_export", "--mode", mode], check=True, env=os.environ)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+from app.db import get_conn, init_db
+from app import rollups
+
+if __name__ == "__main__":
+    init_db()
+    with get_conn() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        rows = rollups.rebuild(conn)
+    print(f"Rebuilt analytics rollups: {rows} counters")
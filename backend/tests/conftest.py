@@ -0,0 +1,18 @@
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+_TMP_DIR = Path(tempfile.mkdtemp(prefix="emergency-tests-"))
+os.environ.setdefault("DB_PATH", str(_TMP_DIR / "emergency.db"))
+os.environ.setdefault("UPLOAD_DIR", str(_TMP_DIR / "uploads"))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _app_startup():
+    from app.main import shutdown, startup
+
+    startup()
+    yield
+    shutdown()
@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.ai import SeverityModel
+from app.config import DATASET_PATH
+from app.db import get_conn
+
+
+def test_compiled_scorer_matches_sklearn_pipeline():
+    model = SeverityModel()
+    model.load()
+    assert model.scorer is not None and model.model is None
+    pipeline = model.load_pipeline()
+    df = pd.read_csv(DATASET_PATH)
+    records = df[["emergency_type", "description", "hour_of_day", "risk_score"]].to_dict("records")
+    records.append({"emergency_type": "Unlisted", "description": "strange noise outside", "hour_of_day": 3, "risk_score": 0.1})
+    records.append({"emergency_type": "Fire", "description": "", "hour_of_day": 0, "risk_score": 0.0})
+    records.append({"emergency_type": "Medical", "description": "UNCONSCIOUS, not breathing!! Fire-fire", "hour_of_day": 23, "risk_score": 1.0})
+
+    frame = pd.DataFrame(records)
+    expected = pipeline.predict_proba(frame)
+    got = model.scorer.predict_proba(
+        frame["emergency_type"].tolist(), frame["description"].tolist(), frame["hour_of_day"], frame["risk_score"]
+    )
+    assert np.allclose(got, expected, atol=1e-9)
+    assert [label for label, _ in model.predict_many(records)] == [str(label) for label in pipeline.predict(frame)]
+    assert model.predict_many([]) == []
+
+
+def test_metrics_are_cached_by_dataset_and_version(monkeypatch):
+    with get_conn() as conn:
+        conn.execute("DELETE FROM model_metrics")
+    model = SeverityModel()
+    calls = []
+    original = model._evaluate_in_child
+    monkeypatch.setattr(model, "_evaluate_in_child", lambda cv_folds: calls.append(cv_folds) or original(cv_folds))
+
+    first = model.metrics()
+    assert model.metrics() is first
+    assert first["dataset_sha256"] == model.dataset_digest()
+    assert calls == [None]
+
+    cv = model.metrics(cv_folds=3)
+    assert cv["cv_folds"] == 3
+    assert sum(sum(row) for row in cv["confusion_matrix"]) == cv["sample_size"]
+    assert calls == [None, 3]
+
+    monkeypatch.setattr(SeverityModel, "VERSION", "test-version")
+    assert model.metrics()["model_version"] == "test-version"
+    assert calls == [None, 3, None]
+    model.shutdown()
+
+
+def test_metrics_are_persisted_and_reused_by_other_processes(monkeypatch):
+    first = SeverityModel()
+    expected = first.metrics()
+    first.shutdown()
+
+    # A restarted or second worker loads the stored result instead of retraining.
+    monkeypatch.setattr(SeverityModel, "_evaluate_in_child", lambda cv_folds: pytest.fail("metrics were recomputed"))
+    restarted = SeverityModel()
+    assert restarted.load_metrics() >= 1
+    assert restarted.metrics() == expected
+    assert SeverityModel().metrics() == expected
+
+
+def test_metrics_are_evaluated_in_a_child_process_without_blocking(monkeypatch):
+    with get_conn() as conn:
+        conn.execute("DELETE FROM model_metrics")
+    monkeypatch.setattr(SeverityModel, "evaluate", lambda self, cv_folds=None: pytest.fail("evaluated in-process"))
+    model = SeverityModel()
+    assert model.metrics(cv_folds=4, wait=False) is None
+    model.refresh_metrics(cv_folds=4).result(timeout=120)
+    assert model.metrics(cv_folds=4, wait=False)["cv_folds"] == 4
+
+    def too_few_samples(cv_folds):
+        raise ValueError("Not enough samples per class for cross-validation")
+
+    monkeypatch.setattr(model, "_evaluate_in_child", too_few_samples)
+    assert model.metrics(cv_folds=5, wait=False) is None
+    with pytest.raises(ValueError):
+        model.refresh_metrics(cv_folds=5).result(timeout=30)
+    # The failure is reported once on the next call; the call after that retries.
+    with pytest.raises(ValueError):
+        model.metrics(cv_folds=5, wait=False)
+    model.shutdown()
+
+
+def test_serving_startup_does_not_import_pandas_or_sklearn(tmp_path):
+    import json
+    import os
+    import subprocess
+    import sys
+
+    from app.config import BASE_DIR
+
+    child = (
+        "import json, sys\n"
+        "from app.main import shutdown, startup\n"
+        "startup()\n"
+        "heavy = sorted(m for m in ('pandas', 'sklearn', 'scipy') if m in sys.modules)\n"
+        "shutdown()\n"
+        "print(json.dumps(heavy))\n"
+    )
+    env = {**os.environ, "DB_PATH": str(tmp_path / "serving.db"), "UPLOAD_DIR": str(tmp_path / "uploads")}
+    out = subprocess.run([sys.executable, "-c", child], cwd=BASE_DIR, env=env, capture_output=True, text=True, check=True)
+    assert json.loads(out.stdout.strip().splitlines()[-1]) == []
+
+
+def test_missing_scorer_is_rebuilt_once_out_of_process(tmp_path, monkeypatch):
+    import shutil
+
+    from app import ai
+
+    exported, built = ai.SCORER_DIR, tmp_path / "scorer"
+    runs = []
+
+    def fake_trainer(export_only):
+        runs.append(export_only)
+        shutil.copytree(exported, built)
+
+    monkeypatch.setattr(ai, "SCORER_DIR", built)
+    monkeypatch.setattr(SeverityModel, "_run_trainer", staticmethod(fake_trainer))
+    model = SeverityModel()
+    model.load()
+    assert runs == [True] and model.scorer is not None
+    SeverityModel().load()
+    assert runs == [True]
+
+    monkeypatch.setattr(SeverityModel, "_run_trainer", staticmethod(lambda export_only: None))
+    shutil.rmtree(built)
+    with pytest.raises(RuntimeError):
+        SeverityModel().load()
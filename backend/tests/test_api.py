@@ -1,8 +1,9 @@
+import time
 from pathlib import Path
 
 from fastapi.testclient import TestClient
 
-from app.main import app
+from app.main import app, export_manager
 
 
 def _write_dummy_image(path: Path, token: bytes) -> None:
@@ -51,6 +52,543 @@ def test_admin_analytics_and_model_metrics():
     assert analytics.status_code == 200
     assert 'reports_per_type' in analytics.json()
 
-    metrics = client.get('/model/metrics', headers={'Authorization': f'Bearer {token}'})
+    for _ in range(600):
+        metrics = client.get('/model/metrics', headers={'Authorization': f'Bearer {token}'})
+        if metrics.status_code != 202:
+            break
+        assert metrics.json() == {'status': 'pending'}
+        time.sleep(0.1)
     assert metrics.status_code == 200
     assert 'accuracy' in metrics.json()
+
+
+def test_async_report_is_acknowledged_then_scored(tmp_path: Path):
+    client = TestClient(app)
+    token = _register_and_get_token(client, 'tester_async@slsu.local')
+    headers = {'Authorization': f'Bearer {token}'}
+
+    selfie = tmp_path / 'selfie.jpg'
+    accident = tmp_path / 'accident.jpg'
+    _write_dummy_image(selfie, b'SELFIE')
+    _write_dummy_image(accident, b'ACCIDT')
+
+    with selfie.open('rb') as s, accident.open('rb') as a:
+        resp = client.post(
+            '/reports',
+            headers=headers,
+            data={
+                'emergency_type': 'Medical',
+                'description': 'Person collapsed and not breathing.',
+                'latitude': '14.123',
+                'longitude': '121.456',
+                'async_processing': 'true',
+            },
+            files={'selfie': ('selfie.jpg', s, 'image/jpeg'), 'accident_photo': ('accident.jpg', a, 'image/jpeg')},
+        )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body['status'] == 'Processing'
+
+    deadline = time.monotonic() + 10
+    while True:
+        detail = client.get(body['status_url'], headers=headers)
+        assert detail.status_code == 200
+        if not detail.json()['processing'] or time.monotonic() > deadline:
+            break
+        time.sleep(0.05)
+
+    verdict = detail.json()
+    assert verdict['status'] in {'Pending', 'Needs Review', 'Rejected'}
+    assert verdict['severity']['label'] in {'Low', 'Medium', 'Critical'}
+    assert verdict['verification']['flags']
+
+    other = _register_and_get_token(client, 'tester_async_other@slsu.local')
+    assert client.get(body['status_url'], headers={'Authorization': f'Bearer {other}'}).status_code == 404
+
+
+def _submit(client: TestClient, token: str, selfie: Path, accident: Path):
+    with selfie.open('rb') as s, accident.open('rb') as a:
+        return client.post(
+            '/reports',
+            headers={'Authorization': f'Bearer {token}'},
+            data={'emergency_type': 'Accident', 'description': 'Car crash on the highway.', 'latitude': '14.1', 'longitude': '121.1'},
+            files={'selfie': ('selfie.png', s, 'image/png'), 'accident_photo': ('accident.png', a, 'image/png')},
+        )
+
+
+def test_api_timestamps_are_iso_8601_utc(tmp_path: Path):
+    import re
+    from datetime import datetime, timezone
+
+    selfie = tmp_path / 'selfie.jpg'
+    accident = tmp_path / 'accident.jpg'
+    _write_dummy_image(selfie, b'TIMESF')
+    _write_dummy_image(accident, b'TIMEAC')
+    client = TestClient(app)
+    token = _register_and_get_token(client, 'tester_time@slsu.local')
+    created = _submit(client, token, selfie, accident).json()
+    headers = {'Authorization': f'Bearer {token}'}
+
+    detail = client.get(created['status_url'], headers=headers).json()
+    mine = client.get('/reports/me?limit=1&fields=id,created_at', headers=headers).json()[0]
+    pattern = re.compile(r'\d{4}-\d\d-\d\dT\d\d:\d\d:\d\dZ')
+    for value in (detail['created_at'], detail['updated_at'], mine['created_at']):
+        assert pattern.fullmatch(value), value
+    parsed = datetime.fromisoformat(detail['created_at'].replace('Z', '+00:00'))
+    assert abs((datetime.now(timezone.utc) - parsed).total_seconds()) < 120
+
+
+def test_reused_accident_photo_is_flagged_and_verification_cached(tmp_path: Path, monkeypatch):
+    import cv2
+    import numpy as np
+
+    from app import main
+
+    rng = np.random.default_rng(11)
+    selfie = tmp_path / 'selfie.png'
+    accident = tmp_path / 'accident.png'
+    cv2.imwrite(str(selfie), rng.integers(0, 255, (240, 320, 3), dtype=np.uint8))
+    cv2.imwrite(str(accident), cv2.GaussianBlur(rng.integers(0, 255, (240, 320, 3), dtype=np.uint8), (3, 3), 0))
+
+    client = TestClient(app)
+    first = _submit(client, _register_and_get_token(client, 'tester_reuse_a@slsu.local'), selfie, accident)
+    assert first.status_code == 200
+    assert 'accident_photo_reused' not in first.json()['verification']['flags']
+
+    def recomputed(path):
+        raise AssertionError('dhash recomputed for fingerprinted content')
+
+    monkeypatch.setattr(main, 'dhash', recomputed)
+    second = _submit(client, _register_and_get_token(client, 'tester_reuse_b@slsu.local'), selfie, accident)
+    assert second.status_code == 200
+    verification = second.json()['verification']
+    assert 'accident_photo_reused' in verification['flags']
+    assert verification['reused_from_reports'] == [first.json()['id']]
+    assert verification['decided_by'] == 'cache'
+    assert second.json()['status'] in {'Needs Review', 'Rejected'}
+
+
+def test_predict_batch_endpoint():
+    client = TestClient(app)
+    token = client.post('/auth/login', data={'email': 'responder@slsu.local', 'password': 'password123'}).json()['token']
+    headers = {'Authorization': f'Bearer {token}'}
+    reports = [
+        {'emergency_type': 'Fire', 'description': 'House fire spreading with people trapped', 'risk_score': 0.9},
+        {'emergency_type': 'Medical', 'description': 'Minor cut on finger', 'hour_of_day': 10},
+    ]
+    resp = client.post('/model/predict-batch', headers=headers, json={'reports': reports})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body['count'] == 2
+    assert all(p['label'] in {'Low', 'Medium', 'Critical'} for p in body['predictions'])
+
+    citizen = _register_and_get_token(client, 'tester_batch@slsu.local')
+    denied = client.post('/model/predict-batch', headers={'Authorization': f'Bearer {citizen}'}, json={'reports': reports})
+    assert denied.status_code == 403
+
+
+def test_report_lists_use_keyset_pages_and_field_projection(tmp_path: Path):
+    selfie = tmp_path / 'selfie.jpg'
+    accident = tmp_path / 'accident.jpg'
+    _write_dummy_image(selfie, b'PAGESF')
+    _write_dummy_image(accident, b'PAGEAC')
+
+    client = TestClient(app)
+    token = _register_and_get_token(client, 'tester_pages@slsu.local')
+    created = [_submit(client, token, selfie, accident).json()['id'] for _ in range(3)]
+    headers = {'Authorization': f'Bearer {token}'}
+
+    first = client.get('/reports/me', headers=headers, params={'limit': 2})
+    assert first.status_code == 200
+    assert [r['id'] for r in first.json()] == created[::-1][:2]
+    cursor = first.headers['X-Next-Cursor']
+
+    last = client.get('/reports/me', headers=headers, params={'limit': 2, 'cursor': cursor})
+    assert [r['id'] for r in last.json()] == [created[0]]
+    assert 'X-Next-Cursor' not in last.headers
+
+    admin = client.post('/auth/login', data={'email': 'admin@slsu.local', 'password': 'password123'}).json()['token']
+    admin_headers = {'Authorization': f'Bearer {admin}'}
+    projected = client.get('/reports', headers=admin_headers, params={'limit': 1, 'fields': 'status,accident_url'})
+    assert projected.status_code == 200
+    row = projected.json()[0]
+    assert set(row) == {'status', 'accident_url'}
+    assert row['accident_url'].startswith('/uploads/')
+
+    full = client.get('/reports', headers=admin_headers, params={'limit': 1}).json()[0]
+    assert {'reporter_email', 'selfie_path', 'map_url'} <= set(full)
+
+    bad = client.get('/reports', headers=admin_headers, params={'fields': 'status,password_hash'})
+    assert bad.status_code == 400
+
+
+def test_list_etags_and_change_feed(tmp_path: Path):
+    from app.db import get_conn
+
+    selfie = tmp_path / 'selfie.jpg'
+    accident = tmp_path / 'accident.jpg'
+    _write_dummy_image(selfie, b'SYNCSF')
+    _write_dummy_image(accident, b'SYNCAC')
+
+    client = TestClient(app)
+    admin = client.post('/auth/login', data={'email': 'admin@slsu.local', 'password': 'password123'}).json()['token']
+    headers = {'Authorization': f'Bearer {admin}'}
+
+    for path in ('/reports', '/reports/analytics'):
+        first = client.get(path, headers=headers)
+        etag = first.headers['ETag']
+        again = client.get(path, headers={**headers, 'If-None-Match': etag})
+        assert again.status_code == 304
+        assert again.content == b''
+    since = int(client.get('/reports', headers=headers).headers['X-Sync-Cursor'])
+    list_etag = client.get('/reports', headers=headers).headers['ETag']
+
+    citizen = _register_and_get_token(client, 'tester_sync@slsu.local')
+    report_id = _submit(client, citizen, selfie, accident).json()['id']
+    assert client.get('/reports', headers={**headers, 'If-None-Match': list_etag}).status_code == 200
+
+    feed = client.get('/reports/changes', headers=headers, params={'since': since, 'fields': 'id,status'}).json()
+    assert [r['id'] for r in feed['reports']] == [report_id]
+    assert feed['deleted'] == [] and feed['has_more'] is False
+    since = feed['cursor']
+    assert client.get('/reports/changes', headers=headers, params={'since': since}).json()['reports'] == []
+
+    client.patch(f'/reports/{report_id}/status', headers=headers, data={'status_label': 'Dispatched'})
+    feed = client.get('/reports/changes', headers=headers, params={'since': since, 'fields': 'id,status'}).json()
+    assert feed['reports'] == [{'id': report_id, 'status': 'Dispatched'}]
+    since = feed['cursor']
+
+    with get_conn() as conn:
+        conn.execute('DELETE FROM reports WHERE id=?', (report_id,))
+    feed = client.get('/reports/changes', headers={'Authorization': f'Bearer {citizen}'}, params={'since': 0}).json()
+    assert feed['reports'] == [] and feed['deleted'] == [report_id]
+    assert client.get('/reports/changes', headers=headers, params={'since': since}).json()['deleted'] == [report_id]
+
+
+def test_analytics_reads_rollups_with_range_and_granularity():
+    from app import rollups
+    from app.db import get_conn
+
+    client = TestClient(app)
+    token = client.post('/auth/login', data={'email': 'admin@slsu.local', 'password': 'password123'}).json()['token']
+    headers = {'Authorization': f'Bearer {token}'}
+
+    with get_conn() as conn:
+        live = {tuple(r) for r in conn.execute('SELECT grain, bucket, dimension, value, count FROM report_rollups WHERE count > 0')}
+        expected_types = {tuple(r) for r in conn.execute('SELECT emergency_type, COUNT(*) FROM reports GROUP BY emergency_type')}
+        total = conn.execute('SELECT COUNT(*) FROM reports').fetchone()[0]
+        conn.execute('BEGIN IMMEDIATE')
+        rollups.rebuild(conn)
+    with get_conn() as conn:
+        rebuilt = {tuple(r) for r in conn.execute('SELECT grain, bucket, dimension, value, count FROM report_rollups WHERE count > 0')}
+    assert live == rebuilt
+
+    body = client.get('/reports/analytics', headers=headers).json()
+    assert {(r['name'], r['value']) for r in body['reports_per_type']} == expected_types
+    assert sum(r['value'] for r in body['reports_over_time']) == total
+    assert all(set(r) == {'day', 'value'} for r in body['reports_over_time'])
+
+    hourly = client.get('/reports/analytics', headers=headers, params={'granularity': 'hour'}).json()
+    assert sum(r['value'] for r in hourly['reports_over_time']) == total
+    assert all(len(r['hour']) == 13 for r in hourly['reports_over_time'])
+
+    future = client.get('/reports/analytics', headers=headers, params={'start': '2999-01-01'}).json()
+    assert future['reports_per_type'] == [] and future['reports_over_time'] == []
+    bad = client.get('/reports/analytics', headers=headers, params={'start': '2026-02-01', 'end': '2026-01-01'})
+    assert bad.status_code == 400
+
+
+def test_fourth_report_in_an_hour_is_refused_and_flags_the_account(tmp_path: Path):
+    from app.db import get_conn
+
+    selfie = tmp_path / 'selfie.jpg'
+    accident = tmp_path / 'accident.jpg'
+    _write_dummy_image(selfie, b'RATESF')
+    _write_dummy_image(accident, b'RATEAC')
+
+    client = TestClient(app)
+    token = _register_and_get_token(client, 'tester_rate@slsu.local')
+    assert [_submit(client, token, selfie, accident).status_code for _ in range(3)] == [200, 200, 200]
+
+    refused = _submit(client, token, selfie, accident)
+    assert refused.status_code == 429
+    assert int(refused.headers['Retry-After']) > 0
+    with get_conn() as conn:
+        user = conn.execute("SELECT account_flagged FROM users WHERE email='tester_rate@slsu.local'").fetchone()
+    assert user['account_flagged'] == 1
+
+
+def test_rejected_submissions_do_not_use_quota(tmp_path: Path, monkeypatch):
+    from fastapi import HTTPException
+
+    from app import main, storage
+    from app.db import get_conn
+    from app.ratelimit import Policy, RateLimiter
+
+    monkeypatch.setattr(main, 'rate_limiter', RateLimiter({'user': Policy(1, 3600)}, persist=False))
+    selfie = tmp_path / 'selfie.jpg'
+    accident = tmp_path / 'accident.jpg'
+    _write_dummy_image(selfie, b'QUOTSF')
+    _write_dummy_image(accident, b'QUOTAC')
+    client = TestClient(app)
+    token = _register_and_get_token(client, 'tester_quota@slsu.local')
+
+    with monkeypatch.context() as patch:
+        patch.setattr(main, 'save_upload', lambda upload, prefix: storage.save_upload(upload, prefix, max_bytes=100))
+        assert [_submit(client, token, selfie, accident).status_code for _ in range(3)] == [413, 413, 413]
+    with monkeypatch.context() as patch:
+        def reject(*args, **kwargs):
+            raise HTTPException(status_code=400, detail='unreadable image')
+
+        patch.setattr(main, 'assess_report', reject)
+        assert _submit(client, token, selfie, accident).status_code == 400
+
+    assert _submit(client, token, selfie, accident).status_code == 200
+    assert _submit(client, token, selfie, accident).status_code == 429
+    with get_conn() as conn:
+        user = conn.execute("SELECT id FROM users WHERE email='tester_quota@slsu.local'").fetchone()
+        stored = conn.execute("SELECT COUNT(*) FROM reports WHERE user_id=?", (user['id'],)).fetchone()[0]
+    assert stored == 1
+
+
+def test_parallel_submissions_cannot_exceed_the_rate_limit(tmp_path: Path, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from app import main
+    from app.db import get_conn
+    from app.ratelimit import Policy, RateLimiter
+
+    monkeypatch.setattr(main, 'rate_limiter', RateLimiter({'user': Policy(3, 3600)}, persist=False))
+    selfie = tmp_path / 'selfie.jpg'
+    accident = tmp_path / 'accident.jpg'
+    _write_dummy_image(selfie, b'BRSTSF')
+    _write_dummy_image(accident, b'BRSTAC')
+    client = TestClient(app)
+    token = _register_and_get_token(client, 'tester_burst@slsu.local')
+
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        codes = list(pool.map(lambda _: _submit(client, token, selfie, accident).status_code, range(10)))
+
+    assert sorted(codes) == [200] * 3 + [429] * 7
+    with get_conn() as conn:
+        user = conn.execute("SELECT id FROM users WHERE email='tester_burst@slsu.local'").fetchone()
+        stored = conn.execute("SELECT COUNT(*) FROM reports WHERE user_id=?", (user['id'],)).fetchone()[0]
+    assert stored == 3
+
+
+def test_quota_charge_commits_with_the_report(tmp_path: Path, monkeypatch):
+    from app import main
+    from app.config import RATE_LIMIT_PER_HOUR
+    from app.db import get_conn
+    from app.ratelimit import Policy, RateLimiter
+
+    monkeypatch.setattr(main, 'rate_limiter', RateLimiter({'user': Policy(RATE_LIMIT_PER_HOUR, 3600)}, persist=True))
+    selfie = tmp_path / 'selfie.jpg'
+    accident = tmp_path / 'accident.jpg'
+    _write_dummy_image(selfie, b'TXQTSF')
+    _write_dummy_image(accident, b'TXQTAC')
+    client = TestClient(app, raise_server_exceptions=False)
+    token = _register_and_get_token(client, 'tester_quota_tx@slsu.local')
+    for _ in range(RATE_LIMIT_PER_HOUR - 1):
+        assert _submit(client, token, selfie, accident).status_code == 200
+
+    def query():
+        with get_conn() as conn:
+            user = conn.execute("SELECT id, risk_score FROM users WHERE email='tester_quota_tx@slsu.local'").fetchone()
+            hits = conn.execute("SELECT COUNT(*) FROM rate_limit_hits WHERE key=?", (str(user['id']),)).fetchone()[0]
+            stored = conn.execute("SELECT COUNT(*) FROM reports WHERE user_id=?", (user['id'],)).fetchone()[0]
+        return user['risk_score'], hits, stored
+
+    before = query()
+    assert before[1:] == (RATE_LIMIT_PER_HOUR - 1, RATE_LIMIT_PER_HOUR - 1)
+
+    # Crash inside the report transaction, after the quota hit is written.
+    update = main.update_user_risk_score
+
+    def crash_on_escalation(user_id, increase_by=0.0, flagged=None, conn=None):
+        if increase_by == 8:
+            raise RuntimeError('crashed mid-transaction')
+        update(user_id, increase_by=increase_by, flagged=flagged, conn=conn)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(main, 'update_user_risk_score', crash_on_escalation)
+        assert _submit(client, token, selfie, accident).status_code == 500
+    assert query() == before
+
+    assert _submit(client, token, selfie, accident).status_code == 200
+    risk_score, hits, stored = query()
+    assert (hits, stored) == (RATE_LIMIT_PER_HOUR, RATE_LIMIT_PER_HOUR)
+    assert risk_score >= before[0] + 8
+
+
+def test_failed_request_keeps_files_shared_with_a_stored_report(tmp_path: Path, monkeypatch):
+    from fastapi import HTTPException
+
+    from app import main
+    from app.db import get_conn
+
+    selfie = tmp_path / 'selfie.jpg'
+    accident = tmp_path / 'accident.jpg'
+    _write_dummy_image(selfie, b'SHARSF')
+    _write_dummy_image(accident, b'SHARAC')
+    client = TestClient(app)
+    stored = _submit(client, _register_and_get_token(client, 'tester_shared_a@slsu.local'), selfie, accident)
+    assert stored.status_code == 200
+
+    def reject(*args, **kwargs):
+        raise HTTPException(status_code=400, detail='unreadable image')
+
+    monkeypatch.setattr(main, 'assess_report', reject)
+    token = _register_and_get_token(client, 'tester_shared_b@slsu.local')
+    assert _submit(client, token, selfie, accident).status_code == 400
+
+    with get_conn() as conn:
+        row = conn.execute('SELECT selfie_path, accident_path FROM reports WHERE id=?', (stored.json()['id'],)).fetchone()
+    assert (main.UPLOAD_DIR.parent / row['selfie_path']).exists()
+    assert (main.UPLOAD_DIR.parent / row['accident_path']).exists()
+
+
+def test_parallel_submissions_commit_every_risk_increment(tmp_path: Path, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from app import main
+    from app.config import SUSPICIOUS_VERIFICATION_THRESHOLD
+    from app.db import get_conn
+    from app.ratelimit import Policy, RateLimiter
+
+    monkeypatch.setattr(main, 'rate_limiter', RateLimiter({'user': Policy(1000, 3600)}, persist=False))
+    selfie = tmp_path / 'selfie.jpg'
+    accident = tmp_path / 'accident.jpg'
+    _write_dummy_image(selfie, b'PARASF')
+    _write_dummy_image(accident, b'PARAAC')
+
+    client = TestClient(app)
+    token = _register_and_get_token(client, 'tester_parallel@slsu.local')
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        responses = list(pool.map(lambda _: _submit(client, token, selfie, accident), range(24)))
+    elapsed = time.perf_counter() - started
+
+    assert [r.status_code for r in responses] == [200] * 24
+    assert elapsed < 30
+    weak = sum(r.json()['verification']['verification_score'] < SUSPICIOUS_VERIFICATION_THRESHOLD for r in responses)
+    with get_conn() as conn:
+        user = conn.execute("SELECT id, risk_score FROM users WHERE email='tester_parallel@slsu.local'").fetchone()
+        stored = conn.execute("SELECT COUNT(*) FROM reports WHERE user_id=?", (user['id'],)).fetchone()[0]
+    assert stored == 24
+    assert len({r.json()['id'] for r in responses}) == 24
+    # +12 per weak submission and +8 once, for the submission just under the hourly limit.
+    assert weak > 0
+    assert user['risk_score'] == 12 * weak + 8
+
+
+def test_pdf_export_job_reports_progress_and_streams_the_file(tmp_path: Path):
+    from app.db import get_conn
+
+    client = TestClient(app)
+    citizen = _register_and_get_token(client, 'tester_export@slsu.local')
+    selfie = tmp_path / 'selfie.jpg'
+    accident = tmp_path / 'accident.jpg'
+    _write_dummy_image(selfie, b'EXPTSF')
+    _write_dummy_image(accident, b'EXPTAC')
+    assert _submit(client, citizen, selfie, accident).status_code == 200
+
+    login = client.post('/auth/login', data={'email': 'responder@slsu.local', 'password': 'password123'})
+    headers = {'Authorization': f"Bearer {login.json()['token']}"}
+    assert client.post('/reports/exports', headers={'Authorization': f'Bearer {citizen}'}, json={}).status_code == 403
+    assert client.post('/reports/exports', headers=headers, json={'start': '2026-02-01', 'end': '2026-01-01'}).status_code == 400
+
+    created = client.post('/reports/exports', headers=headers, json={'status': ['Rejected', 'Needs Review']})
+    assert created.status_code == 202
+    job = created.json()
+    for _ in range(200):
+        job = client.get(job['status_url'], headers=headers).json()
+        if job['status'] in {'done', 'failed'}:
+            break
+        time.sleep(0.05)
+    assert job['status'] == 'done'
+    assert job['progress'] == 1.0
+    with get_conn() as conn:
+        expected = conn.execute("SELECT COUNT(*) FROM reports WHERE status IN ('Rejected','Needs Review')").fetchone()[0]
+    assert job['total'] == job['rendered'] == expected > 0
+
+    pdf = client.get(job['download_url'], headers=headers)
+    assert pdf.status_code == 200
+    assert pdf.headers['content-type'] == 'application/pdf'
+    assert pdf.content.startswith(b'%PDF')
+    assert client.get(job['download_url'], headers={'Authorization': f'Bearer {citizen}'}).status_code == 404
+
+    stored = export_manager.get(job['id'])
+    ttl, export_manager.ttl = export_manager.ttl, 0
+    try:
+        assert client.get(job['download_url'], headers=headers).status_code == 404
+        assert not stored.path.exists()
+    finally:
+        export_manager.ttl = ttl
+
+    legacy = client.get('/reports/export/pdf', headers=headers, params={'severity': ['Critical']})
+    assert legacy.status_code == 200
+    assert legacy.content.startswith(b'%PDF')
+
+
+def test_derivative_jobs_do_not_take_scoring_slots(tmp_path: Path, monkeypatch):
+    from app import main
+    from app.ingestion import IngestionQueue
+
+    scoring = IngestionQueue(workers=1, max_pending=1)
+    submitted = []
+    submit = scoring.submit
+    monkeypatch.setattr(scoring, 'submit', lambda fn, *args: submitted.append(fn.__name__) or submit(fn, *args))
+    monkeypatch.setattr(main, 'ingestion', scoring)
+    selfie = tmp_path / 'selfie.jpg'
+    accident = tmp_path / 'accident.jpg'
+    _write_dummy_image(selfie, b'SLOTSF')
+    _write_dummy_image(accident, b'SLOTAC')
+    client = TestClient(app)
+    token = _register_and_get_token(client, 'tester_slots@slsu.local')
+
+    resp = client.post(
+        '/reports',
+        headers={'Authorization': f'Bearer {token}'},
+        data={'emergency_type': 'Fire', 'description': 'Smoke from a store', 'latitude': '14.1', 'longitude': '121.1',
+              'async_processing': 'true'},
+        files={'selfie': ('s.jpg', selfie.read_bytes(), 'image/jpeg'),
+               'accident_photo': ('a.jpg', accident.read_bytes(), 'image/jpeg')},
+    )
+    assert resp.status_code == 200
+    assert submitted == ['process_report']
+    scoring.shutdown(wait=True)
+
+
+def test_upload_derivatives_are_small_and_served_immutable(tmp_path: Path):
+    import cv2
+    import numpy as np
+
+    rng = np.random.default_rng(20)
+    selfie = tmp_path / 'selfie.png'
+    accident = tmp_path / 'accident.png'
+    cv2.imwrite(str(selfie), rng.integers(0, 255, (900, 1200, 3), dtype=np.uint8))
+    cv2.imwrite(str(accident), rng.integers(0, 255, (900, 1200, 3), dtype=np.uint8))
+
+    client = TestClient(app)
+    assert _submit(client, _register_and_get_token(client, 'tester_thumbs@slsu.local'), selfie, accident).status_code == 200
+    login = client.post('/auth/login', data={'email': 'admin@slsu.local', 'password': 'password123'})
+    headers = {'Authorization': f"Bearer {login.json()['token']}"}
+    row = client.get('/reports?limit=1&fields=accident_url,accident_thumb_url,accident_medium_url', headers=headers).json()[0]
+    assert set(row) == {'accident_url', 'accident_thumb_url', 'accident_medium_url'}
+
+    original = client.get(row['accident_url'])
+    thumb = client.get(row['accident_thumb_url'])
+    medium = client.get(row['accident_medium_url'])
+    for resp in (original, thumb, medium):
+        assert resp.status_code == 200
+        assert resp.headers['cache-control'] == 'private, max-age=31536000, immutable'
+        assert resp.headers['etag']
+    assert thumb.headers['content-type'] == 'image/jpeg'
+    assert len(thumb.content) * 20 < len(original.content)
+    assert len(thumb.content) < len(medium.content) < len(original.content)
+
+    again = client.get(row['accident_thumb_url'], headers={'If-None-Match': thumb.headers['etag']})
+    assert again.status_code == 304
+    assert client.get('/uploads/thumb/missing.png').status_code == 404
+    assert client.get('/uploads/huge/' + row['accident_url'].rsplit('/', 1)[1]).status_code == 404
@@ -0,0 +1,171 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from app.audit import AuditEntryDropped, AuditWriter
+from app.db import get_conn, now_iso
+
+
+class CountingWriter(AuditWriter):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batches: list[int] = []
+
+    def _commit(self, batch):
+        self.batches.append(len(batch))
+        super()._commit(batch)
+
+
+def _count(action: str) -> int:
+    with get_conn() as conn:
+        return conn.execute("SELECT COUNT(*) FROM audit_logs WHERE action=?", (action,)).fetchone()[0]
+
+
+def test_async_mode_commits_in_batches_within_the_flush_interval():
+    writer = CountingWriter(mode="async", batch_size=50, flush_ms=100)
+    writer.start()
+    try:
+        for i in range(120):
+            writer.write((None, "audit_async", "127.0.0.1", None, f"n={i}", now_iso()))
+        deadline = time.monotonic() + 2
+        while _count("audit_async") < 120 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert _count("audit_async") == 120
+        assert sum(writer.batches) == 120 and len(writer.batches) <= 4
+    finally:
+        writer.shutdown()
+
+
+def test_group_mode_waits_for_a_shared_commit():
+    writer = CountingWriter(mode="group", batch_size=256, flush_ms=0)
+    writer.start()
+
+    def log(i: int) -> None:
+        writer.write((None, "audit_group", "127.0.0.1", None, f"n={i}", now_iso()))
+        # Durable by the time write() returns.
+        assert _count("audit_group") >= 1
+
+    threads = [threading.Thread(target=log, args=(i,)) for i in range(40)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    writer.shutdown()
+    assert _count("audit_group") == 40
+    assert sum(writer.batches) == 40
+
+
+def test_shutdown_flushes_everything_queued():
+    writer = AuditWriter(mode="async", batch_size=1000, flush_ms=60_000)
+    writer.start()
+    for i in range(25):
+        writer.write((None, "audit_shutdown", "127.0.0.1", None, f"n={i}", now_iso()))
+    assert _count("audit_shutdown") == 0
+    writer.shutdown()
+    assert _count("audit_shutdown") == 25
+
+
+class FlakyWriter(AuditWriter):
+    """Fails every commit until ``failing`` is cleared; the first one blocks until ``release``."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.failing = threading.Event()
+        self.failing.set()
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def _commit(self, batch):
+        if self.failing.is_set():
+            self.entered.set()
+            self.release.wait(5)
+            raise sqlite3.OperationalError("database is locked")
+        super()._commit(batch)
+
+
+def _details(action: str) -> list[str]:
+    with get_conn() as conn:
+        rows = conn.execute("SELECT details FROM audit_logs WHERE action=? ORDER BY id", (action,)).fetchall()
+    return [row["details"] for row in rows]
+
+
+def test_full_backlog_drops_the_oldest_entries_while_commits_fail():
+    writer = FlakyWriter(mode="async", batch_size=2, flush_ms=0, max_pending=4)
+    writer.start()
+    try:
+        writer.write((None, "audit_overflow", "127.0.0.1", None, "n=0", now_iso()))
+        assert writer.entered.wait(5)
+        # More than max_pending arrive while the oldest batch is failing.
+        for i in range(1, 10):
+            writer.write((None, "audit_overflow", "127.0.0.1", None, f"n={i}", now_iso()))
+        writer.release.set()
+        deadline = time.monotonic() + 5
+        while writer.pending != 4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert writer.pending == 4
+
+        writer.failing.clear()
+        writer.flush()
+        assert _details("audit_overflow") == [f"n={i}" for i in range(6, 10)]
+    finally:
+        writer.shutdown()
+
+
+def test_group_writers_of_dropped_entries_are_told_they_failed():
+    writer = FlakyWriter(mode="group", batch_size=2, flush_ms=0, max_pending=4)
+    writer.start()
+    outcomes: dict[int, str] = {}
+
+    def log(i: int) -> None:
+        try:
+            writer.write((None, "audit_group_shed", "127.0.0.1", None, f"n={i}", now_iso()))
+            outcomes[i] = "committed"
+        except AuditEntryDropped:
+            outcomes[i] = "dropped"
+
+    first = threading.Thread(target=log, args=(0,))
+    first.start()
+    assert writer.entered.wait(5)
+    threads = [threading.Thread(target=log, args=(i,)) for i in range(1, 10)]
+    for t in threads:
+        t.start()
+    # Nothing is shed while the first batch is in flight, so all nine queue up.
+    deadline = time.monotonic() + 5
+    while writer.pending < 9 and time.monotonic() < deadline:
+        time.sleep(0.005)
+    writer.failing.clear()
+    writer.release.set()
+    for t in [first, *threads]:
+        t.join(10)
+    writer.shutdown()
+
+    committed = {i for i, outcome in outcomes.items() if outcome == "committed"}
+    assert len(outcomes) == 10 and len(committed) == 4
+    assert sorted(_details("audit_group_shed")) == sorted(f"n={i}" for i in committed)
+    assert 0 not in committed
+
+
+def test_failed_flushes_back_off_while_writes_keep_arriving():
+    writer = FlakyWriter(mode="async", batch_size=1000, flush_ms=0)
+    writer.release.set()
+    writer.start()
+    attempts = []
+    commit = writer._commit
+
+    def counting(batch):
+        attempts.append(time.monotonic())
+        commit(batch)
+
+    writer._commit = counting
+    try:
+        stop = time.monotonic() + 1.2
+        while time.monotonic() < stop:
+            writer.write((None, "audit_backoff", "127.0.0.1", None, "", now_iso()))
+            time.sleep(0.005)
+        # One attempt, then one retry per 0.5 s backoff, however many writes arrived.
+        assert 2 <= len(attempts) <= 4
+    finally:
+        writer.failing.clear()
+        writer.shutdown()
@@ -0,0 +1,57 @@
+import asyncio
+import base64
+import json
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from app.auth import PasswordHasher, TokenCache, create_token, decode_token, token_cache, verify_password
+
+
+def test_decode_token_caches_verified_payloads_by_signature():
+    token = create_token({"user_id": 42, "role": "citizen"})
+    first = decode_token(token)
+    b64, sig = token.split(".")
+    assert token_cache.get(b64, sig, datetime.utcnow().timestamp()) == first
+
+    # A cached signature paired with a different body is still rejected.
+    forged = base64.urlsafe_b64encode(json.dumps({**first, "role": "admin"}).encode()).decode().rstrip("=")
+    with pytest.raises(HTTPException) as exc:
+        decode_token(f"{forged}.{sig}")
+    assert exc.value.status_code == 401
+
+    # Callers get their own copy.
+    decode_token(token)["role"] = "admin"
+    assert decode_token(token)["role"] == "citizen"
+
+
+def test_token_cache_is_bounded_and_honours_ttl_and_expiry():
+    cache = TokenCache(maxsize=2, ttl=10)
+    for i in range(3):
+        cache.put(f"body{i}", f"sig{i}", {"exp": 1_000}, now=0)
+    assert cache.get("body0", "sig0", now=1) is None
+    assert cache.get("body2", "sig2", now=1) == {"exp": 1_000}
+    assert cache.get("body2", "sig2", now=10) is None
+
+    cache.put("body", "sig", {"exp": 5}, now=0)
+    assert cache.get("body", "sig", now=5) is None
+
+
+def test_password_hasher_pool_and_backlog_limit():
+    hasher = PasswordHasher(workers=1, max_pending=2, niceness=0)
+    try:
+        hashed = asyncio.run(hasher.hash("s3cret"))
+        assert verify_password("s3cret", hashed)
+        assert asyncio.run(hasher.verify("s3cret", hashed)) is True
+        assert asyncio.run(hasher.verify("wrong", hashed)) is False
+
+        async def burst():
+            return await asyncio.gather(*(hasher.hash("x") for _ in range(5)), return_exceptions=True)
+
+        results = asyncio.run(burst())
+        refused = [r for r in results if isinstance(r, HTTPException)]
+        assert len(refused) == 3 and refused[0].status_code == 503
+        assert hasher.pending == 0
+    finally:
+        hasher.shutdown()
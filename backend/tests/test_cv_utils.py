@@ -0,0 +1,112 @@
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from app import cv_utils
+from app.cv_utils import (
+    BLUR_THRESHOLD,
+    ValidationService,
+    _blur_score,
+    _decode_scale,
+    _read_gray,
+    _validate_local,
+    validate_images_many,
+)
+
+
+def _write_image(path: Path, image: np.ndarray) -> Path:
+    cv2.imwrite(str(path), image)
+    return path
+
+
+def _pairs(tmp_path: Path) -> list[tuple[Path, Path]]:
+    rng = np.random.default_rng(7)
+    noisy = _write_image(tmp_path / "noisy.png", rng.integers(0, 255, (240, 320, 3), dtype=np.uint8))
+    other = _write_image(tmp_path / "other.png", rng.integers(0, 255, (240, 320, 3), dtype=np.uint8))
+    blank = _write_image(tmp_path / "blank.png", np.full((240, 320, 3), 128, dtype=np.uint8))
+    missing = tmp_path / "missing.jpg"
+    return [(noisy, other), (noisy, blank), (noisy, noisy), (missing, other)]
+
+
+def test_validate_images_many_matches_local_validation_in_order(tmp_path: Path):
+    pairs = _pairs(tmp_path)
+    expected = [_validate_local(selfie, accident) for selfie, accident in pairs]
+    assert validate_images_many(pairs) == expected
+    assert "accident_blank" in expected[1]["flags"]
+    assert "selfie_and_accident_same_file" in expected[2]["flags"]
+    assert expected[3]["flags"] == ["image_load_failed"]
+    assert expected[3]["decided_by"] == "load"
+
+
+def test_validation_service_pool_uses_worker_processes(tmp_path: Path):
+    pairs = _pairs(tmp_path)
+    service = ValidationService(workers=2)
+    try:
+        results = service.validate_many(pairs)
+    finally:
+        service.shutdown()
+    assert results == [_validate_local(selfie, accident) for selfie, accident in pairs]
+
+
+def test_staged_verifier_skips_face_check_when_score_cannot_pass(tmp_path: Path, monkeypatch):
+    noisy, _ = _pairs(tmp_path)[0]
+    monkeypatch.setattr(cv_utils, "SUSPICIOUS_VERIFICATION_THRESHOLD", 70.0)
+    monkeypatch.setattr(cv_utils, "_face_detector", lambda: (_ for _ in ()).throw(AssertionError("face check ran")))
+
+    result = _validate_local(noisy, noisy)
+    assert result["decided_by"] == "quality"
+    assert "face_check_skipped" in result["flags"]
+    assert result["suspicious"] and result["verification_score"] < 70
+
+
+class _OneFace:
+    def detectMultiScale(self, image, **kwargs):
+        return [(0, 0, 40, 40)]
+
+
+def test_face_still_counts_when_the_accident_photo_is_blurry(tmp_path: Path, monkeypatch):
+    noisy, _ = _pairs(tmp_path)[0]
+    gradient = np.tile(np.linspace(0, 255, 320, dtype=np.uint8), (240, 1))
+    blurry = _write_image(tmp_path / "blurry.png", cv2.merge([gradient] * 3))
+    monkeypatch.setattr(cv_utils, "_face_detector", lambda: _OneFace())
+
+    result = _validate_local(noisy, blurry)
+    assert result["decided_by"] == "face"
+    assert result["face_ok"] and not result["accident_image_ok"]
+    assert "accident_too_blurry" in result["flags"]
+    assert result["verification_score"] == 65.0
+
+
+def _scene(width: int, height: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    unit = max(width, height) / 640
+    image = np.full((height, width, 3), 120, dtype=np.uint8)
+    for _ in range(80):
+        x, y = int(rng.integers(0, width)), int(rng.integers(0, height))
+        corner = (int(x + unit * rng.integers(5, 80)), int(y + unit * rng.integers(5, 60)))
+        cv2.rectangle(image, (x, y), corner, rng.integers(0, 255, 3).tolist(), -1)
+    return np.clip(image + rng.normal(0, 4, (height, width, 1)), 0, 255).astype(np.uint8)
+
+
+def test_blur_decisions_match_full_resolution(tmp_path: Path):
+    full_resolution_threshold = 25
+    for width, height in [(960, 720), (1600, 1200), (2016, 1512)]:
+        for sigma in (0, 0.5, 1, 2):
+            for seed in (1, 2):
+                image = _scene(width, height, seed)
+                if sigma:
+                    image = cv2.GaussianBlur(image, (0, 0), sigma)
+                path = tmp_path / f"{width}-{sigma}-{seed}.jpg"
+                cv2.imwrite(str(path), image, [cv2.IMWRITE_JPEG_QUALITY, 90])
+
+                full = cv2.Laplacian(cv2.imread(str(path), cv2.IMREAD_GRAYSCALE), cv2.CV_64F).var()
+                reduced, _ = _read_gray(path)
+                assert (_blur_score(reduced) >= BLUR_THRESHOLD) == (full >= full_resolution_threshold), path.name
+
+
+def test_large_photos_are_decoded_at_reduced_resolution(tmp_path: Path):
+    big = _write_image(tmp_path / "big.png", np.zeros((3024, 4032, 3), dtype=np.uint8))
+    small = _write_image(tmp_path / "small.png", np.zeros((480, 640, 3), dtype=np.uint8))
+    assert _decode_scale(big, min_side=960) == 4
+    assert _decode_scale(small, min_side=960) == 1
@@ -0,0 +1,139 @@
+import sqlite3
+import threading
+from pathlib import Path
+
+from app.db import ConnectionPool, get_conn
+from app.migrations import MIGRATIONS, run_migrations
+
+
+def test_pooled_connections_use_wal_and_are_reused(tmp_path: Path):
+    pool = ConnectionPool(tmp_path / "pool.db", size=2)
+    conn = pool.acquire()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] > 0
+    pool.release(conn)
+    assert pool.acquire() is conn
+    pool.close()
+
+
+def test_pool_is_safe_across_threads(tmp_path: Path):
+    pool = ConnectionPool(tmp_path / "threads.db", size=4)
+    conn = pool.acquire()
+    conn.execute("CREATE TABLE hits (n INTEGER)")
+    conn.commit()
+    pool.release(conn)
+
+    def worker():
+        for _ in range(25):
+            c = pool.acquire()
+            try:
+                c.execute("INSERT INTO hits VALUES (1)")
+                c.commit()
+            finally:
+                pool.release(c)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    conn = pool.acquire()
+    assert conn.execute("SELECT COUNT(*) FROM hits").fetchone()[0] == 200
+    pool.release(conn)
+    assert pool._opened <= 4
+    pool.close()
+
+
+def test_get_conn_rolls_back_on_error():
+    try:
+        with get_conn() as conn:
+            conn.execute(
+                "INSERT INTO users (email,password_hash,created_at) VALUES ('rollback@slsu.local','x','now')"
+            )
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    with get_conn() as conn:
+        row = conn.execute("SELECT id FROM users WHERE email='rollback@slsu.local'").fetchone()
+    assert row is None
+
+
+def _plan(conn: sqlite3.Connection, sql: str, params: tuple = ()) -> list[str]:
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()]
+
+
+def test_hot_queries_do_not_full_scan():
+    conn = sqlite3.connect(":memory:")
+    run_migrations(conn)
+
+    searches = {
+        "my_reports": ("SELECT id, emergency_type, status FROM reports WHERE user_id=? ORDER BY id DESC", (1,)),
+    }
+    for name, (sql, params) in searches.items():
+        plan = _plan(conn, sql, params)
+        assert any(step.startswith("SEARCH reports USING") for step in plan), (name, plan)
+        assert not any("TEMP B-TREE" in step for step in plan), (name, plan)
+
+    # The rate limiter prunes expired hits and reloads the rest in time order on startup.
+    prune = _plan(conn, "DELETE FROM rate_limit_hits WHERE hit_at <= ?", (0.0,))
+    assert any("USING INDEX idx_rate_limit_hits_at" in step for step in prune), prune
+    load = _plan(conn, "SELECT policy, key, hit_at FROM rate_limit_hits ORDER BY hit_at")
+    assert not any("TEMP B-TREE" in step for step in load), load
+
+    group_bys = [
+        "SELECT emergency_type as name, COUNT(*) as value FROM reports GROUP BY emergency_type",
+        "SELECT severity_label as name, COUNT(*) as value FROM reports GROUP BY severity_label",
+        "SELECT status as name, COUNT(*) as value FROM reports GROUP BY status",
+        "SELECT substr(created_at,1,10) as day, COUNT(*) as value FROM reports GROUP BY day ORDER BY day",
+        "SELECT id,email,risk_score FROM users WHERE account_flagged=1 OR risk_score>=20 ORDER BY risk_score DESC",
+    ]
+    for sql in group_bys:
+        plan = _plan(conn, sql)
+        assert all("USING" in step for step in plan if step.startswith("SCAN")), (sql, plan)
+        assert not any("TEMP B-TREE FOR GROUP BY" in step for step in plan), (sql, plan)
+
+    audit_plan = _plan(conn, "SELECT * FROM audit_logs ORDER BY id DESC LIMIT 300")
+    assert not any("TEMP B-TREE" in step for step in audit_plan), audit_plan
+
+
+def test_migrations_are_versioned_and_normalize_legacy_timestamps(tmp_path: Path):
+    conn = sqlite3.connect(tmp_path / "legacy.db")
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT, password_hash TEXT, role TEXT, created_at TEXT)")
+    conn.execute("INSERT INTO users VALUES (1, 'old@slsu.local', 'x', 'citizen', '2024-05-01T08:15:30.123456')")
+    conn.commit()
+
+    assert run_migrations(conn) == [m.version for m in MIGRATIONS]
+    assert run_migrations(conn) == []
+
+    row = conn.execute("SELECT created_at, risk_score, account_flagged FROM users WHERE id=1").fetchone()
+    assert row == ("2024-05-01 08:15:30", 0, 0)
+    assert conn.execute("SELECT ? >= datetime('2024-05-01 08:15:29')", (row[0],)).fetchone()[0] == 1
+    conn.close()
+
+
+def test_rollup_migration_backfills_existing_reports(tmp_path: Path):
+    from app import rollups
+
+    conn = sqlite3.connect(tmp_path / "rollups.db")
+    run_migrations(conn, [m for m in MIGRATIONS if m.version < 9])
+    for i, (kind, status) in enumerate([("Fire", "Pending"), ("Fire", "Rejected"), ("Flood", "Pending")]):
+        conn.execute(
+            """
+            INSERT INTO reports (user_id, device_id, emergency_type, description, latitude, longitude, selfie_path,
+                accident_path, severity_label, severity_confidence, verification_score, face_ok, accident_image_ok,
+                suspicious, verification_flags, status, created_at, updated_at)
+            VALUES (1, 'd', ?, '', 0, 0, 's', 'a', 'High', 0.9, 80, 1, 1, 0, '[]', ?, ?, ?)
+            """,
+            (kind, status, f"2026-10-0{i + 1} 08:00:00", f"2026-10-0{i + 1} 08:00:00"),
+        )
+    conn.commit()
+
+    assert run_migrations(conn) == [m.version for m in MIGRATIONS if m.version >= 9]
+    backfilled = sorted(conn.execute("SELECT * FROM report_rollups").fetchall())
+    assert ("day", "2026-10-01", "type", "Fire", 1) in backfilled
+    rollups.rebuild(conn)
+    assert sorted(conn.execute("SELECT * FROM report_rollups").fetchall()) == backfilled
+    triggers = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='trigger'")}
+    assert {"trg_report_rollups_insert", "trg_report_rollups_update", "trg_report_rollups_delete"} <= triggers
+    conn.close()
@@ -0,0 +1,121 @@
+import asyncio
+import threading
+
+from fastapi.testclient import TestClient
+
+from app.events import BroadcastHub
+from app.main import app
+
+
+async def _take(stream, count: int) -> list[bytes]:
+    chunks = []
+    async for chunk in stream:
+        if chunk.startswith((b"retry:", b":")):
+            continue
+        chunks.append(chunk)
+        if len(chunks) == count:
+            break
+    return chunks
+
+
+def test_subscribers_receive_events_published_from_other_threads():
+    hub = BroadcastHub(buffer_size=16, heartbeat=5)
+
+    async def scenario():
+        streams = [hub.subscribe() for _ in range(50)]
+        # Prime each generator so it registers before anything is published.
+        for stream in streams:
+            await stream.__anext__()
+        readers = [asyncio.create_task(_take(stream, 1)) for stream in streams]
+        await asyncio.sleep(0)
+        threading.Thread(target=hub.publish, args=("report.created", {"report": {"id": 7}})).start()
+        results = await asyncio.wait_for(asyncio.gather(*readers), 5)
+        for stream in streams:
+            await stream.aclose()
+        return results
+
+    results = asyncio.run(scenario())
+    expected = f'id: {hub.boot}-1\nevent: report.created\ndata: {{"report":{{"id":7}}}}\n\n'.encode()
+    assert all(chunks == [expected] for chunks in results)
+    assert hub.subscribers == 0
+
+
+def test_resume_from_last_event_id_and_resync_after_eviction():
+    hub = BroadcastHub(buffer_size=4, heartbeat=5)
+    for i in range(10):
+        hub.publish("report.updated", {"i": i})
+
+    async def read(last_event_id, count):
+        stream = hub.subscribe(last_event_id)
+        chunks = await asyncio.wait_for(_take(stream, count), 5)
+        await stream.aclose()
+        return chunks
+
+    boot = hub.boot.encode()
+    resumed = asyncio.run(read(f"{hub.boot}-8", 1))
+    assert resumed[0].startswith(b"id: " + boot + b"-9\n") and b"id: " + boot + b"-10\n" in resumed[0]
+
+    lagged = asyncio.run(read(f"{hub.boot}-2", 2))
+    assert lagged[0].startswith(b"event: resync\n")
+    # Only what is still buffered follows, coalesced into one write.
+    assert lagged[1].count(b"id: ") == 4 and lagged[1].startswith(b"id: " + boot + b"-7\n")
+
+
+def test_ids_from_another_boot_get_resync():
+    previous = BroadcastHub(heartbeat=5)
+    for i in range(3):
+        previous.publish("report.updated", {"i": i})
+    hub = BroadcastHub(buffer_size=4, heartbeat=5)
+    hub.publish("report.updated", {"i": 0})
+    assert previous.boot != hub.boot
+
+    async def read(last_event_id):
+        stream = hub.subscribe(last_event_id)
+        chunks = await asyncio.wait_for(_take(stream, 1), 5)
+        await stream.aclose()
+        return chunks
+
+    # Same sequence number, different boot: must not be taken as "up to date".
+    for stale in (f"{previous.boot}-1", "1", "garbage"):
+        assert asyncio.run(read(stale))[0].startswith(b"event: resync\n")
+
+
+def test_subscriber_cap_and_close():
+    hub = BroadcastHub(max_subscribers=1, heartbeat=5)
+
+    async def scenario():
+        first = hub.subscribe()
+        await first.__anext__()
+        assert hub.subscribe() is None
+        drained = asyncio.create_task(_take(first, 1))
+        await asyncio.sleep(0)
+        hub.close()
+        return await asyncio.wait_for(drained, 5)
+
+    assert asyncio.run(scenario()) == []
+    assert hub.subscribers == 0
+
+
+def test_unstarted_stream_gives_its_slot_back():
+    hub = BroadcastHub(max_subscribers=1, heartbeat=5)
+    stream = hub.subscribe()
+    assert hub.subscribers == 1 and hub.subscribe() is None
+    del stream
+    assert hub.subscribers == 0
+
+
+def test_stream_endpoint_returns_503_at_capacity(monkeypatch):
+    from app import main
+
+    monkeypatch.setattr(main, 'report_events', BroadcastHub(max_subscribers=0))
+    client = TestClient(app)
+    token = client.post('/auth/login', data={'email': 'responder@slsu.local', 'password': 'password123'}).json()['token']
+    resp = client.get('/reports/stream', params={'token': token})
+    assert resp.status_code == 503
+
+
+def test_stream_endpoint_is_staff_only():
+    client = TestClient(app)
+    assert client.get('/reports/stream').status_code == 401
+    citizen = client.post('/auth/register', data={'email': 'tester_stream@slsu.local', 'password': 'password123'})
+    assert client.get('/reports/stream', params={'token': citizen.json()['token']}).status_code == 403
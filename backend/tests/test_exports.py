@@ -0,0 +1,80 @@
+import time
+from datetime import date
+from pathlib import Path
+
+from app.exports import ExportFilters, ExportManager, render_summary
+from app.storage import derivative
+
+
+def _photo(path: Path, seed: int) -> Path:
+    import cv2
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    cv2.imwrite(str(path), rng.integers(0, 255, (1200, 1600, 3), dtype=np.uint8))
+    return path
+
+
+def test_filters_build_an_inclusive_date_range():
+    where, args = ExportFilters(date(2026, 1, 1), date(2026, 1, 31), ("Critical",), ()).where()
+    assert where == "r.created_at >= ? AND r.created_at < ? AND r.severity_label IN (?)"
+    assert args == ["2026-01-01", "2026-02-01", "Critical"]
+    assert ExportFilters().where() == ("1", [])
+
+
+def test_thumbnails_are_small_and_generated_once(tmp_path: Path):
+    from app.config import UPLOAD_DIR
+
+    source = _photo(UPLOAD_DIR / "thumbtest_source.jpg", 3)
+    thumb = derivative(source, "thumb")
+    assert thumb is not None and thumb.stat().st_size < source.stat().st_size
+    mtime = thumb.stat().st_mtime_ns
+    assert derivative(source, "thumb") == thumb
+    assert thumb.stat().st_mtime_ns == mtime
+    assert derivative(UPLOAD_DIR / "missing.jpg", "thumb") is None
+
+
+def test_render_summary_embeds_thumbnails(tmp_path: Path):
+    from app.config import UPLOAD_DIR
+
+    photo = _photo(UPLOAD_DIR / "rendertest_photo.jpg", 5)
+    reports = [
+        {
+            "id": i, "emergency_type": "Fire", "severity_label": "Critical", "status": "Pending",
+            "verification_score": 80.0, "created_at": "2026-01-01 00:00:00", "latitude": 14.1, "longitude": 121.1,
+            "selfie_path": f"uploads/{photo.name}", "accident_path": f"uploads/{photo.name}", "reporter_email": "a@b",
+        }
+        for i in range(40)
+    ]
+    ticks = []
+    target = tmp_path / "out.pdf"
+    assert render_summary(iter(reports), target, lambda: ticks.append(1)) == 40
+    assert len(ticks) == 40
+    # One shared image object, not 80 copies of the photo.
+    assert target.stat().st_size < photo.stat().st_size
+
+
+def test_expired_jobs_and_their_files_are_removed(tmp_path: Path):
+    manager = ExportManager(directory=tmp_path, ttl=60)
+    manager.start()
+    job = manager.submit(user_id=1, filters=ExportFilters(status=("No Such Status",)))
+    job.future.result(timeout=30)
+    assert job.status == "done" and job.total == 0 and job.path.exists()
+
+    assert manager.expire(now=time.time()) == 0
+    assert manager.expire(now=time.time() + 61) == 1
+    assert manager.get(job.id) is None
+    assert not job.path.exists()
+    manager.shutdown()
+
+
+def test_lookups_expire_finished_jobs_without_new_submissions(tmp_path: Path):
+    manager = ExportManager(directory=tmp_path, ttl=0)
+    manager.start()
+    job = manager.submit(user_id=1, filters=ExportFilters(status=("No Such Status",)))
+    job.future.result(timeout=30)
+    assert job.path.exists()
+
+    assert manager.get(job.id) is None
+    assert not job.path.exists()
+    manager.shutdown()
@@ -0,0 +1,53 @@
+import io
+import random
+
+from fastapi import UploadFile
+
+from app.db import get_conn
+from app import image_index
+from app.image_index import BKTree, ImageIndex, cached_verification, hamming, store_verification
+from app.storage import save_upload
+
+
+def test_bk_tree_search_matches_brute_force():
+    rng = random.Random(3)
+    hashes = [rng.getrandbits(64) for _ in range(2000)]
+    # Near-duplicates of the first few hashes.
+    hashes += [h ^ (1 << rng.randrange(64)) for h in hashes[:20]]
+    tree: BKTree[int] = BKTree()
+    for idx, value in enumerate(hashes):
+        tree.add(value, idx)
+    assert len(tree) == len(hashes)
+
+    for probe in hashes[:30] + [rng.getrandbits(64) for _ in range(10)]:
+        expected = sorted((hamming(probe, v), i) for i, v in enumerate(hashes) if hamming(probe, v) <= 6)
+        assert sorted(tree.search(probe, 6)) == expected
+
+
+def test_identical_uploads_are_stored_once():
+    payload = b"same-photo" * 1000
+    first = save_upload(UploadFile(io.BytesIO(payload), filename="a.jpg"), "accident")
+    second = save_upload(UploadFile(io.BytesIO(payload), filename="b.jpg"), "accident")
+    assert first.path == second.path
+    assert first.path.name == f"{first.sha256}.jpg"
+    assert second.created is False
+    first.path.unlink()
+
+
+def test_stored_dhash_is_looked_up_by_content():
+    with get_conn() as conn:
+        ImageIndex.record(conn, 987654, "c" * 64, 0x0123456789ABCDEF)
+    assert ImageIndex.stored_dhash("c" * 64) == 0x0123456789ABCDEF
+    assert ImageIndex.stored_dhash("d" * 64) is None
+    assert ImageIndex.stored_dhash(None) is None
+
+
+def test_cached_verdicts_from_another_validator_version_are_ignored(monkeypatch):
+    selfie, accident = "e" * 64, "f" * 64
+    store_verification(selfie, accident, {"score": 80.0, "flags": []})
+    assert cached_verification(selfie, accident)["score"] == 80.0
+
+    monkeypatch.setattr(image_index, "VALIDATOR_VERSION", image_index.VALIDATOR_VERSION + 1)
+    assert cached_verification(selfie, accident) is None
+    store_verification(selfie, accident, {"score": 55.0, "flags": []})
+    assert cached_verification(selfie, accident)["score"] == 55.0
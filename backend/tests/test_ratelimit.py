@@ -0,0 +1,59 @@
+from app.db import get_conn
+from app.ratelimit import Policy, RateLimiter
+
+
+def test_sliding_window_is_exact_and_reports_retry_after():
+    limiter = RateLimiter({"user": Policy(3, 60)}, persist=False)
+    assert [limiter.hit({"user": "1"}, now=t).counts["user"] for t in (0, 10, 20)] == [0, 1, 2]
+
+    blocked = limiter.hit({"user": "1"}, now=59)
+    assert not blocked.allowed and blocked.blocked_by == "user"
+    assert blocked.retry_after == 1
+    # The hit at t=0 has left the window one second later.
+    assert limiter.hit({"user": "1"}, now=60).allowed
+    assert limiter.hit({"user": "2"}, now=60).allowed
+
+
+def test_a_blocked_request_is_not_counted_against_other_keys():
+    limiter = RateLimiter({"user": Policy(5, 60), "ip": Policy(2, 60)}, persist=False)
+    assert limiter.hit({"user": "a", "ip": "10.0.0.1"}, now=0).allowed
+    assert limiter.hit({"user": "b", "ip": "10.0.0.1"}, now=1).allowed
+    decision = limiter.hit({"user": "c", "ip": "10.0.0.1"}, now=2)
+    assert decision.blocked_by == "ip"
+    assert limiter.hit({"user": "c", "ip": None}, now=3).counts == {"user": 0}
+
+
+def test_persisted_hits_survive_a_restart():
+    with get_conn() as conn:
+        conn.execute("DELETE FROM rate_limit_hits WHERE key LIKE 'persist-%'")
+    policies = {"user": Policy(2, 3600)}
+    first = RateLimiter(policies, persist=True)
+    first.hit({"user": "persist-1"}, now=1_000)
+    first.hit({"user": "persist-1"}, now=1_010)
+
+    restarted = RateLimiter(policies, persist=True)
+    assert restarted.load(now=1_020) >= 2
+    assert restarted.hit({"user": "persist-1"}, now=1_030).blocked_by == "user"
+    restarted.load(now=10_000)
+    assert restarted.hit({"user": "persist-1"}, now=10_000).allowed
+
+
+def test_check_records_nothing_and_release_gives_a_hit_back():
+    limiter = RateLimiter({"user": Policy(1, 60)}, persist=False)
+    assert limiter.check({"user": "1"}, now=0).allowed
+    assert limiter.check({"user": "1"}, now=1).allowed
+    taken = limiter.hit({"user": "1"}, now=2)
+    assert taken.at == 2
+    assert limiter.hit({"user": "1"}, now=3).blocked_by == "user"
+    limiter.release({"user": "1"}, taken.at)
+    assert limiter.hit({"user": "1"}, now=4).allowed
+
+
+def test_parallel_hits_at_the_limit_let_exactly_limit_through():
+    from concurrent.futures import ThreadPoolExecutor
+
+    limiter = RateLimiter({"user": Policy(3, 60)}, persist=False)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        decisions = list(pool.map(lambda _: limiter.hit({"user": "1"}), range(40)))
+    assert sum(d.allowed for d in decisions) == 3
+    assert sorted(d.counts["user"] for d in decisions if d.allowed) == [0, 1, 2]
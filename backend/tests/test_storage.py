@@ -0,0 +1,68 @@
+import hashlib
+import io
+import os
+import time
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from app.config import UPLOAD_DIR
+from app.db import get_conn
+from app.image_index import ImageIndex
+from app.storage import DERIVED_DIR, collect_garbage, save_upload
+
+
+def test_save_upload_streams_and_hashes_while_writing():
+    payload = b"emergency-photo" * 50_000
+    saved = save_upload(UploadFile(io.BytesIO(payload), filename="scene.JPG"), "accident")
+    assert saved.path.suffix == ".jpg"
+    assert saved.path.read_bytes() == payload
+    assert saved.size == len(payload)
+    assert saved.sha256 == hashlib.sha256(payload).hexdigest()
+    saved.path.unlink()
+
+
+def test_save_upload_rejects_oversized_files_without_leftovers():
+    before = set(UPLOAD_DIR.iterdir())
+    with pytest.raises(HTTPException) as exc:
+        save_upload(UploadFile(io.BytesIO(b"x" * 4096), filename="big.jpg"), "selfie", max_bytes=1024)
+    assert exc.value.status_code == 413
+    assert set(UPLOAD_DIR.iterdir()) == before
+
+
+def _aged(path, seconds=7200):
+    old = time.time() - seconds
+    os.utime(path, (old, old))
+    return path
+
+
+def test_collect_garbage_removes_only_old_unreferenced_uploads():
+    orphan = save_upload(UploadFile(io.BytesIO(b"orphan" * 100), filename="o.jpg"), "selfie")
+    kept = save_upload(UploadFile(io.BytesIO(b"kept" * 100), filename="k.jpg"), "accident")
+    fresh = save_upload(UploadFile(io.BytesIO(b"fresh" * 100), filename="f.jpg"), "selfie")
+    leftover = UPLOAD_DIR / "selfie_crashed.jpg.part"
+    leftover.write_bytes(b"partial")
+    DERIVED_DIR.mkdir(parents=True, exist_ok=True)
+    orphan_thumb = DERIVED_DIR / f"{orphan.sha256}_160.jpg"
+    orphan_thumb.write_bytes(b"thumb")
+    with get_conn() as conn:
+        ImageIndex.record(conn, 876543, kept.sha256, 1)
+    for path in (orphan.path, kept.path, leftover):
+        _aged(path)
+
+    assert collect_garbage(grace_seconds=3600) == 1
+    assert not orphan.path.exists() and not orphan_thumb.exists() and not leftover.exists()
+    assert kept.path.exists() and fresh.path.exists()
+    kept.path.unlink()
+    fresh.path.unlink()
+
+
+def test_reusing_an_upload_protects_it_from_collection():
+    payload = b"shared" * 100
+    first = save_upload(UploadFile(io.BytesIO(payload), filename="a.jpg"), "selfie")
+    _aged(first.path)
+    save_upload(UploadFile(io.BytesIO(payload), filename="b.jpg"), "selfie")
+
+    assert collect_garbage(grace_seconds=3600) == 0
+    assert first.path.exists()
+    first.path.unlink()
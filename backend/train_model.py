@@ -1,6 +1,29 @@
-from app.ai import SeverityModel
+import argparse
+import json
+import sys
+
+from app.ai import METRICS_INVALID_EXIT, SeverityModel
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the severity model and export its compiled scorer.")
+    parser.add_argument(
+        "--export-only", action="store_true", help="re-export data/severity_scorer/ from the existing data/model.pkl"
+    )
+    parser.add_argument(
+        "--metrics", action="store_true", help="print evaluation metrics as JSON instead of training"
+    )
+    parser.add_argument("--cv", type=int, default=None, help="with --metrics: stratified k-fold instead of holdout")
+    args = parser.parse_args()
     model = SeverityModel()
-    model.train_and_save()
-    print("Model trained and saved to data/model.pkl")
+    if args.metrics:
+        try:
+            print(json.dumps(model.evaluate(cv_folds=args.cv)))
+        except ValueError as exc:
+            print(exc, file=sys.stderr)
+            sys.exit(METRICS_INVALID_EXIT)
+    elif args.export_only:
+        model.export_compiled()
+        print("Compiled scorer re-exported to data/severity_scorer/")
+    else:
+        model.train_and_save()
+        print("Model trained and saved to data/model.pkl (compiled scorer in data/severity_scorer/)")
@@ -0,0 +1,74 @@
+"""Plans per second: a loop over ``build_plan`` vs ``build_plans``.
+
+Builds a system with ``--units`` units and ``--zones`` risk zones around one
+province, queues ``--reports`` incidents as after a typhoon, and plans them
+with a plain loop, with ``build_plans`` in process and with ``build_plans``
+on ``--workers`` processes (default: one per CPU; the time includes starting
+the pool). Checks that every run returns the same plans. Run from the
+repository root::
+
+    PYTHONPATH=src python -m benchmarks.bench_build_plans --reports 10000 --units 5000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import time
+
+from emergency_ai.models import Coordinates, IncidentReport, ResponseUnit, RiskZone
+from emergency_ai.system import EmergencyResponseSystem
+
+CALLER_TEXTS = [
+    "Flood water rising fast, family trapped on the roof, grandmother not breathing.",
+    "Landslide blocked the road, two people missing.",
+    "Power outage and a gas leak near the bridge.",
+    "Fire spreading to the next house, heavy smoke.",
+    "Man collapsed at the evacuation center, possible stroke.",
+    "Looting reported, suspect has a weapon.",
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reports", type=int, default=10000)
+    parser.add_argument("--units", type=int, default=5000)
+    parser.add_argument("--zones", type=int, default=5000)
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    rng = random.Random(6)
+
+    def spot() -> Coordinates:
+        return Coordinates(13.9 + rng.uniform(-1, 1), 121.6 + rng.uniform(-1, 1))
+
+    capabilities = ["Paramedic", "Ambulance", "Fire Engine", "Hazmat", "Boat Rescue", "Search and Rescue", "Tactical"]
+    units = [
+        ResponseUnit(f"U-{i}", "mixed", spot(), rng.choice([30, 50, 70]), rng.sample(capabilities, 2), rng.random() > 0.2)
+        for i in range(args.units)
+    ]
+    zones = [RiskZone(f"Z-{i}", spot(), rng.choice([0.5, 1.5, 4.0]), "flood", 1.0) for i in range(args.zones)]
+    reports = [IncidentReport(f"INC-{i}", rng.choice(CALLER_TEXTS), spot()) for i in range(args.reports)]
+    system = EmergencyResponseSystem(risk_zones=zones, units=units)
+
+    runs = {
+        "build_plan loop": lambda: [system.build_plan(report) for report in reports],
+        "build_plans": lambda: system.build_plans(reports, chunk_size=args.chunk_size),
+        f"build_plans x{args.workers}": lambda: system.build_plans(
+            reports, workers=args.workers, chunk_size=args.chunk_size
+        ),
+    }
+    results = {}
+    for label, run in runs.items():
+        start = time.perf_counter()
+        results[label] = run()
+        elapsed = time.perf_counter() - start
+        print(f"{label:18s} {elapsed:7.2f} s  {args.reports / elapsed:8.0f} plans/s")
+    expected = results["build_plan loop"]
+    assert all(plans == expected for plans in results.values()), "plans differ"
+    print("identical plans")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Triage throughput: per-keyword loops vs the compiled ``KeywordMatcher``.
+
+Runs ``--texts`` generated caller messages through the keyword logic the
+engine used before (a loop over every keyword with ``in`` tests against the
+token set and the joined text) and through ``LocationIntelligenceEngine.triage``,
+checks the results match, and prints the time per message. It runs once with
+the built-in dictionaries and once with ``--terms`` synthetic keywords per
+dictionary. Run from the repository root::
+
+    PYTHONPATH=src python -m benchmarks.bench_triage_matcher --texts 5000 --terms 5000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from collections import Counter
+
+from emergency_ai.intelligence import INCIDENT_KEYWORDS, SEVERITY_SIGNALS, LocationIntelligenceEngine
+from emergency_ai.models import Coordinates, IncidentReport
+
+
+def legacy_triage(text: str, incident_keywords, signals) -> tuple[str, int, list[str]]:
+    clean = "".join(ch.lower() if ch.isalnum() or ch.isspace() else " " for ch in text)
+    tokens = [t for t in clean.split() if t]
+
+    counts = Counter()
+    token_set = set(tokens)
+    joined_text = " ".join(tokens)
+    for category, keywords in incident_keywords.items():
+        for keyword in keywords:
+            if " " in keyword and keyword in joined_text:
+                counts[category] += 2
+            elif keyword in token_set:
+                counts[category] += 1
+    incident_type = counts.most_common(1)[0][0] if counts else "medical"
+
+    token_set = set(tokens)
+    joined_text = " ".join(tokens)
+    score, urgent = 3, []
+    for signal in signals["critical"]:
+        if (" " in signal and signal in joined_text) or signal in token_set:
+            score += 4
+            urgent.append(signal)
+    for signal in signals["high"]:
+        if signal in token_set:
+            score += 2
+            urgent.append(signal)
+    for signal in signals["moderate"]:
+        if signal in token_set:
+            score += 1
+    return incident_type, min(10, max(1, round(score))), sorted(set(urgent))
+
+
+def synthetic_dictionaries(rng: random.Random, terms: int):
+    def word() -> str:
+        return "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 9)))
+
+    def term() -> str:
+        return word() if rng.random() < 0.7 else f"{word()} {word()}"
+
+    incident_keywords = {category: {term() for _ in range(terms // 5)} for category in INCIDENT_KEYWORDS}
+    signals = {level: {term() for _ in range(terms // 3)} for level in SEVERITY_SIGNALS}
+    return incident_keywords, signals
+
+
+def run(label: str, engine: LocationIntelligenceEngine, texts: list[str], incident_keywords, signals) -> None:
+    reports = [IncidentReport(f"INC-{i}", text, Coordinates(14.0, 121.0)) for i, text in enumerate(texts)]
+
+    start = time.perf_counter()
+    expected = [legacy_triage(text, incident_keywords, signals) for text in texts]
+    legacy_ms = (time.perf_counter() - start) / len(texts) * 1000
+
+    start = time.perf_counter()
+    results = [engine.triage(report) for report in reports]
+    matcher_ms = (time.perf_counter() - start) / len(texts) * 1000
+
+    assert [(r.incident_type, r.severity_score, r.urgent_signals) for r in results] == expected, "results differ"
+    print(f"{label:22s} loops {legacy_ms:8.3f} ms/text   matcher {matcher_ms:8.3f} ms/text")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--texts", type=int, default=5000)
+    parser.add_argument("--terms", type=int, default=5000)
+    args = parser.parse_args()
+
+    rng = random.Random(4)
+    filler = "the a near my our street house caller says please help quickly now there is".split()
+
+    def texts_from(vocabulary: list[str]) -> list[str]:
+        return [
+            " ".join(rng.choice(vocabulary if rng.random() < 0.2 else filler) for _ in range(rng.randint(8, 60))) + "!"
+            for _ in range(args.texts)
+        ]
+
+    builtin = sorted(set().union(*INCIDENT_KEYWORDS.values(), *SEVERITY_SIGNALS.values()))
+    run("built-in dictionaries", LocationIntelligenceEngine(), texts_from(builtin), INCIDENT_KEYWORDS, SEVERITY_SIGNALS)
+
+    incident_keywords, signals = synthetic_dictionaries(rng, args.terms)
+    vocabulary = sorted(set().union(*incident_keywords.values(), *signals.values()))
+    engine = LocationIntelligenceEngine(incident_keywords, signals)
+    run(f"{args.terms} terms each", engine, texts_from(vocabulary), incident_keywords, signals)
+
+
+if __name__ == "__main__":
+    main()
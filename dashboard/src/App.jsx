@@ -14,10 +14,17 @@ import {
   YAxis,
   Cell,
 } from 'recharts'
-import { api, API_BASE } from './api'
+import { api, apiPage, API_BASE } from './api'
 
-const statuses = ['Pending', 'Needs Review', 'Verified', 'Dispatched', 'Resolved', 'Rejected']
+const statuses = ['Processing', 'Pending', 'Needs Review', 'Verified', 'Dispatched', 'Resolved', 'Rejected']
 const severityColors = { Low: '#2bb673', Medium: '#f6a623', Critical: '#e84a5f' }
+const PAGE_SIZE = 100
+// Only the columns the table and detail modal render.
+const REPORT_FIELDS = [
+  'id', 'created_at', 'reporter_email', 'emergency_type', 'description', 'latitude', 'longitude',
+  'severity_label', 'severity_confidence', 'verification_score', 'suspicious', 'status', 'selfie_url', 'accident_url',
+  'accident_thumb_url', 'selfie_medium_url', 'accident_medium_url',
+].join(',')
 
 function Login({ onLogin }) {
   const [email, setEmail] = useState('responder@slsu.local')
@@ -65,19 +72,66 @@ function MetricCard({ label, value }) {
 export default function App() {
   const [auth, setAuth] = useState(null)
   const [reports, setReports] = useState([])
-  const [analytics, setAnalytics] = useState({ reports_per_type: [], severity_distribution: [], reports_over_time: [], flagged_users: [] })
+  const [analytics, setAnalytics] = useState({
+    reports_per_type: [], severity_distribution: [], status_distribution: [], reports_over_time: [], flagged_users: [],
+  })
+  const [nextCursor, setNextCursor] = useState(null)
+  const [syncCursor, setSyncCursor] = useState(null)
   const [selected, setSelected] = useState(null)
   const [filters, setFilters] = useState({ severity: '', status: '', emergency_type: '' })
   const [error, setError] = useState('')
+  const [exportProgress, setExportProgress] = useState(null)
 
   const loadData = async (token = auth?.token) => {
     if (!token) return
     try {
-      const [r, a] = await Promise.all([
-        api('/reports', { token }),
+      const [page, a] = await Promise.all([
+        apiPage(`/reports?limit=${PAGE_SIZE}&fields=${REPORT_FIELDS}`, { token }),
         api('/reports/analytics', { token }),
       ])
-      setReports(r)
+      setReports(page.data)
+      setNextCursor(page.nextCursor)
+      setSyncCursor(page.syncCursor)
+      setAnalytics(a)
+    } catch (err) {
+      setError(err.message)
+    }
+  }
+
+  const loadMore = async () => {
+    if (!auth?.token || !nextCursor) return
+    try {
+      const page = await apiPage(`/reports?limit=${PAGE_SIZE}&fields=${REPORT_FIELDS}&cursor=${nextCursor}`, { token: auth.token })
+      setReports((current) => [...current, ...page.data])
+      setNextCursor(page.nextCursor)
+    } catch (err) {
+      setError(err.message)
+    }
+  }
+
+  // Pull only what changed since the last sync and merge it in; analytics is
+  // revalidated with its ETag, so an idle refresh costs two near-empty round trips.
+  const syncChanges = async () => {
+    if (!auth?.token || syncCursor === null) return loadData()
+    try {
+      let since = syncCursor
+      let changed = []
+      let deleted = []
+      for (;;) {
+        const feed = await api(`/reports/changes?since=${since}&fields=${REPORT_FIELDS}`, { token: auth.token })
+        changed = changed.concat(feed.reports)
+        deleted = deleted.concat(feed.deleted)
+        since = feed.cursor
+        if (!feed.has_more) break
+      }
+      const a = await api('/reports/analytics', { token: auth.token })
+      setReports((current) => {
+        const byId = new Map(current.map((r) => [r.id, r]))
+        changed.forEach((r) => byId.set(r.id, r))
+        deleted.forEach((id) => byId.delete(id))
+        return [...byId.values()].sort((x, y) => y.id - x.id)
+      })
+      setSyncCursor(since)
       setAnalytics(a)
     } catch (err) {
       setError(err.message)
@@ -88,19 +142,81 @@ export default function App() {
     if (auth?.token) loadData(auth.token)
   }, [auth?.token])
 
+  // Live feed: new and updated reports are pushed as they happen. EventSource
+  // reconnects on its own and resumes from the last event id it saw.
+  useEffect(() => {
+    if (!auth?.token) return undefined
+    const source = new EventSource(`${API_BASE}/reports/stream?token=${encodeURIComponent(auth.token)}`)
+    // The KPI cards read analytics; refetch it once a burst of events has passed.
+    let analyticsTimer = null
+    const refreshAnalytics = () => {
+      clearTimeout(analyticsTimer)
+      analyticsTimer = setTimeout(() => {
+        api('/reports/analytics', { token: auth.token }).then(setAnalytics).catch((err) => setError(err.message))
+      }, 1000)
+    }
+    const upsert = (event) => {
+      const { report } = JSON.parse(event.data)
+      setReports((current) => {
+        const rest = current.filter((r) => r.id !== report.id)
+        return [...rest, report].sort((x, y) => y.id - x.id)
+      })
+      setSelected((current) => (current && current.id === report.id ? { ...current, ...report } : current))
+      refreshAnalytics()
+    }
+    source.addEventListener('report.created', upsert)
+    source.addEventListener('report.updated', upsert)
+    source.addEventListener('resync', () => syncChanges())
+    return () => {
+      clearTimeout(analyticsTimer)
+      source.close()
+    }
+  }, [auth?.token])
+
+  // Reports submitted with async processing are scored in the background; poll until they settle.
+  useEffect(() => {
+    if (!auth?.token || selected?.status !== 'Processing') return undefined
+    const timer = setInterval(async () => {
+      try {
+        const detail = await api(`/reports/${selected.id}`, { token: auth.token })
+        if (!detail.processing) {
+          clearInterval(timer)
+          await syncChanges()
+          setSelected((current) => current && current.id === detail.id
+            ? {
+                ...current,
+                status: detail.status,
+                severity_label: detail.severity.label,
+                severity_confidence: detail.severity.confidence,
+                verification_score: detail.verification.verification_score,
+                suspicious: detail.verification.suspicious,
+              }
+            : current)
+        }
+      } catch (err) {
+        clearInterval(timer)
+        setError(err.message)
+      }
+    }, 2000)
+    return () => clearInterval(timer)
+  }, [auth?.token, selected?.id, selected?.status])
+
   const filtered = useMemo(() => reports.filter((r) => {
     return (!filters.severity || r.severity_label === filters.severity)
       && (!filters.status || r.status === filters.status)
       && (!filters.emergency_type || r.emergency_type.toLowerCase().includes(filters.emergency_type.toLowerCase()))
   }), [reports, filters])
 
+  // KPIs cover every report, not just the loaded pages, so they come from the analytics rollups.
   const metrics = useMemo(() => {
-    const total = reports.length
-    const critical = reports.filter((r) => r.severity_label === 'Critical').length
-    const pending = reports.filter((r) => ['Pending', 'Needs Review'].includes(r.status)).length
-    const resolved = reports.filter((r) => r.status === 'Resolved').length
+    const count = (rows, names) => (rows || []).filter((r) => names.includes(r.name)).reduce((sum, r) => sum + r.value, 0)
+    const byStatus = analytics.status_distribution || []
+    const total = byStatus.reduce((sum, r) => sum + r.value, 0)
+    const critical = count(analytics.severity_distribution, ['Critical'])
+    const pending = count(byStatus, ['Processing', 'Pending', 'Needs Review'])
+    const resolved = count(byStatus, ['Resolved'])
     return { total, critical, pending, resolved }
-  }, [reports])
+  }, [analytics])
 
   const setStatus = async (id, statusLabel) => {
     const form = new FormData()
@@ -110,23 +226,42 @@ export default function App() {
       headers: { Authorization: `Bearer ${auth.token}` },
       body: form,
     })
-    await loadData()
+    await syncChanges()
   }
 
+  // Exports render on the server as a background job; poll its progress, then download the file.
   const exportPdf = async () => {
-    const res = await fetch(`${API_BASE}/reports/export/pdf`, {
-      headers: { Authorization: `Bearer ${auth.token}` },
-    })
-    if (!res.ok) throw new Error('Export failed')
-    const blob = await res.blob()
-    const url = URL.createObjectURL(blob)
-    const a = document.createElement('a')
-    a.href = url
-    a.download = 'emergency_reports_summary.pdf'
-    document.body.appendChild(a)
-    a.click()
-    a.remove()
-    URL.revokeObjectURL(url)
+    try {
+      let job = await api('/reports/exports', {
+        method: 'POST',
+        token: auth.token,
+        body: { severity: filters.severity ? [filters.severity] : [], status: filters.status ? [filters.status] : [] },
+      })
+      setExportProgress(0)
+      while (job.status === 'queued' || job.status === 'running') {
+        await new Promise((resolve) => setTimeout(resolve, 1000))
+        job = await api(job.status_url, { token: auth.token })
+        setExportProgress(job.progress)
+      }
+      if (job.status !== 'done') throw new Error(job.error || 'Export failed')
+      const res = await fetch(`${API_BASE}${job.download_url}`, {
+        headers: { Authorization: `Bearer ${auth.token}` },
+      })
+      if (!res.ok) throw new Error('Export failed')
+      const blob = await res.blob()
+      const url = URL.createObjectURL(blob)
+      const a = document.createElement('a')
+      a.href = url
+      a.download = 'emergency_reports_summary.pdf'
+      document.body.appendChild(a)
+      a.click()
+      a.remove()
+      URL.revokeObjectURL(url)
+    } catch (err) {
+      setError(err.message)
+    } finally {
+      setExportProgress(null)
+    }
   }
 
   if (!auth) return <Login onLogin={setAuth} />
@@ -149,8 +284,10 @@ export default function App() {
         <header className="topbar">
           <h1>AI-Powered Emergency Response Dashboard</h1>
           <div className="right-actions">
-            <button onClick={() => loadData()}>Refresh</button>
-            <button onClick={exportPdf}>Export as PDF</button>
+            <button onClick={() => syncChanges()}>Refresh</button>
+            <button onClick={exportPdf} disabled={exportProgress !== null}>
+              {exportProgress === null ? 'Export as PDF' : `Exporting… ${Math.round(exportProgress * 100)}%`}
+            </button>
           </div>
         </header>
 
@@ -218,12 +355,13 @@ export default function App() {
             <table>
               <thead>
                 <tr>
-                  <th>Time</th><th>User</th><th>Type</th><th>Severity</th><th>Verify</th><th>Status</th>
+                  <th>Photo</th><th>Time</th><th>User</th><th>Type</th><th>Severity</th><th>Verify</th><th>Status</th>
                 </tr>
               </thead>
               <tbody>
                 {filtered.map((r) => (
                   <tr key={r.id} onClick={() => setSelected(r)}>
+                    <td><img className="thumb" src={`${API_BASE}${r.accident_thumb_url}`} alt="" loading="lazy" /></td>
                     <td>{new Date(r.created_at).toLocaleString()}</td>
                     <td>{r.reporter_email}</td>
                     <td>{r.emergency_type}</td>
@@ -234,6 +372,7 @@ export default function App() {
                 ))}
               </tbody>
             </table>
+            {nextCursor && <button className="load-more" onClick={loadMore}>Load more</button>}
           </section>
 
           <section className="card flagged-users">
@@ -258,8 +397,12 @@ export default function App() {
             <p><strong>Severity:</strong> {selected.severity_label} ({selected.severity_confidence})</p>
             <p><strong>Verification:</strong> {selected.verification_score} | suspicious: {selected.suspicious ? 'yes' : 'no'}</p>
             <div className="img-row">
-              <img src={`${API_BASE}${selected.selfie_url}`} alt="selfie" />
-              <img src={`${API_BASE}${selected.accident_url}`} alt="accident" />
+              <a href={`${API_BASE}${selected.selfie_url}`} target="_blank">
+                <img src={`${API_BASE}${selected.selfie_medium_url}`} alt="selfie" />
+              </a>
+              <a href={`${API_BASE}${selected.accident_url}`} target="_blank">
+                <img src={`${API_BASE}${selected.accident_medium_url}`} alt="accident" />
+              </a>
             </div>
             <iframe
               title="map"
@@ -14,4 +14,14 @@ export async function api(path, { method = 'GET', token, body, isForm = false }
   return data
 }
 
+// Keyset-paginated list endpoints return the next page's cursor, and the change-feed
+// position the page was read at, in headers.
+export async function apiPage(path, { token } = {}) {
+  const headers = token ? { Authorization: `Bearer ${token}` } : {}
+  const res = await fetch(`${API_BASE}${path}`, { headers })
+  const data = await res.json()
+  if (!res.ok) throw new Error(data.detail || data.error || 'API error')
+  return { data, nextCursor: res.headers.get('X-Next-Cursor'), syncCursor: res.headers.get('X-Sync-Cursor') }
+}
+
 export { API_BASE }
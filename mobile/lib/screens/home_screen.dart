@@ -1,3 +1,4 @@
+import 'dart:async';
 import 'dart:convert';
 import 'dart:io';
 
@@ -71,8 +72,30 @@ class _HomeScreenState extends State<HomeScreen> {
   }
 
   Future<void> loadMyReports() async {
-    final data = await widget.api.myReports(widget.token);
-    setState(() => myReports = data.map((e) => ReportItem.fromJson(e)).toList());
+    final since = widget.api.mySyncCursor;
+    if (since == null || myReports.isEmpty) {
+      final data = await widget.api.myReports(widget.token);
+      setState(() => myReports = data.map((e) => ReportItem.fromJson(e)).toList());
+      return;
+    }
+    // After the first load only pull what changed since the last sync.
+    final byId = {for (final r in myReports) r.id: r};
+    var cursor = since;
+    while (true) {
+      final feed = await widget.api.reportChanges(widget.token, cursor);
+      for (final e in feed['reports'] as List<dynamic>) {
+        final item = ReportItem.fromJson(e);
+        byId[item.id] = item;
+      }
+      for (final id in feed['deleted'] as List<dynamic>) {
+        byId.remove(id);
+      }
+      cursor = feed['cursor'] as int;
+      if (feed['has_more'] != true) break;
+    }
+    widget.api.mySyncCursor = cursor;
+    if (!mounted) return;
+    setState(() => myReports = byId.values.toList()..sort((a, b) => b.id.compareTo(a.id)));
   }
 
   String buildLoraPayload() {
@@ -144,7 +167,7 @@ class _HomeScreenState extends State<HomeScreen> {
         return;
       }
 
-      await widget.api.submitReport(
+      final ack = await widget.api.submitReport(
         token: widget.token,
         emergencyType: emergencyType,
         description: description.text,
@@ -154,15 +177,28 @@ class _HomeScreenState extends State<HomeScreen> {
         accident: accident!,
         deviceId: 'android-emulator-01',
         loraPayload: payload['lora_payload']!,
+        asyncProcessing: true,
       );
+      setState(() => info = 'Report received (#${ack['id']}). Verifying...');
       await syncQueued();
       await loadMyReports();
-      setState(() => info = 'Report submitted successfully.');
+      if (ack['status'] == 'Processing') unawaited(_awaitVerdict(ack['id']));
     } finally {
       if (mounted) setState(() => loading = false);
     }
   }
 
+  Future<void> _awaitVerdict(int reportId) async {
+    try {
+      final verdict = await widget.api.waitForVerdict(widget.token, reportId);
+      if (!mounted) return;
+      setState(() => info = 'Report #$reportId: ${verdict['status']} (${verdict['severity']['label']}).');
+      await loadMyReports();
+    } catch (_) {
+      // Verdict polling is best-effort; the report list shows the final status on refresh.
+    }
+  }
+
   Future<void> syncQueued() async {
     final queued = await localQueue.readQueue();
     if (queued.isEmpty) return;
@@ -7,6 +7,12 @@ class ApiService {
   final String baseUrl;
   ApiService({this.baseUrl = 'http://10.0.2.2:8000'});
 
+  // Last /reports/me response per URL, revalidated with If-None-Match.
+  final Map<String, (String, List<dynamic>)> _listCache = {};
+
+  /// Change-feed position of the last [myReports] response; pass it to [reportChanges].
+  int? mySyncCursor;
+
   Future<Map<String, dynamic>> login(String email, String password) async {
     final req = http.MultipartRequest('POST', Uri.parse('$baseUrl/auth/login'));
     req.fields['email'] = email;
@@ -39,6 +45,7 @@ class ApiService {
     required File accident,
     required String deviceId,
     String loraPayload = '',
+    bool asyncProcessing = false,
   }) async {
     final req = http.MultipartRequest('POST', Uri.parse('$baseUrl/reports'));
     req.headers['Authorization'] = 'Bearer $token';
@@ -48,6 +55,7 @@ class ApiService {
     req.fields['longitude'] = longitude.toString();
     req.fields['device_id'] = deviceId;
     req.fields['lora_payload'] = loraPayload;
+    req.fields['async_processing'] = asyncProcessing.toString();
     req.files.add(await http.MultipartFile.fromPath('selfie', selfie.path));
     req.files.add(await http.MultipartFile.fromPath('accident_photo', accident.path));
 
@@ -58,10 +66,55 @@ class ApiService {
     return jsonBody;
   }
 
-  Future<List<dynamic>> myReports(String token) async {
-    final res = await http.get(Uri.parse('$baseUrl/reports/me'), headers: {'Authorization': 'Bearer $token'});
+  Future<Map<String, dynamic>> reportStatus(String token, int reportId) async {
+    final res = await http.get(Uri.parse('$baseUrl/reports/$reportId'), headers: {'Authorization': 'Bearer $token'});
+    final data = jsonDecode(res.body);
+    if (res.statusCode >= 400) throw Exception(data['detail'] ?? 'Failed loading report');
+    return data;
+  }
+
+  /// Polls an async submission until verification and scoring finish.
+  Future<Map<String, dynamic>> waitForVerdict(
+    String token,
+    int reportId, {
+    Duration interval = const Duration(seconds: 2),
+    Duration timeout = const Duration(minutes: 2),
+  }) async {
+    final deadline = DateTime.now().add(timeout);
+    while (true) {
+      final report = await reportStatus(token, reportId);
+      if (report['processing'] != true || DateTime.now().isAfter(deadline)) return report;
+      await Future.delayed(interval);
+    }
+  }
+
+  /// Newest reports first; pass [before] (the last id seen) to fetch the next page.
+  Future<List<dynamic>> myReports(String token, {int limit = 50, int? before}) async {
+    final uri = Uri.parse('$baseUrl/reports/me').replace(queryParameters: {
+      'limit': '$limit',
+      if (before != null) 'cursor': '$before',
+    });
+    final cached = _listCache[uri.toString()];
+    final res = await http.get(uri, headers: {
+      'Authorization': 'Bearer $token',
+      if (cached != null) 'If-None-Match': cached.$1,
+    });
+    if (res.statusCode == 304 && cached != null) return cached.$2;
     final data = jsonDecode(res.body);
     if (res.statusCode >= 400) throw Exception(data['detail'] ?? 'Failed loading reports');
+    final etag = res.headers['etag'];
+    if (etag != null) _listCache[uri.toString()] = (etag, data);
+    mySyncCursor = int.tryParse(res.headers['x-sync-cursor'] ?? '') ?? mySyncCursor;
+    return data;
+  }
+
+  /// Reports changed after [since] (`reports`), ids of deleted ones (`deleted`),
+  /// the next `cursor`, and `has_more` when another call is needed.
+  Future<Map<String, dynamic>> reportChanges(String token, int since) async {
+    final uri = Uri.parse('$baseUrl/reports/changes').replace(queryParameters: {'since': '$since'});
+    final res = await http.get(uri, headers: {'Authorization': 'Bearer $token'});
+    final data = jsonDecode(res.body);
+    if (res.statusCode >= 400) throw Exception(data['detail'] ?? 'Failed loading changes');
     return data;
   }
 }
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from typing import List, Optional, Sequence
+
+from emergency_ai.fleet import np
+
+Assignment = List[Optional[int]]  # per incident row: the unit column assigned to it, or None
+
+
+def greedy_assignment(suitability, order: Sequence[int]) -> Assignment:
+    """Incidents in ``order`` each take their best unit not yet taken.
+
+    ``suitability`` is an incidents x units matrix with ``-inf`` for units
+    that cannot be dispatched. Ties go to the lower unit column, as in
+    ``rank_units``.
+    """
+    assigned: Assignment = [None] * suitability.shape[0]
+    taken = np.zeros(suitability.shape[1], dtype=bool)
+    for row in order:
+        scores = np.where(taken, -np.inf, suitability[row])
+        best = int(np.argmax(scores))
+        if scores[best] == -np.inf:
+            continue
+        assigned[row] = best
+        taken[best] = True
+    return assigned
+
+
+def optimal_assignment(suitability, order: Sequence[int]) -> Assignment:
+    """Units for the incidents that maximize total suitability (Hungarian method).
+
+    With fewer dispatchable units than incidents, only the first incidents
+    in ``order`` are served. In an optimal assignment every incident gets
+    one of its ``n`` best units, where ``n`` is the number of incidents
+    served (otherwise one of those would be free and strictly better). So
+    the matrix is cut down to those columns before solving, which keeps
+    hundreds of incidents against thousands of units fast.
+    """
+    assigned: Assignment = [None] * suitability.shape[0]
+    columns = np.flatnonzero(np.isfinite(suitability).any(axis=0))
+    rows = list(order)[: len(columns)]
+    if not rows:
+        return assigned
+
+    sub = suitability[np.ix_(rows, columns)]
+    nth_best = np.partition(sub, -len(rows), axis=1)[:, -len(rows), None]
+    keep = (sub >= nth_best).any(axis=0)
+    sub, columns = sub[:, keep], columns[keep]
+
+    for row, column in zip(rows, _hungarian(-sub)):
+        assigned[row] = int(columns[column])
+    return assigned
+
+
+def _hungarian(cost) -> List[int]:
+    """Minimum-cost column for each row of an n x m matrix with n <= m.
+
+    Shortest augmenting paths with row/column potentials, O(n^2 m); the scan
+    over columns is vectorized. Index 0 is a virtual column/row.
+    """
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    owner = np.zeros(m + 1, dtype=np.int64)  # row (1-based) holding each column, 0 if free
+    way = np.zeros(m + 1, dtype=np.int64)
+    for row in range(1, n + 1):
+        owner[0] = row
+        column = 0
+        min_reduced = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[column] = True
+            current = owner[column]
+            reduced = cost[current - 1] - u[current] - v[1:]
+            better = ~used[1:] & (reduced < min_reduced[1:])
+            min_reduced[1:][better] = reduced[better]
+            way[1:][better] = column
+            candidates = np.where(used[1:], np.inf, min_reduced[1:])
+            nxt = int(np.argmin(candidates)) + 1
+            delta = candidates[nxt - 1]
+            u[owner[used]] += delta
+            v[used] -= delta
+            min_reduced[~used] -= delta
+            column = nxt
+            if owner[column] == 0:
+                break
+        while column:
+            previous = way[column]
+            owner[column] = owner[previous]
+            column = previous
+
+    result = [0] * n
+    for column in range(1, m + 1):
+        if owner[column]:
+            result[owner[column] - 1] = column - 1
+    return result
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from typing import Iterable, List, Sequence
+
+from emergency_ai.models import Coordinates, ResponseUnit
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+EARTH_RADIUS_KM = 6371.0
+# Bound on ``distance_matrix_km`` vs the haversine formula: rounding of order
+# 1e-15 in the dot product becomes ~2R * sqrt(1e-15) km near zero distance.
+DISTANCE_MATRIX_ERROR_KM = 1e-3
+
+# Per-unit arrays of a vectorized FleetTable.
+_COLUMNS = ("lat", "lon", "cos_lat", "xyz", "speed", "available", "masks")
+
+
+class FleetTable:
+    """Column-oriented snapshot of a fleet for vectorized ranking.
+
+    Positions are kept in radians, speeds are already clamped to >= 1 km/h and
+    each unit's capabilities are folded into a bitmask over ``capabilities``
+    (lowercased, at most 64). Without numpy only ``units`` is populated and
+    callers fall back to scoring units one by one.
+    """
+
+    def __init__(self, units: Iterable[ResponseUnit], capabilities: Iterable[str]) -> None:
+        self.units: List[ResponseUnit] = list(units)
+        self.capability_bits = {name: bit for bit, name in enumerate(sorted({c.lower() for c in capabilities}))}
+        if len(self.capability_bits) > 64:
+            raise ValueError("FleetTable supports at most 64 tracked capabilities")
+        if np is None:
+            return
+
+        self.lat = np.radians(np.array([u.location.latitude for u in self.units], dtype=np.float64))
+        self.lon = np.radians(np.array([u.location.longitude for u in self.units], dtype=np.float64))
+        self.cos_lat = np.cos(self.lat)
+        # Unit vectors on the sphere, for scoring many origins with one matrix product.
+        self.xyz = np.stack([self.cos_lat * np.cos(self.lon), self.cos_lat * np.sin(self.lon), np.sin(self.lat)], axis=1)
+        self.speed = np.array([max(u.speed_kmh, 1) for u in self.units], dtype=np.float64)
+        self.available = np.array([u.available for u in self.units], dtype=bool)
+        self.masks = np.array([self.mask(u.capabilities) for u in self.units], dtype=np.uint64)
+
+    def __len__(self) -> int:
+        return len(self.units)
+
+    def _row(self, unit: ResponseUnit) -> dict:
+        """Column values for one unit, as computed in ``__init__``."""
+        lat, lon = np.radians(unit.location.latitude), np.radians(unit.location.longitude)
+        cos_lat = np.cos(lat)
+        return {
+            "lat": lat,
+            "lon": lon,
+            "cos_lat": cos_lat,
+            "xyz": (cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)),
+            "speed": max(unit.speed_kmh, 1),
+            "available": unit.available,
+            "masks": self.mask(unit.capabilities),
+        }
+
+    def set_unit(self, index: int, unit: ResponseUnit) -> None:
+        """Overwrite row ``index`` in place. A concurrent reader may see the old or the new values."""
+        self.units[index] = unit
+        if np is not None:
+            for name, value in self._row(unit).items():
+                getattr(self, name)[index] = value
+
+    def _derive(self, units: List[ResponseUnit], columns) -> FleetTable:
+        table = object.__new__(FleetTable)
+        table.units = units
+        table.capability_bits = self.capability_bits
+        if np is not None:
+            for name in _COLUMNS:
+                setattr(table, name, columns(name, getattr(self, name)))
+        return table
+
+    def appended(self, unit: ResponseUnit) -> FleetTable:
+        """New table with ``unit`` added at the end; this one is left untouched."""
+        row = self._row(unit) if np is not None else {}
+        return self._derive(
+            self.units + [unit],
+            lambda name, column: np.concatenate([column, np.array([row[name]], dtype=column.dtype)]),
+        )
+
+    def removed(self, index: int) -> FleetTable:
+        """New table without row ``index``; this one is left untouched."""
+        return self._derive(self.units[:index] + self.units[index + 1 :], lambda name, column: np.delete(column, index, 0))
+
+    @property
+    def vectorized(self) -> bool:
+        return np is not None
+
+    def mask(self, capabilities: Iterable[str]) -> int:
+        bits = 0
+        for name in capabilities:
+            bit = self.capability_bits.get(name.lower())
+            if bit is not None:
+                bits |= 1 << bit
+        return bits
+
+    def distances_km(self, origin: Coordinates):
+        """Haversine distance from ``origin`` to every unit, same formula as the scalar version."""
+        lat1, lon1 = np.radians(origin.latitude), np.radians(origin.longitude)
+        dlat = self.lat - lat1
+        dlon = self.lon - lon1
+        a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * self.cos_lat * np.sin(dlon / 2) ** 2
+        return EARTH_RADIUS_KM * (2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a)))
+
+    def distance_matrix_km(self, origins: Sequence[Coordinates]):
+        """Distances from several origins at once, one row per origin.
+
+        Uses the chord between unit vectors (one matrix product) instead of
+        the haversine terms. That is several times cheaper but loses accuracy
+        for very close points: the absolute error stays below
+        ``DISTANCE_MATRIX_ERROR_KM``, so callers must allow for it.
+        """
+        lat = np.radians(np.array([o.latitude for o in origins], dtype=np.float64))
+        lon = np.radians(np.array([o.longitude for o in origins], dtype=np.float64))
+        cos_lat = np.cos(lat)
+        xyz = np.stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)], axis=1)
+        half_chord_sq = np.clip((1 - xyz @ self.xyz.T) / 2, 0.0, 1.0)
+        return EARTH_RADIUS_KM * 2 * np.arcsin(np.sqrt(half_chord_sq))
+
+    def overlap(self, needed: Iterable[str]):
+        """Per unit, how many of the ``needed`` capabilities it has."""
+        counts = np.zeros(len(self.units), dtype=np.int64)
+        for name in set(needed):
+            bit = self.capability_bits.get(name.lower())
+            if bit is not None:
+                counts += ((self.masks >> np.uint64(bit)) & np.uint64(1)).astype(np.int64)
+        return counts
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import math
-from collections import Counter
-from typing import Iterable, List
+import re
+from typing import Dict, Hashable, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
 
+from emergency_ai.assignment import greedy_assignment, optimal_assignment
+from emergency_ai.fleet import DISTANCE_MATRIX_ERROR_KM, FleetTable, np
+from emergency_ai.matcher import KeywordMatcher
 from emergency_ai.models import (
     Coordinates,
     IncidentReport,
@@ -12,6 +15,7 @@ from emergency_ai.models import (
     TriageResult,
     UnitRecommendation,
 )
+from emergency_ai.zones import RiskZoneIndex
 
 
 INCIDENT_KEYWORDS = {
@@ -35,15 +39,59 @@ CAPABILITY_MAP = {
     "rescue": {"search and rescue", "boat rescue", "high-angle rescue"},
     "infrastructure": {"utility response", "hazmat", "engineering"},
 }
+TRACKED_CAPABILITIES = sorted(set().union(*CAPABILITY_MAP.values()))
+
+# Suitability is reported rounded to 2 decimals, so units up to 0.01 below the
+# k-th best can still tie with it; keep a margin above that when pre-selecting.
+_TOP_K_MARGIN = 0.02
+ASSIGNMENT_STRATEGIES = {"greedy": greedy_assignment, "optimal": optimal_assignment}
+
+# Incidents x units scored per block in ``rank_many``; keeps temporaries in cache.
+_RANK_BLOCK_CELLS = 1 << 17
+
+
+# Points per matched signal and whether it is reported as urgent, per severity level.
+SEVERITY_WEIGHTS = {"critical": (4, True), "high": (2, True), "moderate": (1, False)}
+
+# Runs of alphanumeric characters (``\w`` without the underscore), i.e. what
+# survives replacing everything else with spaces and splitting.
+_TOKEN_RE = re.compile(r"[^\W_]+")
+# ASCII fast path: lowercase letters, keep digits, blank out everything else.
+_ASCII_TOKEN_TABLE = bytes(ord(chr(b).lower()) if chr(b).isalnum() else 32 for b in range(128)) + b" " * 128
+
+
+def build_triage_matcher(
+    incident_keywords: Mapping[str, Iterable[str]] = INCIDENT_KEYWORDS,
+    severity_signals: Mapping[str, Iterable[str]] = SEVERITY_SIGNALS,
+) -> KeywordMatcher:
+    """One matcher for both dictionaries, labelled ``("incident", category)`` and ``("severity", level)``."""
+    patterns = [(("incident", category), keyword, True) for category, words in incident_keywords.items() for keyword in words]
+    # Only critical signals match as phrases; high and moderate ones must be single tokens.
+    patterns += [
+        (("severity", level), signal, level == "critical")
+        for level in SEVERITY_WEIGHTS
+        for signal in severity_signals[level]
+    ]
+    return KeywordMatcher(patterns)
 
 
 class LocationIntelligenceEngine:
     """Provides incident triage and geospatial recommendation logic."""
 
+    def __init__(
+        self,
+        incident_keywords: Mapping[str, Iterable[str]] = INCIDENT_KEYWORDS,
+        severity_signals: Mapping[str, Iterable[str]] = SEVERITY_SIGNALS,
+    ) -> None:
+        self.incident_categories = list(incident_keywords)
+        self.matcher = build_triage_matcher(incident_keywords, severity_signals)
+
     @staticmethod
     def tokenize(text: str) -> List[str]:
-        clean = "".join(ch.lower() if ch.isalnum() or ch.isspace() else " " for ch in text)
-        return [t for t in clean.split() if t]
+        if text.isascii():
+            return text.encode("ascii").translate(_ASCII_TOKEN_TABLE).decode("ascii").split()
+        # Characters are lowercased one at a time (no context-dependent casing such as final sigma).
+        return [t.lower() if t.isascii() else "".join(ch.lower() for ch in t) for t in _TOKEN_RE.findall(text)]
 
     @staticmethod
     def haversine_km(origin: Coordinates, target: Coordinates) -> float:
@@ -57,52 +105,46 @@ class LocationIntelligenceEngine:
         c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
         return r * c
 
-    def infer_incident_type(self, tokens: Iterable[str]) -> str:
-        counts = Counter()
-        token_set = set(tokens)
-        joined_text = " ".join(tokens)
-
-        for category, keywords in INCIDENT_KEYWORDS.items():
-            for keyword in keywords:
-                if " " in keyword and keyword in joined_text:
-                    counts[category] += 2
-                elif keyword in token_set:
-                    counts[category] += 1
-
-        if not counts:
-            return "medical"
-        return counts.most_common(1)[0][0]
+    def _incident_type(self, matches: Dict[Hashable, Set[str]]) -> str:
+        best, best_count = "medical", 0
+        for category in self.incident_categories:
+            found = matches.get(("incident", category))
+            if not found:
+                continue
+            count = sum(2 if " " in keyword else 1 for keyword in found)
+            if count > best_count:  # ties keep the earlier category
+                best, best_count = category, count
+        return best
 
-    def severity_score(self, tokens: Iterable[str], risk_modifier: float = 0.0) -> tuple[int, List[str]]:
-        token_set = set(tokens)
-        joined_text = " ".join(tokens)
+    @staticmethod
+    def _severity(matches: Dict[Hashable, Set[str]], risk_modifier: float) -> tuple[int, List[str]]:
         score = 3
-        urgent = []
-
-        for signal in SEVERITY_SIGNALS["critical"]:
-            if (" " in signal and signal in joined_text) or signal in token_set:
-                score += 4
-                urgent.append(signal)
-
-        for signal in SEVERITY_SIGNALS["high"]:
-            if signal in token_set:
-                score += 2
-                urgent.append(signal)
+        urgent = set()
+        for level, (points, is_urgent) in SEVERITY_WEIGHTS.items():
+            found = matches.get(("severity", level))
+            if found:
+                score += points * len(found)
+                if is_urgent:
+                    urgent.update(found)
+        score = min(10, max(1, round(score + risk_modifier)))
+        return score, sorted(urgent)
 
-        for signal in SEVERITY_SIGNALS["moderate"]:
-            if signal in token_set:
-                score += 1
+    def infer_incident_type(self, tokens: Iterable[str]) -> str:
+        return self._incident_type(self.matcher.scan(list(tokens)))
 
-        score = min(10, max(1, round(score + risk_modifier)))
-        return score, sorted(set(urgent))
+    def severity_score(self, tokens: Iterable[str], risk_modifier: float = 0.0) -> tuple[int, List[str]]:
+        return self._severity(self.matcher.scan(list(tokens)), risk_modifier)
 
     def triage(self, report: IncidentReport, risk_modifier: float = 0.0) -> TriageResult:
-        tokens = self.tokenize(report.caller_text)
-        incident_type = self.infer_incident_type(tokens)
-        score, urgent = self.severity_score(tokens, risk_modifier=risk_modifier)
+        matches = self.matcher.scan(self.tokenize(report.caller_text))
+        incident_type = self._incident_type(matches)
+        score, urgent = self._severity(matches, risk_modifier)
         return TriageResult(incident_type=incident_type, severity_score=score, urgent_signals=urgent)
 
-    def active_risks(self, location: Coordinates, risk_zones: Iterable[RiskZone]) -> List[RiskZone]:
+    def active_risks(self, location: Coordinates, risk_zones: Iterable[RiskZone] | RiskZoneIndex) -> List[RiskZone]:
+        """Zones whose radius covers ``location``; with an index only nearby zones are measured."""
+        if isinstance(risk_zones, RiskZoneIndex):
+            risk_zones = risk_zones.candidates(location)
         active = []
         for zone in risk_zones:
             distance = self.haversine_km(location, zone.center)
@@ -110,33 +152,171 @@ class LocationIntelligenceEngine:
                 active.append(zone)
         return active
 
+    @staticmethod
+    def build_fleet(units: Iterable[ResponseUnit]) -> FleetTable:
+        """Snapshot ``units`` once so repeated ``rank_units`` calls are vectorized."""
+        return FleetTable(units, TRACKED_CAPABILITIES)
+
+    def _recommend(
+        self, unit: ResponseUnit, incident_location: Coordinates, capabilities_needed: set[str]
+    ) -> UnitRecommendation:
+        distance = self.haversine_km(incident_location, unit.location)
+        eta_min = (distance / max(unit.speed_kmh, 1)) * 60
+        capability_overlap = len(capabilities_needed.intersection({c.lower() for c in unit.capabilities}))
+        base = 100 - (distance * 3) - eta_min
+        suitability = base + (capability_overlap * 20)
+        return UnitRecommendation(
+            unit_id=unit.unit_id,
+            suitability=round(suitability, 2),
+            distance_km=round(distance, 2),
+            eta_minutes=round(eta_min, 1),
+        )
+
     def rank_units(
         self,
         incident_type: str,
         incident_location: Coordinates,
-        units: Iterable[ResponseUnit],
+        units: Iterable[ResponseUnit] | FleetTable,
         limit: int = 3,
     ) -> List[UnitRecommendation]:
+        """Best ``limit`` available units, highest suitability first (ties keep fleet order).
+
+        Given a ``FleetTable`` the whole fleet is scored with numpy and only the
+        top candidates are built into recommendations.
+        """
         capabilities_needed = CAPABILITY_MAP.get(incident_type, set())
-        ranked = []
-        for unit in units:
-            if not unit.available:
-                continue
+        if isinstance(units, FleetTable):
+            if units.vectorized and 0 < limit < len(units):
+                return self._rank_fleet(capabilities_needed, incident_location, units, limit)
+            units = units.units
+
+        ranked = [
+            self._recommend(unit, incident_location, capabilities_needed) for unit in units if unit.available
+        ]
+        ranked.sort(key=lambda item: item.suitability, reverse=True)
+        return ranked[:limit]
+
+    def rank_many(
+        self, incidents: Sequence[Tuple[str, Coordinates]], fleet: FleetTable, limit: int = 3
+    ) -> List[List[UnitRecommendation]]:
+        """``rank_units`` for several ``(incident_type, location)`` pairs against one fleet.
+
+        With numpy, blocks of incidents are scored against the whole fleet
+        with one matrix product (see ``FleetTable.distance_matrix_km``). The
+        capability bonus is computed once per incident type. Candidates are
+        pre-selected with a margin that covers the approximate distances, then
+        scored exactly, so results equal ``rank_units``.
+        """
+        if not (fleet.vectorized and 0 < limit < len(fleet)):
+            return [self.rank_units(incident_type, location, fleet, limit) for incident_type, location in incidents]
+        available = int(fleet.available.sum())
+        if available == 0:
+            return [[] for _ in incidents]
+        k = min(limit, available)
+        # Suitability falls by (3 + 60 / speed) points per km of distance error.
+        margin = _TOP_K_MARGIN + 2 * DISTANCE_MATRIX_ERROR_KM * (3 + 60 / float(fleet.speed.min()))
+        cost_per_km = 3 + 60 / fleet.speed
+        bonus = {}
+        block = max(1, _RANK_BLOCK_CELLS // len(fleet))
+
+        ranked: List[List[UnitRecommendation]] = []
+        for start in range(0, len(incidents), block):
+            rows = incidents[start : start + block]
+            suitability = 100 - fleet.distance_matrix_km([location for _, location in rows]) * cost_per_km
+            for row, (incident_type, _) in enumerate(rows):
+                if incident_type not in bonus:
+                    bonus[incident_type] = fleet.overlap(CAPABILITY_MAP.get(incident_type, set())) * 20
+                suitability[row] += bonus[incident_type]
+            suitability[:, ~fleet.available] = -np.inf
+
+            kth_best = np.partition(suitability, -k, axis=1)[:, -k, None]
+            hit_rows, hit_units = np.nonzero(suitability >= kth_best - margin)
+            bounds = np.searchsorted(hit_rows, np.arange(len(rows) + 1))
+            for row, (incident_type, location) in enumerate(rows):
+                needed = CAPABILITY_MAP.get(incident_type, set())
+                units = hit_units[bounds[row] : bounds[row + 1]]
+                candidates = [self._recommend(fleet.units[i], location, needed) for i in units]
+                candidates.sort(key=lambda item: item.suitability, reverse=True)
+                ranked.append(candidates[:limit])
+        return ranked
+
+    def suitability_matrix(self, incidents: Sequence[Tuple[str, Coordinates]], fleet: FleetTable):
+        """Incidents x units suitability as ``rank_units`` reports it, ``-inf`` for unavailable units."""
+        matrix = np.empty((len(incidents), len(fleet)))
+        bonus = {}
+        for row, (incident_type, location) in enumerate(incidents):
+            if incident_type not in bonus:
+                bonus[incident_type] = fleet.overlap(CAPABILITY_MAP.get(incident_type, set())) * 20
+            distance = fleet.distances_km(location)
+            matrix[row] = 100 - (distance * 3) - (distance / fleet.speed) * 60 + bonus[incident_type]
+        matrix = np.round(matrix, 2)
+        matrix[:, ~fleet.available] = -np.inf
+        return matrix
+
+    def assign_units(
+        self,
+        incidents: Sequence[Tuple[str, Coordinates]],
+        fleet: FleetTable,
+        order: Sequence[int] | None = None,
+        strategy: str = "greedy",
+    ) -> List[Optional[UnitRecommendation]]:
+        """One distinct available unit per incident, or None once units run out.
+
+        ``order`` ranks the incidents (most urgent first, default: as given).
+        ``"greedy"`` lets each incident in turn take its best remaining unit;
+        ``"optimal"`` maximizes the total suitability of the incidents served
+        and needs numpy.
+        """
+        if strategy not in ASSIGNMENT_STRATEGIES:
+            raise ValueError(f"unknown assignment strategy {strategy!r}")
+        order = range(len(incidents)) if order is None else order
+        if fleet.vectorized:
+            columns = ASSIGNMENT_STRATEGIES[strategy](self.suitability_matrix(incidents, fleet), order)
+        elif strategy == "greedy":
+            columns = self._assign_greedy_scalar(incidents, fleet.units, order)
+        else:
+            raise RuntimeError(f"{strategy} assignment requires numpy")
+
+        return [
+            None
+            if column is None
+            else self._recommend(fleet.units[column], location, CAPABILITY_MAP.get(incident_type, set()))
+            for column, (incident_type, location) in zip(columns, incidents)
+        ]
+
+    def _assign_greedy_scalar(
+        self, incidents: Sequence[Tuple[str, Coordinates]], units: Sequence[ResponseUnit], order: Sequence[int]
+    ) -> List[Optional[int]]:
+        assigned: List[Optional[int]] = [None] * len(incidents)
+        free = [index for index, unit in enumerate(units) if unit.available]
+        for row in order:
+            if not free:
+                break
+            incident_type, location = incidents[row]
+            needed = CAPABILITY_MAP.get(incident_type, set())
+            # max() keeps the first of equal scores, i.e. the lowest fleet index.
+            best = max(free, key=lambda index: self._recommend(units[index], location, needed).suitability)
+            assigned[row] = best
+            free.remove(best)
+        return assigned
+
+    def _rank_fleet(
+        self, capabilities_needed: set[str], incident_location: Coordinates, fleet: FleetTable, limit: int
+    ) -> List[UnitRecommendation]:
+        distance = fleet.distances_km(incident_location)
+        eta_min = (distance / fleet.speed) * 60
+        suitability = 100 - (distance * 3) - eta_min + fleet.overlap(capabilities_needed) * 20
+        suitability[~fleet.available] = -np.inf
 
-            distance = self.haversine_km(incident_location, unit.location)
-            eta_min = (distance / max(unit.speed_kmh, 1)) * 60
-            capability_overlap = len(capabilities_needed.intersection({c.lower() for c in unit.capabilities}))
-            base = 100 - (distance * 3) - eta_min
-            suitability = base + (capability_overlap * 20)
-
-            ranked.append(
-                UnitRecommendation(
-                    unit_id=unit.unit_id,
-                    suitability=round(suitability, 2),
-                    distance_km=round(distance, 2),
-                    eta_minutes=round(eta_min, 1),
-                )
-            )
+        available = int(fleet.available.sum())
+        if available == 0:
+            return []
+        k = min(limit, available)
+        kth_best = suitability[np.argpartition(suitability, -k)[-k]]
+        # Every unit that could tie with or beat the k-th best after rounding, in fleet order.
+        candidates = np.flatnonzero(suitability >= kth_best - _TOP_K_MARGIN)
 
+        # Recompute candidates with the scalar formula so values and ties match exactly.
+        ranked = [self._recommend(fleet.units[i], incident_location, capabilities_needed) for i in candidates]
         ranked.sort(key=lambda item: item.suitability, reverse=True)
         return ranked[:limit]
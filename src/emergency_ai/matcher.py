@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, Hashable, Iterable, List, Sequence, Set, Tuple
+
+Pattern = Tuple[Hashable, str, bool]  # (label, keyword, multi-word keyword may match as a substring)
+
+
+class KeywordMatcher:
+    """Finds every keyword of a large dictionary in tokenized text in one scan.
+
+    Keywords are grouped under labels (e.g. ``"fire"`` or ``"critical"``).
+    A single-word keyword matches a whole token through one hash lookup per
+    token. A multi-word keyword matches anywhere in the space-joined tokens,
+    like ``keyword in " ".join(tokens)``. All such phrases share one
+    Aho-Corasick automaton, so the text is read once however many phrases
+    there are. Phrases registered with ``substring=False`` can never match a
+    single token, so they are dropped.
+    """
+
+    def __init__(self, patterns: Iterable[Pattern]) -> None:
+        self.words: Dict[str, List[Tuple[Hashable, str]]] = {}
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[Hashable, str]]] = [[]]
+        for label, keyword, substring in patterns:
+            if " " not in keyword:
+                if keyword:
+                    self.words.setdefault(keyword, []).append((label, keyword))
+            elif substring:
+                self._add_phrase(label, keyword)
+        self._link()
+
+    @property
+    def has_phrases(self) -> bool:
+        return len(self._goto) > 1
+
+    def _add_phrase(self, label: Hashable, phrase: str) -> None:
+        node = 0
+        for ch in phrase:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((label, phrase))
+
+    def _link(self) -> None:
+        """Resolve failure links into a full transition table (a DFA).
+
+        Each node inherits the transitions of its failure node and reports
+        every phrase that ends at one of its suffixes, so ``scan`` takes
+        exactly one dictionary lookup per character.
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            own = goto[node]
+            for ch, child in own.items():
+                queue.append(child)
+                fail[child] = goto[fail[node]].get(ch, 0)
+                out[child] = out[child] + out[fail[child]]
+            # The failure node is shallower, so its table is already complete.
+            goto[node] = {**goto[fail[node]], **own}
+
+    def scan(self, tokens: Sequence[str]) -> Dict[Hashable, Set[str]]:
+        """Label -> keywords present in ``tokens``."""
+        found: Dict[Hashable, Set[str]] = {}
+        words = self.words
+        for token in set(tokens):
+            for label, keyword in words.get(token, ()):
+                found.setdefault(label, set()).add(keyword)
+
+        if self.has_phrases:
+            goto, out = self._goto, self._out
+            node = 0
+            for ch in " ".join(tokens):
+                node = goto[node].get(ch, 0)
+                if out[node]:
+                    for label, phrase in out[node]:
+                        found.setdefault(label, set()).add(phrase)
+        return found
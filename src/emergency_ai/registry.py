@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import replace
+from typing import Dict, Iterable, Iterator, List
+
+from emergency_ai.fleet import FleetTable
+from emergency_ai.models import Coordinates, ResponseUnit
+
+
+class FleetRegistry:
+    """Live view of the response fleet, keyed by ``unit_id``.
+
+    Units stay immutable ``ResponseUnit`` values; an update swaps in a
+    modified copy. Moving a unit or changing its availability rewrites its
+    row of the current ``FleetTable`` in place, O(1) however large the
+    fleet. Adding or removing a unit builds a new table (a copy of each
+    column) and swaps it in, so a ranking that already holds ``table``
+    keeps a consistent snapshot.
+
+    Units passed to the constructor are all kept, even when ids repeat, so
+    rankings match those over the same list (as ``RiskZoneIndex`` does for
+    zones). Lookups and updates by ``unit_id`` act on every unit with that
+    id; ``get`` returns the first. ``upsert`` replaces all of them with the
+    one unit and ``remove`` drops all of them.
+    """
+
+    def __init__(self, units: Iterable[ResponseUnit], capabilities: Iterable[str]) -> None:
+        self._table = FleetTable(units, capabilities)
+        self._slots: Dict[str, List[int]] = {}
+        self._reindex()
+        self._lock = threading.Lock()
+
+    def _reindex(self) -> None:
+        self._slots = {}
+        for index, unit in enumerate(self._table.units):
+            self._slots.setdefault(unit.unit_id, []).append(index)
+
+    @property
+    def table(self) -> FleetTable:
+        return self._table
+
+    @property
+    def units(self) -> List[ResponseUnit]:
+        return list(self._table.units)
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def __iter__(self) -> Iterator[ResponseUnit]:
+        return iter(self.units)
+
+    def __contains__(self, unit_id: object) -> bool:
+        return unit_id in self._slots
+
+    def get(self, unit_id: str) -> ResponseUnit:
+        return self._table.units[self._slots[unit_id][0]]
+
+    def upsert(self, unit: ResponseUnit) -> None:
+        """Add a unit, or replace the one with the same ``unit_id`` in place."""
+        with self._lock:
+            indexes = self._slots.get(unit.unit_id)
+            if indexes is None:
+                self._table = self._table.appended(unit)
+                self._slots[unit.unit_id] = [len(self._table) - 1]
+                return
+            self._table.set_unit(indexes[0], unit)
+            if len(indexes) > 1:
+                self._drop(indexes[1:])
+
+    def remove(self, unit_id: str) -> bool:
+        """Drop every unit with ``unit_id``; returns False if none is registered."""
+        with self._lock:
+            indexes = self._slots.get(unit_id)
+            if indexes is None:
+                return False
+            self._drop(indexes)
+            return True
+
+    def _drop(self, indexes: List[int]) -> None:
+        table = self._table
+        for index in reversed(indexes):
+            table = table.removed(index)
+        self._table = table
+        self._reindex()
+
+    def _update(self, unit_id: str, **changes) -> ResponseUnit:
+        with self._lock:
+            updated = []
+            for index in self._slots[unit_id]:
+                updated.append(replace(self._table.units[index], **changes))
+                self._table.set_unit(index, updated[-1])
+            return updated[0]
+
+    def move(self, unit_id: str, location: Coordinates) -> ResponseUnit:
+        return self._update(unit_id, location=location)
+
+    def set_available(self, unit_id: str, available: bool) -> ResponseUnit:
+        return self._update(unit_id, available=available)
@@ -1,28 +1,169 @@
 from __future__ import annotations
 
-from typing import Iterable
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List, Sequence
 
-from emergency_ai.intelligence import LocationIntelligenceEngine
-from emergency_ai.models import IncidentReport, ResponsePlan, ResponseUnit, RiskZone
+from emergency_ai.intelligence import TRACKED_CAPABILITIES, LocationIntelligenceEngine
+from emergency_ai.models import IncidentReport, ResponsePlan, ResponseUnit, RiskZone, TriageResult
+from emergency_ai.registry import FleetRegistry
+from emergency_ai.zones import RiskZoneIndex
+
+# Each worker process rebuilds the system once from a snapshot and reuses it for every chunk.
+_worker_system: EmergencyResponseSystem | None = None
+
+
+def _init_plan_worker(risk_zones: List[RiskZone], units: List[ResponseUnit]) -> None:
+    global _worker_system
+    _worker_system = EmergencyResponseSystem(risk_zones, units)
+
+
+def _plan_chunk(reports: List[IncidentReport]) -> List[ResponsePlan]:
+    return _worker_system._plan_batch(reports)
+
+
+def _chunks(reports: Iterable[IncidentReport], size: int) -> Iterator[List[IncidentReport]]:
+    iterator = iter(reports)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
 
 
 class EmergencyResponseSystem:
     def __init__(self, risk_zones: Iterable[RiskZone], units: Iterable[ResponseUnit]) -> None:
         self.engine = LocationIntelligenceEngine()
         self.risk_zones = list(risk_zones)
-        self.units = list(units)
+        self.zone_index = RiskZoneIndex(self.risk_zones)
+        self.registry = FleetRegistry(units, TRACKED_CAPABILITIES)
+        self._dispatch_lock = threading.Lock()
+
+    @property
+    def units(self) -> List[ResponseUnit]:
+        return self.registry.units
+
+    @property
+    def fleet(self):
+        """Current ``FleetTable`` of the registry."""
+        return self.registry.table
+
+    def add_unit(self, unit: ResponseUnit) -> None:
+        """Add or replace (same ``unit_id``) a unit; later plans see it immediately."""
+        self.registry.upsert(unit)
+
+    def remove_unit(self, unit_id: str) -> bool:
+        return self.registry.remove(unit_id)
+
+    def add_risk_zone(self, zone: RiskZone) -> None:
+        """Add or replace (same ``zone_id``) a zone without rebuilding the index."""
+        self.remove_risk_zone(zone.zone_id)
+        self.risk_zones.append(zone)
+        self.zone_index.insert(zone)
+
+    def remove_risk_zone(self, zone_id: str) -> bool:
+        self.risk_zones = [zone for zone in self.risk_zones if zone.zone_id != zone_id]
+        return self.zone_index.remove(zone_id)
 
     def build_plan(self, report: IncidentReport) -> ResponsePlan:
-        active_risk_zones = self.engine.active_risks(report.location, self.risk_zones)
+        active_risk_zones = self.engine.active_risks(report.location, self.zone_index)
         risk_modifier = sum(zone.severity_modifier for zone in active_risk_zones)
 
         triage = self.engine.triage(report, risk_modifier=risk_modifier)
         recommendations = self.engine.rank_units(
             incident_type=triage.incident_type,
             incident_location=report.location,
-            units=self.units,
+            units=self.fleet,
+        )
+        return self._assemble_plan(triage, active_risk_zones, recommendations)
+
+    def build_plans(
+        self, reports: Iterable[IncidentReport], workers: int = 0, chunk_size: int = 256
+    ) -> List[ResponsePlan]:
+        """``build_plan`` for every report, in input order. See ``iter_plans``."""
+        return list(self.iter_plans(reports, workers=workers, chunk_size=chunk_size))
+
+    def iter_plans(
+        self, reports: Iterable[IncidentReport], workers: int = 0, chunk_size: int = 256
+    ) -> Iterator[ResponsePlan]:
+        """Yield a plan per report, in input order, reading ``reports`` lazily.
+
+        Reports are processed ``chunk_size`` at a time: each chunk is triaged
+        with the shared matcher and zone index and ranked against the fleet
+        as one matrix. With ``workers`` > 0 the chunks run on a process pool;
+        each worker builds its own copy of the current zones and units once,
+        so later updates to this system do not affect a batch in progress.
+        At most ``2 * workers`` chunks are in flight, so memory stays bounded
+        however long ``reports`` is.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        chunks = _chunks(reports, chunk_size)
+        if workers <= 0:
+            for chunk in chunks:
+                yield from self._plan_batch(chunk)
+            return
+
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_plan_worker,
+            initargs=(list(self.risk_zones), list(self.units)),
+        )
+        try:
+            pending = deque(executor.submit(_plan_chunk, chunk) for chunk in islice(chunks, 2 * workers))
+            while pending:
+                plans = pending.popleft().result()
+                for chunk in islice(chunks, 1):
+                    pending.append(executor.submit(_plan_chunk, chunk))
+                yield from plans
+        finally:
+            # Also reached when the caller stops iterating early.
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def dispatch(
+        self, reports: Iterable[IncidentReport], strategy: str = "greedy", reserve: bool = True
+    ) -> List[ResponsePlan]:
+        """Plan concurrent incidents so that no unit is sent to two of them.
+
+        Each plan recommends only the unit assigned to it, or none once the
+        available units run out. Incidents are served most severe first (ties
+        in input order); see ``LocationIntelligenceEngine.assign_units`` for
+        the strategies. With ``reserve`` the assigned units are marked
+        unavailable, so later plans and dispatches skip them until released
+        with ``registry.set_available(unit_id, True)``.
+        """
+        reports = list(reports)
+        active, triages = self._triage_batch(reports)
+        order = sorted(range(len(reports)), key=lambda row: -triages[row].severity_score)
+        incidents = [(triage.incident_type, report.location) for triage, report in zip(triages, reports)]
+        with self._dispatch_lock:
+            assigned = self.engine.assign_units(incidents, self.fleet, order, strategy)
+            if reserve:
+                for recommendation in assigned:
+                    if recommendation is not None:
+                        self.registry.set_available(recommendation.unit_id, False)
+        return [
+            self._assemble_plan(triage, zones, [recommendation] if recommendation else [])
+            for triage, zones, recommendation in zip(triages, active, assigned)
+        ]
+
+    def _triage_batch(self, reports: Sequence[IncidentReport]) -> tuple[List[List[RiskZone]], List[TriageResult]]:
+        active = [self.engine.active_risks(report.location, self.zone_index) for report in reports]
+        triages = [
+            self.engine.triage(report, risk_modifier=sum(zone.severity_modifier for zone in zones))
+            for report, zones in zip(reports, active)
+        ]
+        return active, triages
+
+    def _plan_batch(self, reports: Sequence[IncidentReport]) -> List[ResponsePlan]:
+        active, triages = self._triage_batch(reports)
+        rankings = self.engine.rank_many(
+            [(triage.incident_type, report.location) for triage, report in zip(triages, reports)], self.fleet
         )
+        return [self._assemble_plan(*parts) for parts in zip(triages, active, rankings)]
 
+    def _assemble_plan(self, triage, active_risk_zones, recommendations) -> ResponsePlan:
         risk_context = [f"{zone.risk_type} ({zone.zone_id})" for zone in active_risk_zones]
         actions = self._generate_actions(triage.severity_score, triage.incident_type, recommendations)
 
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import math
+import threading
+from itertools import count
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+from emergency_ai.models import Coordinates, RiskZone
+
+EARTH_RADIUS_KM = 6371.0
+# Padding against rounding when a zone's edge falls exactly on a cell border.
+_EDGE_EPSILON_DEG = 1e-9
+
+Cell = Tuple[int, int]
+
+
+class RiskZoneIndex:
+    """Uniform latitude/longitude grid over risk zones.
+
+    Each zone is registered in every cell its bounding box touches. The box is
+    the exact extent of the zone's spherical cap, so no zone that contains a
+    point is ever missed. Looking up a point reads one cell, so the cost
+    depends on how many zones are nearby, not on the size of the map. Zones
+    that would span more than ``max_cells`` cells (e.g. a province-wide alert)
+    are kept in a short list checked on every lookup instead.
+    ``candidates`` is a superset; the caller still applies the exact distance
+    test.
+
+    Zones passed to the constructor are all kept, even when ids repeat, so
+    lookups match a scan of the same list. ``insert`` replaces every zone
+    with that ``zone_id`` and ``remove`` drops all of them.
+    """
+
+    def __init__(self, zones: Iterable[RiskZone] = (), cell_deg: float = 0.05, max_cells: int = 4096) -> None:
+        if cell_deg <= 0:
+            raise ValueError("cell_deg must be positive")
+        self.cell_deg = cell_deg
+        self.max_cells = max_cells
+        self._lon_cells = max(1, math.ceil(360 / cell_deg))
+        self._lon_width = 360 / self._lon_cells  # columns tile the globe exactly, so wrapping is consistent
+        # Entries are keyed by insertion number, which also orders lookups.
+        self._cells: Dict[Cell, Set[int]] = {}
+        self._large: Set[int] = set()
+        self._zones: Dict[int, Tuple[RiskZone, List[Cell]]] = {}
+        self._keys: Dict[str, List[int]] = {}
+        self._order = count()
+        self._lock = threading.Lock()
+        for zone in zones:
+            cells = self._cells_for(zone)
+            with self._lock:
+                self._add(zone, cells)
+
+    def __len__(self) -> int:
+        return len(self._zones)
+
+    def __iter__(self) -> Iterator[RiskZone]:
+        with self._lock:
+            zones = [self._zones[key][0] for key in sorted(self._zones)]
+        return iter(zones)
+
+    def __contains__(self, zone_id: object) -> bool:
+        return zone_id in self._keys
+
+    def _lat_row(self, latitude: float) -> int:
+        return math.floor((latitude + 90) / self.cell_deg)
+
+    def _lon_col(self, longitude: float) -> int:
+        return math.floor((longitude + 180) / self._lon_width) % self._lon_cells
+
+    def _cells_for(self, zone: RiskZone) -> List[Cell] | None:
+        """Cells covering the zone's cap, or None if there would be more than ``max_cells``."""
+        angular = zone.radius_km / EARTH_RADIUS_KM
+        center_lat = zone.center.latitude
+        half_lat = math.degrees(angular) + _EDGE_EPSILON_DEG
+        south, north = max(-90.0, center_lat - half_lat), min(90.0, center_lat + half_lat)
+
+        cos_lat = math.cos(math.radians(center_lat))
+        if north >= 90.0 or south <= -90.0 or angular >= math.pi / 2 or math.sin(angular) >= cos_lat:
+            cols = range(self._lon_cells)  # the cap reaches a pole: every longitude
+        else:
+            half_lon = math.degrees(math.asin(math.sin(angular) / cos_lat)) + _EDGE_EPSILON_DEG
+            west = math.floor((zone.center.longitude - half_lon + 180) / self._lon_width)
+            east = math.floor((zone.center.longitude + half_lon + 180) / self._lon_width)
+            if east - west + 1 >= self._lon_cells:
+                cols = range(self._lon_cells)
+            else:
+                cols = [col % self._lon_cells for col in range(west, east + 1)]
+
+        rows = range(self._lat_row(south), self._lat_row(north) + 1)
+        if len(rows) * len(cols) > self.max_cells:
+            return None
+        return [(row, col) for row in rows for col in cols]
+
+    def insert(self, zone: RiskZone) -> None:
+        """Index ``zone`` in place of any zones with the same ``zone_id``."""
+        cells = self._cells_for(zone)
+        with self._lock:
+            self._discard(zone.zone_id)
+            self._add(zone, cells)
+
+    def remove(self, zone_id: str) -> bool:
+        """Drop every zone with ``zone_id``; returns False if none was indexed."""
+        with self._lock:
+            return self._discard(zone_id)
+
+    def _add(self, zone: RiskZone, cells: List[Cell] | None) -> None:
+        key = next(self._order)
+        if cells is None:
+            self._large.add(key)
+            cells = []
+        for cell in cells:
+            self._cells.setdefault(cell, set()).add(key)
+        self._zones[key] = (zone, cells)
+        self._keys.setdefault(zone.zone_id, []).append(key)
+
+    def _discard(self, zone_id: str) -> bool:
+        keys = self._keys.pop(zone_id, None)
+        if keys is None:
+            return False
+        for key in keys:
+            _, cells = self._zones.pop(key)
+            for cell in cells:
+                bucket = self._cells[cell]
+                bucket.discard(key)
+                if not bucket:
+                    del self._cells[cell]
+            self._large.discard(key)
+        return True
+
+    def candidates(self, location: Coordinates) -> List[RiskZone]:
+        """Zones that may contain ``location``, in insertion order."""
+        cell = (self._lat_row(min(location.latitude, 90.0 - self.cell_deg / 2)), self._lon_col(location.longitude))
+        with self._lock:
+            keys = sorted(self._cells.get(cell, set()) | self._large)
+            return [self._zones[key][0] for key in keys]
@@ -0,0 +1,116 @@
+import itertools
+import random
+
+import pytest
+
+from emergency_ai import fleet as fleet_module
+from emergency_ai.assignment import optimal_assignment
+from emergency_ai.intelligence import CAPABILITY_MAP, LocationIntelligenceEngine
+from emergency_ai.models import Coordinates, IncidentReport, ResponseUnit
+from emergency_ai.system import EmergencyResponseSystem
+
+np = pytest.importorskip("numpy")
+
+
+def _random_units(rng: random.Random, count: int) -> list[ResponseUnit]:
+    capabilities = ["Paramedic", "Ambulance", "Hazmat", "Fire Engine", "Tactical", "Boat Rescue"]
+    return [
+        ResponseUnit(
+            f"U-{i}",
+            "mixed",
+            Coordinates(14.0 + rng.uniform(-0.5, 0.5), 121.0 + rng.uniform(-0.5, 0.5)),
+            rng.choice([40, 60, 80]),
+            rng.sample(capabilities, 2),
+            available=rng.random() > 0.2,
+        )
+        for i in range(count)
+    ]
+
+
+def _random_incidents(rng: random.Random, count: int) -> list[tuple[str, Coordinates]]:
+    return [
+        (rng.choice(list(CAPABILITY_MAP)), Coordinates(14.0 + rng.uniform(-0.5, 0.5), 121.0 + rng.uniform(-0.5, 0.5)))
+        for _ in range(count)
+    ]
+
+
+def test_optimal_assignment_matches_brute_force() -> None:
+    rng = np.random.default_rng(41)
+    for _ in range(200):
+        rows, columns = rng.integers(1, 5), rng.integers(1, 7)
+        suitability = rng.integers(-20, 20, (rows, columns)).astype(float)
+        suitability[:, rng.random(columns) < 0.2] = -np.inf
+        order = list(rng.permutation(rows))
+        assigned = optimal_assignment(suitability, order)
+
+        usable = [c for c in range(columns) if np.isfinite(suitability[0, c])]
+        served = order[: len(usable)]
+        best = max(
+            (sum(suitability[row, c] for row, c in zip(served, perm)) for perm in itertools.permutations(usable, len(served))),
+            default=0,
+        )
+        assert [row for row in range(rows) if assigned[row] is not None] == sorted(served)
+        assert len({assigned[row] for row in served}) == len(served)
+        assert sum(suitability[row, assigned[row]] for row in served) == best
+
+
+def test_assign_units_never_double_books() -> None:
+    engine = LocationIntelligenceEngine()
+    rng = random.Random(42)
+    units = _random_units(rng, 400)
+    fleet = engine.build_fleet(units)
+    incidents = _random_incidents(rng, 120)
+    order = list(range(len(incidents)))
+    rng.shuffle(order)
+
+    greedy = engine.assign_units(incidents, fleet, order)
+    optimal = engine.assign_units(incidents, fleet, order, strategy="optimal")
+    for assigned in (greedy, optimal):
+        ids = [rec.unit_id for rec in assigned]
+        assert len(set(ids)) == len(ids)
+        assert all(units[int(unit_id[2:])].available for unit_id in ids)
+    assert sum(rec.suitability for rec in optimal) >= sum(rec.suitability for rec in greedy) - 1e-6
+
+    # Greedy: each incident gets its best unit among those not taken by more urgent incidents.
+    taken = set()
+    for row in order:
+        remaining = [unit for unit in units if unit.unit_id not in taken]
+        assert greedy[row] == engine.rank_units(*incidents[row], remaining, limit=1)[0]
+        taken.add(greedy[row].unit_id)
+
+
+def test_greedy_without_numpy_matches(monkeypatch) -> None:
+    engine = LocationIntelligenceEngine()
+    rng = random.Random(43)
+    units = _random_units(rng, 150)
+    incidents = _random_incidents(rng, 40)
+    expected = [rec.unit_id for rec in engine.assign_units(incidents, engine.build_fleet(units))]
+
+    monkeypatch.setattr(fleet_module, "np", None)
+    fleet = engine.build_fleet(units)
+    assert [rec.unit_id for rec in engine.assign_units(incidents, fleet)] == expected
+    with pytest.raises(RuntimeError):
+        engine.assign_units(incidents, fleet, strategy="optimal")
+
+
+def test_dispatch_serves_the_most_severe_incident_and_reserves_units() -> None:
+    units = [
+        ResponseUnit("MED-1", "ambulance", Coordinates(14.0, 121.0), 60, ["Paramedic", "Ambulance"]),
+        ResponseUnit("MED-2", "ambulance", Coordinates(14.2, 121.2), 60, ["Paramedic", "Ambulance"]),
+    ]
+    system = EmergencyResponseSystem(risk_zones=[], units=units)
+    reports = [
+        IncidentReport("MINOR", "Small injury, some bleeding.", Coordinates(14.0, 121.0)),
+        IncidentReport("CRITICAL", "Man unconscious and not breathing.", Coordinates(14.001, 121.0)),
+        IncidentReport("LATE", "Someone collapsed.", Coordinates(14.0, 121.001)),
+    ]
+    plans = system.dispatch(reports)
+    assigned = [[rec.unit_id for rec in plan.recommendations] for plan in plans]
+    assert assigned == [["MED-2"], ["MED-1"], []]
+    assert not any(unit.available for unit in system.units)
+    assert system.build_plan(reports[2]).recommendations == []
+
+    system.registry.set_available("MED-1", True)
+    assert [rec.unit_id for rec in system.dispatch(reports[2:], strategy="optimal")[0].recommendations] == ["MED-1"]
+    with pytest.raises(ValueError):
+        system.dispatch(reports, strategy="auction")
@@ -0,0 +1,161 @@
+import random
+from collections import Counter
+
+from emergency_ai import fleet as fleet_module
+from emergency_ai.intelligence import CAPABILITY_MAP, INCIDENT_KEYWORDS, SEVERITY_SIGNALS, LocationIntelligenceEngine
+from emergency_ai.matcher import KeywordMatcher
+from emergency_ai.models import Coordinates, IncidentReport, ResponseUnit
+
+ALL_CAPABILITIES = sorted(set().union(*CAPABILITY_MAP.values())) + ["drone", "k9"]
+
+
+def _random_fleet(rng: random.Random, size: int) -> list[ResponseUnit]:
+    units = []
+    for i in range(size):
+        # A few units share a spot and a speed so exact ties occur.
+        if i % 25 == 0 and units:
+            twin = units[-1]
+            units.append(ResponseUnit(f"U-{i}", twin.unit_type, twin.location, twin.speed_kmh, twin.capabilities))
+            continue
+        units.append(
+            ResponseUnit(
+                unit_id=f"U-{i}",
+                unit_type="mixed",
+                location=Coordinates(34.0 + rng.uniform(-0.6, 0.6), -118.2 + rng.uniform(-0.6, 0.6)),
+                speed_kmh=rng.choice([0, 0.5, 40, 60, 75, 90]),
+                capabilities=[c.title() for c in rng.sample(ALL_CAPABILITIES, rng.randint(0, 3))],
+                available=rng.random() > 0.2,
+            )
+        )
+    return units
+
+
+def test_fleet_ranking_matches_the_scalar_ranking() -> None:
+    engine = LocationIntelligenceEngine()
+    rng = random.Random(7)
+    for size in (1, 5, 60, 800):
+        units = _random_fleet(rng, size)
+        table = engine.build_fleet(units)
+        for incident_type in [*CAPABILITY_MAP, "unknown"]:
+            for limit in (-2, 0, 1, 3, 10, size + 5):
+                location = Coordinates(34.0 + rng.uniform(-0.5, 0.5), -118.2 + rng.uniform(-0.5, 0.5))
+                expected = engine.rank_units(incident_type, location, units, limit=limit)
+                assert engine.rank_units(incident_type, location, table, limit=limit) == expected
+
+
+def test_rank_many_matches_rank_units() -> None:
+    engine = LocationIntelligenceEngine()
+    rng = random.Random(8)
+    units = _random_fleet(rng, 400)
+    table = engine.build_fleet(units)
+    incidents = [
+        (rng.choice([*CAPABILITY_MAP, "unknown"]), Coordinates(34.0 + rng.uniform(-0.5, 0.5), -118.2 + rng.uniform(-0.5, 0.5)))
+        for _ in range(150)
+    ]
+    for limit in (0, 1, 3, 500):
+        expected = [engine.rank_units(incident_type, location, units, limit=limit) for incident_type, location in incidents]
+        assert engine.rank_many(incidents, table, limit=limit) == expected
+    assert engine.rank_many([], table) == []
+
+
+def test_fleet_ranking_without_numpy_falls_back_to_scalar(monkeypatch) -> None:
+    engine = LocationIntelligenceEngine()
+    units = _random_fleet(random.Random(3), 40)
+    location = Coordinates(34.05, -118.25)
+    expected = engine.rank_units("fire", location, units)
+
+    monkeypatch.setattr(fleet_module, "np", None)
+    table = engine.build_fleet(units)
+    assert not table.vectorized
+    assert engine.rank_units("fire", location, table) == expected
+
+
+def test_fleet_with_no_available_units_ranks_nothing() -> None:
+    engine = LocationIntelligenceEngine()
+    units = [
+        ResponseUnit(f"U-{i}", "ambulance", Coordinates(34.0, -118.0), 60, ["Paramedic"], available=False)
+        for i in range(5)
+    ]
+    assert engine.rank_units("medical", Coordinates(34.0, -118.0), engine.build_fleet(units)) == []
+
+
+# The triage logic before the compiled matcher, kept as the reference.
+def _reference_tokenize(text: str) -> list[str]:
+    clean = "".join(ch.lower() if ch.isalnum() or ch.isspace() else " " for ch in text)
+    return [t for t in clean.split() if t]
+
+
+def _reference_incident_type(tokens: list[str], incident_keywords=INCIDENT_KEYWORDS) -> str:
+    counts = Counter()
+    token_set = set(tokens)
+    joined_text = " ".join(tokens)
+    for category, keywords in incident_keywords.items():
+        for keyword in keywords:
+            if " " in keyword and keyword in joined_text:
+                counts[category] += 2
+            elif keyword in token_set:
+                counts[category] += 1
+    if not counts:
+        return "medical"
+    return counts.most_common(1)[0][0]
+
+
+def _reference_severity(tokens: list[str], risk_modifier: float, signals=SEVERITY_SIGNALS) -> tuple[int, list[str]]:
+    token_set = set(tokens)
+    joined_text = " ".join(tokens)
+    score = 3
+    urgent = []
+    for signal in signals["critical"]:
+        if (" " in signal and signal in joined_text) or signal in token_set:
+            score += 4
+            urgent.append(signal)
+    for signal in signals["high"]:
+        if signal in token_set:
+            score += 2
+            urgent.append(signal)
+    for signal in signals["moderate"]:
+        if signal in token_set:
+            score += 1
+    return min(10, max(1, round(score + risk_modifier))), sorted(set(urgent))
+
+
+def _random_caller_text(rng: random.Random, vocabulary: list[str]) -> str:
+    noise = ["the", "a", "near", "cannot", "gas", "leaks", "not", "ΟΔΟΣ", "İstanbul", "x_ray", "3rd", "½", "\t", "!!", "--"]
+    words = [rng.choice(vocabulary if rng.random() < 0.5 else noise) for _ in range(rng.randint(0, 25))]
+    words = [w.upper() if rng.random() < 0.2 else w for w in words]
+    return "".join(w + rng.choice([" ", ", ", ".", "\n", "", "-"]) for w in words)
+
+
+def test_triage_matches_the_reference_logic() -> None:
+    engine = LocationIntelligenceEngine()
+    vocabulary = sorted(set().union(*INCIDENT_KEYWORDS.values(), *SEVERITY_SIGNALS.values()))
+    rng = random.Random(11)
+    for i in range(3000):
+        text = _random_caller_text(rng, vocabulary)
+        tokens = engine.tokenize(text)
+        assert tokens == _reference_tokenize(text)
+        modifier = rng.choice([0.0, 1.2, -3.0])
+        triage = engine.triage(IncidentReport(f"INC-{i}", text, Coordinates(0, 0)), risk_modifier=modifier)
+        assert triage.incident_type == _reference_incident_type(tokens)
+        assert (triage.severity_score, triage.urgent_signals) == _reference_severity(tokens, modifier)
+
+
+def test_large_dictionaries_match_the_reference_logic() -> None:
+    rng = random.Random(12)
+    letters = "abcdefgh"
+    words = sorted({"".join(rng.choice(letters) for _ in range(rng.randint(2, 5))) for _ in range(3000)})
+    phrases = sorted({f"{rng.choice(words)} {rng.choice(words)}" for _ in range(1500)})
+    pool = words + phrases
+    incident_keywords = {f"cat{i}": set(rng.sample(pool, 200)) for i in range(12)}
+    signals = {level: set(rng.sample(pool, 150)) for level in ("critical", "high", "moderate")}
+    engine = LocationIntelligenceEngine(incident_keywords, signals)
+    for _ in range(300):
+        tokens = [rng.choice(words) for _ in range(rng.randint(0, 40))]
+        assert engine.infer_incident_type(tokens) == _reference_incident_type(tokens, incident_keywords)
+        assert engine.severity_score(tokens, 0.5) == _reference_severity(tokens, 0.5, signals)
+
+
+def test_matcher_finds_overlapping_phrases() -> None:
+    matcher = KeywordMatcher([("a", "he she", True), ("b", "she said", True), ("c", "e s", True), ("d", "she", False)])
+    assert matcher.scan(["he", "she", "said"]) == {"a": {"he she"}, "b": {"she said"}, "c": {"e s"}, "d": {"she"}}
+    assert matcher.scan(["shed"]) == {}
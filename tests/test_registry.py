@@ -0,0 +1,81 @@
+import random
+
+from emergency_ai.intelligence import CAPABILITY_MAP, TRACKED_CAPABILITIES, LocationIntelligenceEngine
+from emergency_ai.models import Coordinates, IncidentReport, ResponseUnit
+from emergency_ai.registry import FleetRegistry
+from emergency_ai.system import EmergencyResponseSystem
+
+CAPABILITIES = ["Paramedic", "Ambulance", "Hazmat", "Fire Engine", "Tactical", "Boat Rescue"]
+
+
+def _unit(unit_id: str, lat: float, lon: float, **kwargs) -> ResponseUnit:
+    kwargs.setdefault("capabilities", ["Paramedic"])
+    return ResponseUnit(unit_id, "mixed", Coordinates(lat, lon), kwargs.pop("speed_kmh", 60), **kwargs)
+
+
+def test_updates_keep_the_table_in_sync_with_the_units() -> None:
+    engine = LocationIntelligenceEngine()
+    rng = random.Random(31)
+    units = [_unit(f"U-{i}", 14 + rng.uniform(-1, 1), 121 + rng.uniform(-1, 1)) for i in range(200)]
+    registry = FleetRegistry(units, TRACKED_CAPABILITIES)
+    for step in range(600):
+        unit_id = f"U-{rng.randrange(260)}"
+        action = rng.random()
+        if action < 0.4 and unit_id in registry:
+            registry.move(unit_id, Coordinates(14 + rng.uniform(-1, 1), 121 + rng.uniform(-1, 1)))
+        elif action < 0.7 and unit_id in registry:
+            registry.set_available(unit_id, rng.random() > 0.3)
+        elif action < 0.85:
+            registry.upsert(
+                _unit(unit_id, 14 + rng.uniform(-1, 1), 121 + rng.uniform(-1, 1), capabilities=rng.sample(CAPABILITIES, 2))
+            )
+        else:
+            registry.remove(unit_id)
+
+        if step % 50 == 0:
+            location = Coordinates(14 + rng.uniform(-1, 1), 121 + rng.uniform(-1, 1))
+            for incident_type in CAPABILITY_MAP:
+                expected = engine.rank_units(incident_type, location, engine.build_fleet(registry.units), limit=5)
+                assert engine.rank_units(incident_type, location, registry.table, limit=5) == expected
+    assert sorted(unit.unit_id for unit in registry) == sorted({unit.unit_id for unit in registry.units})
+    assert all(registry.get(unit.unit_id) is unit for unit in registry.units)
+
+
+def test_removal_leaves_an_existing_snapshot_untouched() -> None:
+    registry = FleetRegistry([_unit("A", 14, 121), _unit("B", 14.1, 121.1)], ["paramedic"])
+    snapshot = registry.table
+    assert registry.remove("A") and not registry.remove("A")
+    assert [unit.unit_id for unit in snapshot.units] == ["A", "B"]
+    assert [unit.unit_id for unit in registry.units] == ["B"]
+
+
+def test_duplicate_unit_ids_are_kept_like_a_plain_list() -> None:
+    engine = LocationIntelligenceEngine()
+    units = [_unit("A", 14, 121), _unit("B", 14.1, 121.1), _unit("A", 14.05, 121)]
+    registry = FleetRegistry(units, TRACKED_CAPABILITIES)
+    location = Coordinates(14.05, 121.0)
+    expected = engine.rank_units("medical", location, engine.build_fleet(units), limit=3)
+    assert engine.rank_units("medical", location, registry.table, limit=3) == expected
+    assert len(registry) == 3 and registry.get("A") is units[0]
+
+    registry.set_available("A", False)
+    assert [unit.available for unit in registry.units] == [False, True, False]
+    registry.upsert(_unit("A", 14.2, 121))
+    assert [unit.unit_id for unit in registry.units] == ["A", "B"]
+    assert registry.remove("A") and [unit.unit_id for unit in registry.units] == ["B"]
+
+
+def test_system_unit_updates_affect_new_plans() -> None:
+    system = EmergencyResponseSystem(risk_zones=[], units=[_unit("MED-1", 14.0, 121.0)])
+    report = IncidentReport("INC-1", "Person unconscious on the street.", Coordinates(14.0, 121.0))
+    assert [rec.unit_id for rec in system.build_plan(report).recommendations] == ["MED-1"]
+
+    system.add_unit(_unit("MED-2", 14.001, 121.0))
+    system.registry.set_available("MED-1", False)
+    assert [rec.unit_id for rec in system.build_plan(report).recommendations] == ["MED-2"]
+
+    system.registry.move("MED-2", Coordinates(14.5, 121.5))
+    assert system.build_plan(report).recommendations[0].distance_km > 50
+
+    assert system.remove_unit("MED-2")
+    assert system.build_plan(report).recommendations == []
@@ -1,6 +1,47 @@
+import random
+
+import pytest
+
 from emergency_ai.models import Coordinates, IncidentReport, ResponseUnit, RiskZone
 from emergency_ai.system import EmergencyResponseSystem
 
+CALLER_TEXTS = [
+    "Explosion with heavy smoke and trapped victims not breathing.",
+    "Person unconscious and bleeding in office lobby.",
+    "Gas leak near the bridge, people in panic.",
+    "Armed robbery, suspect has a weapon.",
+    "Family stranded by the flood on a roof.",
+    "Someone needs help.",
+]
+
+
+def _batch_system(rng: random.Random) -> EmergencyResponseSystem:
+    zones = [
+        RiskZone(f"Z-{i}", Coordinates(14.0 + rng.uniform(-1, 1), 121.0 + rng.uniform(-1, 1)), 5.0, "flood", 1.5)
+        for i in range(200)
+    ]
+    units = [
+        ResponseUnit(
+            f"U-{i}",
+            "mixed",
+            Coordinates(14.0 + rng.uniform(-1, 1), 121.0 + rng.uniform(-1, 1)),
+            rng.choice([40, 60, 80]),
+            rng.sample(["Paramedic", "Ambulance", "Hazmat", "Fire Engine", "Tactical", "Boat Rescue"], 2),
+            available=rng.random() > 0.1,
+        )
+        for i in range(300)
+    ]
+    return EmergencyResponseSystem(risk_zones=zones, units=units)
+
+
+def _batch_reports(rng: random.Random, count: int) -> list[IncidentReport]:
+    return [
+        IncidentReport(
+            f"INC-{i}", rng.choice(CALLER_TEXTS), Coordinates(14.0 + rng.uniform(-1, 1), 121.0 + rng.uniform(-1, 1))
+        )
+        for i in range(count)
+    ]
+
 
 def test_high_severity_incident_with_risk_zone_escalates() -> None:
     system = EmergencyResponseSystem(
@@ -77,3 +118,40 @@ def test_recommendation_prefers_nearby_capable_unit() -> None:
     assert plan.recommendations
     assert plan.recommendations[0].unit_id == "NEAR-MED"
     assert plan.recommendations[0].eta_minutes < plan.recommendations[-1].eta_minutes
+
+
+def test_build_plans_matches_build_plan_in_order() -> None:
+    rng = random.Random(21)
+    system = _batch_system(rng)
+    reports = _batch_reports(rng, 500)
+    expected = [system.build_plan(report) for report in reports]
+    for chunk_size in (1, 7, 256, 1000):
+        assert system.build_plans(reports, chunk_size=chunk_size) == expected
+    assert system.build_plans([]) == []
+    with pytest.raises(ValueError):
+        system.build_plans(reports, chunk_size=0)
+
+
+def test_build_plans_on_a_process_pool() -> None:
+    rng = random.Random(22)
+    system = _batch_system(rng)
+    reports = _batch_reports(rng, 120)
+    expected = [system.build_plan(report) for report in reports]
+    assert system.build_plans(reports, workers=2, chunk_size=16) == expected
+
+
+def test_iter_plans_reads_reports_lazily() -> None:
+    rng = random.Random(23)
+    system = _batch_system(rng)
+    reports = _batch_reports(rng, 1000)
+    pulled = []
+
+    def source():
+        for report in reports:
+            pulled.append(report)
+            yield report
+
+    plans = system.iter_plans(source(), chunk_size=50)
+    first = next(plans)
+    assert first == system.build_plan(reports[0])
+    assert len(pulled) == 50
@@ -0,0 +1,97 @@
+import random
+
+from emergency_ai.intelligence import LocationIntelligenceEngine
+from emergency_ai.models import Coordinates, IncidentReport, RiskZone
+from emergency_ai.system import EmergencyResponseSystem
+from emergency_ai.zones import RiskZoneIndex
+
+
+def _zone(zone_id: str, lat: float, lon: float, radius_km: float) -> RiskZone:
+    return RiskZone(zone_id, Coordinates(lat, lon), radius_km, "flood", 0.5)
+
+
+def _random_zones(rng: random.Random, count: int) -> list[RiskZone]:
+    zones = []
+    for i in range(count):
+        # Mostly local zones, plus some at the poles, on the antimeridian and very large ones.
+        kind = i % 10
+        if kind == 0:
+            lat, lon = rng.uniform(84, 90) * rng.choice([-1, 1]), rng.uniform(-180, 180)
+        elif kind == 1:
+            lat, lon = rng.uniform(-60, 60), rng.choice([179.9, -179.9, 180.0])
+        else:
+            lat, lon = 14.0 + rng.uniform(-2, 2), 121.0 + rng.uniform(-2, 2)
+        radius = rng.choice([0.5, 2.0, 8.0, 40.0]) if kind != 2 else rng.uniform(500, 3000)
+        zones.append(_zone(f"Z-{i}", lat, lon, radius))
+    return zones
+
+
+def _random_points(rng: random.Random, count: int) -> list[Coordinates]:
+    points = [
+        Coordinates(14.0 + rng.uniform(-2.5, 2.5), 121.0 + rng.uniform(-2.5, 2.5)) for _ in range(count)
+    ]
+    points += [Coordinates(rng.uniform(-90, 90), rng.uniform(-180, 180)) for _ in range(count // 2)]
+    points += [Coordinates(90.0, 0.0), Coordinates(-90.0, 45.0), Coordinates(0.0, 180.0), Coordinates(0.0, -180.0)]
+    return points
+
+
+def test_indexed_lookup_matches_a_full_scan() -> None:
+    engine = LocationIntelligenceEngine()
+    rng = random.Random(5)
+    zones = _random_zones(rng, 600)
+    for index in (RiskZoneIndex(zones), RiskZoneIndex(zones, cell_deg=0.7, max_cells=64)):
+        for point in _random_points(rng, 400):
+            assert engine.active_risks(point, index) == engine.active_risks(point, zones)
+
+
+def test_duplicate_zone_ids_are_kept_like_a_full_scan() -> None:
+    engine = LocationIntelligenceEngine()
+    zones = [_zone("DUP", 14.0, 121.0, 5.0), _zone("X", 14.01, 121.0, 5.0), _zone("DUP", 14.02, 121.0, 8.0)]
+    zones.append(_zone("DUP", 14.0, 121.0, 3000.0))  # too big for the grid
+    index = RiskZoneIndex(zones)
+    assert len(index) == 4 and list(index) == zones
+    for point in [Coordinates(14.01, 121.0), Coordinates(14.1, 121.0), Coordinates(20.0, 121.0)]:
+        assert engine.active_risks(point, index) == engine.active_risks(point, zones)
+    here = Coordinates(14.01, 121.0)
+    assert sum(zone.severity_modifier for zone in engine.active_risks(here, index)) == 4 * 0.5
+
+    index.insert(_zone("DUP", 40.0, -73.0, 1.0))  # replaces all three
+    assert [zone.zone_id for zone in index.candidates(here)] == ["X"]
+    assert index.remove("DUP") and "DUP" not in index and len(index) == 1
+
+
+def test_zones_on_the_boundary_of_a_cell_are_found() -> None:
+    engine = LocationIntelligenceEngine()
+    zone = _zone("EDGE", 14.25, 121.25, 1.0)  # centred on a cell corner
+    index = RiskZoneIndex([zone])
+    for dlat, dlon in ((0.008, 0), (-0.008, 0), (0, 0.0092), (0, -0.0092)):
+        point = Coordinates(14.25 + dlat, 121.25 + dlon)
+        assert engine.active_risks(point, index) == engine.active_risks(point, [zone]) == [zone]
+
+
+def test_insert_remove_and_replace() -> None:
+    index = RiskZoneIndex([_zone("A", 14.0, 121.0, 5.0), _zone("B", 14.01, 121.01, 5.0)])
+    here = Coordinates(14.005, 121.005)
+    assert [z.zone_id for z in index.candidates(here)] == ["A", "B"]
+
+    assert index.remove("A") is True
+    assert index.remove("A") is False
+    assert [z.zone_id for z in index.candidates(here)] == ["B"]
+
+    index.insert(_zone("B", 40.0, -73.0, 5.0))  # same id moves the zone
+    assert index.candidates(here) == []
+    assert len(index) == 1 and "B" in index
+    assert (index._lat_row(14.0), index._lon_col(121.0)) not in index._cells  # old cells are released
+
+
+def test_system_zone_updates_affect_new_plans() -> None:
+    system = EmergencyResponseSystem(risk_zones=[], units=[])
+    report = IncidentReport("INC-1", "Flooding near the river.", Coordinates(14.0, 121.0))
+    assert system.build_plan(report).risk_context == []
+
+    system.add_risk_zone(RiskZone("FLOOD-1", Coordinates(14.0, 121.0), 3.0, "river flood", 1.0))
+    assert system.build_plan(report).risk_context == ["river flood (FLOOD-1)"]
+
+    assert system.remove_risk_zone("FLOOD-1")
+    assert system.build_plan(report).risk_context == []
+    assert system.risk_zones == []